@@ -12,7 +12,7 @@ load_dotenv()
 from src.db.database import Base, get_database_url
 
 # Import all models so Alembic can detect them
-from src.db.models import RecipeHistory  # noqa: F401
+from src.db.models import LlmResult, RecipeHistory, UrlVerdict  # noqa: F401
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
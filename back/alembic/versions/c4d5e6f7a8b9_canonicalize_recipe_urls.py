@@ -0,0 +1,170 @@
+"""canonicalize_recipe_urls
+
+Revision ID: c4d5e6f7a8b9
+Revises: b8f5a6c7d8e9
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4d5e6f7a8b9"
+down_revision: str | Sequence[str] | None = "b8f5a6c7d8e9"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Canonicalization of src.services.url_canonical, frozen here so that later
+# changes to it do not change this migration. Includes its fix to strip a
+# single host prefix or amp segment, so rekeyed rows match runtime keys.
+TRACKING_PARAMS = frozenset(
+    {
+        "_ga",
+        "_gl",
+        "dclid",
+        "fbclid",
+        "gclid",
+        "igshid",
+        "mc_cid",
+        "mc_eid",
+        "msclkid",
+        "ref",
+        "ref_src",
+        "share",
+        "si",
+        "yclid",
+    }
+)
+TRACKING_PARAM_PREFIXES = ("utm_", "pk_", "mtm_", "hsa_")
+AMP_PARAMS = frozenset({"amp", "outputtype"})
+ALTERNATE_HOST_PREFIXES = ("www.", "m.", "mobile.", "amp.")
+# domain -> (keep_params, strip_params)
+DOMAIN_RULES: dict[str, tuple[frozenset[str] | None, frozenset[str]]] = {
+    "marmiton.org": (frozenset(), frozenset()),
+    "allrecipes.com": (frozenset(), frozenset()),
+    "bbcgoodfood.com": (frozenset(), frozenset()),
+    "cuisineaz.com": (frozenset(), frozenset()),
+    "journaldesfemmes.fr": (frozenset(), frozenset()),
+    "750g.com": (frozenset(), frozenset()),
+    "seriouseats.com": (frozenset(), frozenset()),
+    "foodnetwork.com": (None, frozenset({"ic1", "nl"})),
+    "food.com": (None, frozenset({"nav", "scaleto", "units"})),
+    "youtube.com": (frozenset({"v"}), frozenset()),
+}
+
+
+def strip_host_prefix(host: str) -> str:
+    for prefix in ALTERNATE_HOST_PREFIXES:
+        if host.startswith(prefix) and "." in host[len(prefix) :]:
+            return host[len(prefix) :]
+    return host
+
+
+def canonical_host(host: str) -> str:
+    host = host.lower().rstrip(".")
+    stripped = strip_host_prefix(host)
+    # A single prefix, and only if the result is canonical too
+    if strip_host_prefix(stripped) != stripped:
+        return host
+    return stripped
+
+
+def canonical_path(path: str) -> str:
+    segments = [segment for segment in path.split("/") if segment]
+    amp = [segment.lower() == "amp" for segment in segments]
+    # A single "amp" at each end, and only if the result is canonical too
+    start, end = 0, len(segments)
+    if amp[:2] == [True] or amp[:2] == [True, False]:
+        start = 1
+    if end > start and amp[-2:] in ([True], [False, True]):
+        end -= 1
+    return "/" + "/".join(segments[start:end])
+
+
+def canonicalize_url(url: str) -> str | None:
+    """Canonical form of url, or None if it has no host or an invalid port."""
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return None
+    if not parts.hostname:
+        return None
+    host = canonical_host(parts.hostname)
+    if ":" in host:
+        host = f"[{host}]"
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+
+    keep_params, strip_params = None, frozenset()
+    for domain, rule in DOMAIN_RULES.items():
+        if host == domain or host.endswith("." + domain):
+            keep_params, strip_params = rule
+            break
+
+    def is_dropped(name: str) -> bool:
+        lowered = name.lower()
+        if keep_params is not None:
+            return lowered not in keep_params
+        return (
+            lowered in TRACKING_PARAMS
+            or lowered in AMP_PARAMS
+            or lowered in strip_params
+            or lowered.startswith(TRACKING_PARAM_PREFIXES)
+        )
+
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not is_dropped(name)
+    )
+    return urlunsplit(("https", host, canonical_path(parts.path), urlencode(query), ""))
+
+
+def upgrade() -> None:
+    """Rekey recipe_history on canonical URLs, merging duplicate pages.
+
+    Of each group of URLs with the same canonical form, the most recently
+    used row is kept and inherits the earliest created_at of the group.
+    Rows whose URL has no host are left as they are.
+    """
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text("SELECT url, created_at FROM recipe_history ORDER BY updated_at DESC")
+    ).all()
+
+    groups: dict[str, list] = {}
+    for row in rows:
+        canonical = canonicalize_url(row.url)
+        if canonical is not None:
+            groups.setdefault(canonical, []).append(row)
+
+    for canonical, group in groups.items():
+        kept, duplicates = group[0], group[1:]
+        if duplicates:
+            conn.execute(
+                sa.text("DELETE FROM recipe_history WHERE url = ANY(:urls)"),
+                {"urls": [row.url for row in duplicates]},
+            )
+        if duplicates or kept.url != canonical:
+            conn.execute(
+                sa.text(
+                    "UPDATE recipe_history "
+                    "SET url = :canonical, created_at = :created_at "
+                    "WHERE url = :url"
+                ),
+                {
+                    "canonical": canonical,
+                    "created_at": min(row.created_at for row in group),
+                    "url": kept.url,
+                },
+            )
+
+
+def downgrade() -> None:
+    """Merged rows cannot be split back apart; canonical URLs are kept."""
+    pass
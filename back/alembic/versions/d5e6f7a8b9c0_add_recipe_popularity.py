@@ -0,0 +1,66 @@
+"""add_recipe_popularity
+
+Revision ID: d5e6f7a8b9c0
+Revises: c4d5e6f7a8b9
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d5e6f7a8b9c0"
+down_revision: str | Sequence[str] | None = "c4d5e6f7a8b9"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# POPULARITY_EPOCH (2026-01-01 UTC) and POPULARITY_HALF_LIFE (7 days) of
+# src.db.repository as of this revision, in seconds
+POPULARITY_EPOCH_SECONDS = 1767225600.0
+POPULARITY_HALF_LIFE_SECONDS = 7 * 24 * 3600.0
+
+
+def upgrade() -> None:
+    """Add hit counts and a decayed popularity score to recipe_history.
+
+    Existing rows are scored as a single hit at their last use, which keeps
+    the current most-recently-used order until real hits accumulate.
+    """
+    op.add_column(
+        "recipe_history",
+        sa.Column("hit_count", sa.BigInteger(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "recipe_history",
+        sa.Column("popularity_score", sa.Float(), server_default="0", nullable=False),
+    )
+    op.execute(
+        sa.text(
+            "UPDATE recipe_history SET hit_count = 1, popularity_score = "
+            "(EXTRACT(EPOCH FROM updated_at) - :epoch) / :half_life * LN(2)"
+        ).bindparams(
+            epoch=POPULARITY_EPOCH_SECONDS,
+            half_life=POPULARITY_HALF_LIFE_SECONDS,
+        )
+    )
+    op.drop_index("ix_recipe_history_updated_at", table_name="recipe_history")
+    op.create_index(
+        "ix_recipe_history_popularity_score",
+        "recipe_history",
+        [sa.text("popularity_score DESC")],
+    )
+
+
+def downgrade() -> None:
+    """Drop popularity columns and restore the recency index."""
+    op.drop_index("ix_recipe_history_popularity_score", table_name="recipe_history")
+    op.create_index(
+        "ix_recipe_history_updated_at",
+        "recipe_history",
+        [sa.text("updated_at DESC")],
+    )
+    op.drop_column("recipe_history", "popularity_score")
+    op.drop_column("recipe_history", "hit_count")
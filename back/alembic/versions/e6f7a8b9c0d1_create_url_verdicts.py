@@ -0,0 +1,35 @@
+"""create_url_verdicts
+
+Revision ID: e6f7a8b9c0d1
+Revises: d5e6f7a8b9c0
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e6f7a8b9c0d1"
+down_revision: str | Sequence[str] | None = "d5e6f7a8b9c0"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Create url_verdicts table."""
+    op.create_table(
+        "url_verdicts",
+        sa.Column("url", sa.String(2048), primary_key=True),
+        sa.Column("accessible", sa.Boolean(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_url_verdicts_expires_at", "url_verdicts", ["expires_at"])
+
+
+def downgrade() -> None:
+    """Drop url_verdicts table."""
+    op.drop_index("ix_url_verdicts_expires_at", table_name="url_verdicts")
+    op.drop_table("url_verdicts")
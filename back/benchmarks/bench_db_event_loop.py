@@ -0,0 +1,118 @@
+"""Event-loop blocking of sync vs async cache-hit lookups under concurrency.
+
+Replays the database part of a /ganntify_recipe_data cache hit from many
+concurrent coroutines: once through a sync Session called from the event
+loop, as the handlers used to (read, then bump updated_at), and once through
+the async repository (read only; hits are now written behind in batches).
+A probe coroutine measures how late the loop wakes it up: with the sync
+session every round trip stalls the whole loop, including other requests.
+
+Needs a reachable Postgres with migrations applied (DATABASE_URL or DB_*).
+
+    python -m benchmarks.bench_db_event_loop [--requests 500] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import UTC, datetime
+
+from src.db.database import (
+    dispose_async_engine,
+    get_async_session_local,
+    get_session_local,
+)
+from src.db.models import RecipeHistory
+from src.db.repository import RecipeHistoryRepository
+
+BENCH_URL = "https://benchmark.invalid/event-loop"
+PROBE_INTERVAL_SECONDS = 0.001
+
+
+class LagProbe:
+    """Measure event-loop scheduling delay with a periodic sleeper."""
+
+    def __init__(self) -> None:
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(PROBE_INTERVAL_SECONDS)
+            lag = max(0.0, loop.time() - start - PROBE_INTERVAL_SECONDS)
+            self.max_lag = max(self.max_lag, lag)
+            self.total_lag += lag
+
+    async def __aenter__(self) -> "LagProbe":
+        self._task = asyncio.ensure_future(self._run())
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        # Let the probe record a wake-up that was overdue when the load ended
+        await asyncio.sleep(2 * PROBE_INTERVAL_SECONDS)
+        self._task.cancel()
+
+
+async def _sync_hit() -> None:
+    db = get_session_local()()
+    try:
+        recipe = db.query(RecipeHistory).filter(RecipeHistory.url == BENCH_URL).first()
+        recipe.updated_at = datetime.now(UTC)
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _async_hit() -> None:
+    async with get_async_session_local()() as db:
+        await RecipeHistoryRepository(db).get_by_url(BENCH_URL)
+
+
+async def _load(hit, requests: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            await hit()
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+
+
+async def _measure(label: str, hit, requests: int, concurrency: int) -> None:
+    await _load(hit, concurrency, concurrency)  # fill the connection pools
+    start = time.perf_counter()
+    async with LagProbe() as probe:
+        await _load(hit, requests, concurrency)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<6} {requests / elapsed:8.0f} req/s  "
+        f"longest loop stall {probe.max_lag * 1000:7.1f}ms, "
+        f"total probe delay {probe.total_lag * 1000:7.1f}ms"
+    )
+
+
+async def main(requests: int, concurrency: int) -> None:
+    async with get_async_session_local()() as db:
+        await RecipeHistoryRepository(db).upsert(
+            url=BENCH_URL, title="Benchmark", snippet="", planned_steps=[]
+        )
+    try:
+        await _measure("sync", _sync_hit, requests, concurrency)
+        await _measure("async", _async_hit, requests, concurrency)
+    finally:
+        async with get_async_session_local()() as db:
+            await db.delete(await RecipeHistoryRepository(db).get_by_url(BENCH_URL))
+            await db.commit()
+        await dispose_async_engine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,189 @@
+"""Database round trips per recipe_history repository operation.
+
+Counts what each operation sends to Postgres: transaction begin, every
+statement, and commit or rollback. It runs each operation through the
+repository and through the select-then-write versions it replaced, then
+flushes a batch of hits the way the write-behind hit tracker does. It then
+fires concurrent upserts of one new URL, which the select-then-insert path
+can turn into primary key violations.
+
+Needs a reachable Postgres with migrations applied (DATABASE_URL or DB_*).
+
+    python -m benchmarks.bench_db_roundtrips [--iterations 200] [--concurrency 20]
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import time
+from datetime import UTC, datetime
+
+from sqlalchemy import delete, event
+from sqlalchemy.exc import IntegrityError
+
+from src.db.database import (
+    dispose_async_engine,
+    get_async_engine,
+    get_async_session_local,
+)
+from src.db.models import RecipeHistory
+from src.db.repository import RecipeHistoryRepository
+
+BENCH_URL_PREFIX = "https://benchmark.invalid/roundtrips/"
+
+
+@dataclasses.dataclass
+class RoundTrips:
+    """Round trips seen by the engine, by kind."""
+
+    begins: int = 0
+    statements: int = 0
+    commits: int = 0
+    rollbacks: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.begins + self.statements + self.commits + self.rollbacks
+
+
+def _count_round_trips() -> RoundTrips:
+    counts = RoundTrips()
+    engine = get_async_engine().sync_engine
+
+    @event.listens_for(engine, "begin")
+    def _begin(*_):
+        counts.begins += 1
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _statement(*_):
+        counts.statements += 1
+
+    @event.listens_for(engine, "commit")
+    def _commit(*_):
+        counts.commits += 1
+
+    @event.listens_for(engine, "rollback")
+    def _rollback(*_):
+        counts.rollbacks += 1
+
+    return counts
+
+
+async def _legacy_upsert(repo: RecipeHistoryRepository, url: str) -> None:
+    existing = await repo.get_by_url(url)
+    if existing:
+        existing.title = "Benchmark"
+        existing.planned_steps = []
+        existing.updated_at = datetime.now(UTC)
+        await repo.db.commit()
+        await repo.db.refresh(existing)
+        return
+    recipe = RecipeHistory(url=url, title="Benchmark", snippet="", planned_steps=[])
+    repo.db.add(recipe)
+    await repo.db.commit()
+    await repo.db.refresh(recipe)
+
+
+async def _legacy_touch(repo: RecipeHistoryRepository, url: str) -> None:
+    recipe = await repo.get_by_url(url)
+    if recipe:
+        recipe.updated_at = datetime.now(UTC)
+        await repo.db.commit()
+
+
+async def _upsert(repo: RecipeHistoryRepository, url: str) -> None:
+    await repo.upsert(url=url, title="Benchmark", snippet="", planned_steps=[])
+
+
+async def _record_hit(repo: RecipeHistoryRepository, url: str) -> None:
+    await repo.record_hits({url: 1})
+
+
+async def _measure(label: str, operation, urls: list[str], counts) -> None:
+    before = dataclasses.replace(counts)
+    start = time.perf_counter()
+    for url in urls:
+        async with get_async_session_local()() as db:
+            await operation(RecipeHistoryRepository(db), url)
+    elapsed = time.perf_counter() - start
+
+    n = len(urls)
+    print(
+        f"{label:<29} {(counts.total - before.total) / n:4.1f} round trips/op "
+        f"(begin {(counts.begins - before.begins) / n:.1f}, "
+        f"statements {(counts.statements - before.statements) / n:.1f}, "
+        f"commit {(counts.commits - before.commits) / n:.1f}, "
+        f"rollback {(counts.rollbacks - before.rollbacks) / n:.1f})  "
+        f"{elapsed / n * 1000:6.2f}ms/op"
+    )
+
+
+async def _measure_flush(iterations: int, counts: RoundTrips) -> None:
+    """One write-behind flush carrying a hit for each of iterations recipes."""
+    urls = [f"{BENCH_URL_PREFIX}single statement/{i}" for i in range(iterations)]
+    before = dataclasses.replace(counts)
+    start = time.perf_counter()
+    async with get_async_session_local()() as db:
+        await RecipeHistoryRepository(db).record_hits(dict.fromkeys(urls, 3))
+    elapsed = time.perf_counter() - start
+    print(
+        f"{'batched hit flush':<29} {counts.total - before.total} round trips "
+        f"for {iterations} recipes ({counts.statements - before.statements} "
+        f"statements)  {elapsed * 1000:6.2f}ms"
+    )
+
+
+async def _race(label: str, operation, concurrency: int) -> None:
+    url = f"{BENCH_URL_PREFIX}race-{label}"
+
+    async def one() -> None:
+        async with get_async_session_local()() as db:
+            await operation(RecipeHistoryRepository(db), url)
+
+    results = await asyncio.gather(
+        *(one() for _ in range(concurrency)), return_exceptions=True
+    )
+    conflicts = sum(isinstance(r, IntegrityError) for r in results)
+    print(f"{label:<29} {conflicts}/{concurrency} concurrent first upserts failed")
+
+
+async def _cleanup() -> None:
+    async with get_async_session_local()() as db:
+        await db.execute(
+            delete(RecipeHistory).where(RecipeHistory.url.startswith(BENCH_URL_PREFIX))
+        )
+        await db.commit()
+
+
+async def main(iterations: int, concurrency: int) -> None:
+    counts = _count_round_trips()
+    await _cleanup()
+    try:
+        for label, upsert, hit in (
+            ("select-then-write", _legacy_upsert, _legacy_touch),
+            ("single statement", _upsert, _record_hit),
+        ):
+            urls = [f"{BENCH_URL_PREFIX}{label}/{i}" for i in range(iterations)]
+            missing = [f"{BENCH_URL_PREFIX}missing/{i}" for i in range(iterations)]
+            await _measure(f"{label} insert", upsert, urls, counts)
+            await _measure(f"{label} update", upsert, urls, counts)
+            await _measure(f"{label} hit", hit, urls, counts)
+            await _measure(f"{label} hit miss", hit, missing, counts)
+            print()
+
+        await _measure_flush(iterations, counts)
+        print()
+
+        await _race("select-then-write", _legacy_upsert, concurrency)
+        await _race("single statement", _upsert, concurrency)
+    finally:
+        await _cleanup()
+        await dispose_async_engine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.concurrency))
@@ -0,0 +1,116 @@
+"""Speed, memory and output of each HTML text engine against the reference.
+
+For every engine of src.services.html_text, parses the corpus pages with
+parse_recipe_page and reports:
+- throughput, over --repeat passes
+- the peak Python memory of one page, from tracemalloc; lxml allocates its
+  tree outside the Python heap, so its peak is understated
+- how its output differs from the bs4 (html.parser) reference: pages with a
+  different title, text or structured recipe, and lines added or removed
+- the share of each page's expected recipe lines it keeps
+
+Runs on benchmarks/corpus and the synthetic pages of benchmarks.page_corpus.
+
+    python -m benchmarks.bench_html_text [--corpus DIR] [--repeat 20] [--diffs]
+"""
+
+import argparse
+import difflib
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.page_corpus import (
+    CORPUS_DIR,
+    CorpusPage,
+    load_corpus,
+    synthetic_pages,
+)
+from src.services.html_text import ENGINES, REFERENCE_ENGINE, HtmlTextEngine
+from src.services.page_text import ParsedPage, parse_recipe_page
+
+
+def _lines(page: ParsedPage) -> list[str]:
+    return [line.strip() for line in page.text.splitlines() if line.strip()]
+
+
+def _throughput(engine: HtmlTextEngine, pages: list[CorpusPage], repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            parse_recipe_page(page.html, engine)
+    elapsed = time.perf_counter() - start
+    megabytes = sum(len(page.html) for page in pages) * repeat / 1024 / 1024
+    return len(pages) * repeat / elapsed, megabytes / elapsed
+
+
+def _peak_kib(engine: HtmlTextEngine, pages: list[CorpusPage]) -> float:
+    peak = 0
+    for page in pages:
+        tracemalloc.start()
+        parse_recipe_page(page.html, engine)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def _diff(reference: ParsedPage, parsed: ParsedPage) -> list[str]:
+    diff = [
+        line
+        for line in difflib.unified_diff(
+            _lines(reference), _lines(parsed), lineterm="", n=0
+        )
+        if line[:1] in "+-" and line[:3] not in ("+++", "---")
+    ]
+    if parsed.title != reference.title:
+        diff.append(f"title: {reference.title!r} -> {parsed.title!r}")
+    if parsed.recipe != reference.recipe:
+        diff.append("structured recipe differs")
+    return diff
+
+
+def _kept(page: CorpusPage, parsed: ParsedPage) -> float | None:
+    if not page.expected:
+        return None
+    lines = set(_lines(parsed))
+    return sum(line in lines for line in page.expected) / len(page.expected)
+
+
+def main(pages: list[CorpusPage], repeat: int, show_diffs: bool) -> None:
+    references = {
+        page.name: parse_recipe_page(page.html, ENGINES[REFERENCE_ENGINE])
+        for page in pages
+    }
+    print(f"{len(pages)} pages, {sum(len(p.html) for p in pages) / 1024:.0f} KiB")
+    print(
+        f"{'engine':<10} {'pages/s':>8} {'MB/s':>6} {'peak KiB':>9} "
+        f"{'differ':>7} {'+/- lines':>10} {'kept':>5}"
+    )
+    for name, engine in ENGINES.items():
+        pages_per_s, mb_per_s = _throughput(engine, pages, repeat)
+        peak = _peak_kib(engine, pages)
+        differing = changed = 0
+        kept = []
+        for page in pages:
+            parsed = parse_recipe_page(page.html, engine)
+            diff = _diff(references[page.name], parsed)
+            if diff:
+                differing += 1
+                changed += len(diff)
+                if show_diffs:
+                    print(f"--- {name} {page.name}", *diff, sep="\n")
+            if (page_kept := _kept(page, parsed)) is not None:
+                kept.append(page_kept)
+        print(
+            f"{name:<10} {pages_per_s:>8.1f} {mb_per_s:>6.2f} {peak:>9.0f} "
+            f"{differing:>7} {changed:>10} {sum(kept) / len(kept):>5.0%}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, default=CORPUS_DIR)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--diffs", action="store_true", help="print every diff")
+    args = parser.parse_args()
+    main(load_corpus(args.corpus) + synthetic_pages(), args.repeat, args.diffs)
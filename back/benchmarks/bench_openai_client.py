@@ -0,0 +1,119 @@
+"""Per-call overhead of a fresh vs shared AsyncOpenAI client.
+
+Runs against a local OpenAI-compatible stub, so the numbers isolate client
+construction and connection setup from model latency. The stub speaks plain
+HTTP: against the real API each fresh client also pays a TLS handshake, so
+the gap is larger in production.
+
+    python -m benchmarks.bench_openai_client [--calls 200]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from openai import AsyncOpenAI
+
+COMPLETION = json.dumps(
+    {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "stub",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": "{}"},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+    }
+).encode()
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections: set[tuple[str, int]] = set()
+
+    def do_POST(self):
+        self.connections.add(self.client_address)
+        self.rfile.read(int(self.headers.get("content-length", 0)))
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(COMPLETION)))
+        self.end_headers()
+        self.wfile.write(COMPLETION)
+
+    def log_message(self, format, *args):
+        pass
+
+
+async def _complete(client: AsyncOpenAI) -> None:
+    await client.chat.completions.create(
+        messages=[{"role": "user", "content": "ping"}],
+        model="stub",
+        response_format={"type": "json_object"},
+    )
+
+
+async def _fresh_client_call() -> None:
+    async with AsyncOpenAI(api_key="stub") as client:
+        await _complete(client)
+
+
+async def _time_calls(call, calls: int) -> list[float]:
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _report(label: str, timings: list[float], connections: int) -> None:
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f"{label:<14} mean={statistics.mean(timings):6.2f}ms "
+        f"p50={statistics.median(timings):6.2f}ms p95={p95:6.2f}ms "
+        f"connections={connections}"
+    )
+
+
+async def main(calls: int) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+
+    # Imported late so the shared client picks up the stub base URL
+    from src.services.ai_service import _get_openai_client, close_openai_client
+
+    try:
+        await _fresh_client_call()  # warm imports and the stub server
+        _StubHandler.connections.clear()
+        fresh = await _time_calls(_fresh_client_call, calls)
+        _report("fresh client", fresh, len(_StubHandler.connections))
+
+        _StubHandler.connections.clear()
+        shared = await _time_calls(lambda: _complete(_get_openai_client()), calls)
+        _report("shared client", shared, len(_StubHandler.connections))
+
+        saved = statistics.mean(fresh) - statistics.mean(shared)
+        print(f"overhead saved per call: {saved:.2f}ms")
+    finally:
+        await close_openai_client()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    asyncio.run(main(parser.parse_args().calls))
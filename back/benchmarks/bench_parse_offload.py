@@ -0,0 +1,87 @@
+"""Event loop lag while recipe pages are parsed, inline vs thread vs processes.
+
+Parses large synthetic pages (see benchmarks.page_corpus) a few at a time
+while a LoopLagMonitor samples the loop every 10ms, as /metrics does in the
+app. Lag is what every other request, cache hits included, waits on top of
+its own work.
+
+    python -m benchmarks.bench_parse_offload [--pages 24] [--page-mb 2]
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.page_corpus import synthetic_pages
+from src.services.loop_monitor import LoopLagMonitor
+from src.services.page_text import parse_recipe_page
+from src.services.parse_pool import (
+    close_parse_pool,
+    parse_page,
+    start_parse_pool,
+    warm_parse_pool,
+)
+
+CONCURRENCY = 4
+
+
+def _large_pages(count: int, page_mb: float) -> list[bytes]:
+    """Synthetic pages padded to page_mb with a long comment thread."""
+    pages = []
+    for page in synthetic_pages():
+        filler_line = b"<article class='post'><p>" + b"Lovely recipe! " * 20
+        filler_line += b"</p></article>\n"
+        repeats = int(page_mb * 1024 * 1024 / len(filler_line))
+        pages.append(page.html.replace(b"</main>", b"</main>" + filler_line * repeats))
+    return [pages[i % len(pages)] for i in range(count)]
+
+
+async def _inline(html_content: bytes) -> None:
+    parse_recipe_page(html_content)
+
+
+async def _run(label: str, parse, pages: list[bytes]) -> None:
+    monitor = LoopLagMonitor(interval=0.01)
+    sampler = asyncio.create_task(monitor.run())
+    # Let the sampler start its first sleep
+    await asyncio.sleep(0)
+    slots = asyncio.Semaphore(CONCURRENCY)
+
+    async def parse_one(html_content: bytes) -> None:
+        async with slots:
+            # Stands for the request's own I/O before the parse
+            await asyncio.sleep(0)
+            await parse(html_content)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(parse_one(page) for page in pages))
+    elapsed = time.perf_counter() - start
+    # Record the wake-up delayed by the last parse
+    await asyncio.sleep(monitor.interval * 2)
+    sampler.cancel()
+    print(
+        f"{label:<10} pages/s={len(pages) / elapsed:6.1f} "
+        f"lag p50={monitor.percentile(0.5):7.1f}ms "
+        f"p99={monitor.percentile(0.99):7.1f}ms "
+        f"max={monitor.stats.lag_ms_max:7.1f}ms samples={monitor.stats.samples}"
+    )
+
+
+async def main(count: int, page_mb: float) -> None:
+    pages = _large_pages(count, page_mb)
+    await _run("inline", _inline, pages)
+    await _run("thread", parse_page, pages)
+    start_parse_pool(CONCURRENCY)
+    try:
+        await warm_parse_pool()
+        await _run("processes", parse_page, pages)
+    finally:
+        await close_parse_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=24)
+    parser.add_argument("--page-mb", type=float, default=2.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.pages, args.page_mb))
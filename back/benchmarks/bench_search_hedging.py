@@ -0,0 +1,76 @@
+"""Search latency of a single backend vs hedged federated search.
+
+Uses in-process fake providers whose latency follows a long-tailed
+distribution (most answers in ~150ms, a few stalling for seconds, as a
+rate-limited backend does), so the numbers show what hedging does to the
+tail rather than any real backend's speed.
+
+    python -m benchmarks.bench_search_hedging [--searches 200]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from src.services.search_providers import FakeSearchProvider, FederatedSearch
+
+RESULTS = [
+    {"title": f"Recipe {i}", "href": f"https://example.com/{i}", "body": ""}
+    for i in range(50)
+]
+
+
+def _long_tail(rng: random.Random) -> float:
+    if rng.random() < 0.1:
+        return rng.uniform(2.0, 4.0)
+    return rng.gauss(0.15, 0.03)
+
+
+def _provider(name: str, seed: int) -> FakeSearchProvider:
+    rng = random.Random(seed)
+    return FakeSearchProvider(name, RESULTS, delay=lambda: max(0.0, _long_tail(rng)))
+
+
+async def _time_searches(search: FederatedSearch, searches: int) -> list[float]:
+    async def timed() -> float:
+        start = time.perf_counter()
+        await search.search("pasta recipe", "us-en", 50)
+        return (time.perf_counter() - start) * 1000
+
+    # Run in batches to keep the benchmark short without overlapping everything
+    timings = []
+    for _ in range(0, searches, 50):
+        timings += await asyncio.gather(*(timed() for _ in range(50)))
+    return timings[:searches]
+
+
+def _report(label: str, timings: list[float], search: FederatedSearch) -> None:
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    p99 = timings[int(len(timings) * 0.99) - 1]
+    calls = sum(stats.calls for stats in search.stats.values())
+    print(
+        f"{label:<10} p50={statistics.median(timings):7.1f}ms p95={p95:7.1f}ms "
+        f"p99={p99:7.1f}ms max={timings[-1]:7.1f}ms "
+        f"backend calls/search={calls / len(timings):.2f}"
+    )
+
+
+async def main(searches: int) -> None:
+    single = FederatedSearch([_provider("primary", 1)], timeout=5.0, hedge_delay=0.5)
+    _report("single", await _time_searches(single, searches), single)
+
+    hedged = FederatedSearch(
+        [_provider("primary", 1), _provider("fallback", 2)],
+        timeout=5.0,
+        hedge_delay=0.5,
+    )
+    _report("hedged", await _time_searches(hedged, searches), hedged)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--searches", type=int, default=200)
+    asyncio.run(main(parser.parse_args().searches))
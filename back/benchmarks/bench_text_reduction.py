@@ -0,0 +1,60 @@
+"""Tokens of page text sent to the extraction prompt, before and after reduction.
+
+"before" is the previous extraction: the whole body text with blank lines
+collapsed. "after" is the page text without chrome, cut to the token budget.
+"kept" is the share of the recipe's ingredient and step lines still present.
+Token counts are estimate_tokens() estimates. Runs on synthetic pages unless
+given a directory of recorded ones (see benchmarks.page_corpus).
+
+    python -m benchmarks.bench_text_reduction [--corpus DIR] [--budget 2500]
+"""
+
+import argparse
+import re
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from benchmarks.page_corpus import CorpusPage, load_corpus, synthetic_pages
+from src.services.page_text import parse_recipe_page
+from src.services.text_reduction import estimate_tokens, reduce_page_text
+
+
+def _previous_text(html_content: bytes) -> str:
+    body = BeautifulSoup(html_content, "html.parser").find("body")
+    return re.sub(r"\n+", "\n", body.get_text()) if body else ""
+
+
+def _kept(page: CorpusPage, text: str) -> float | None:
+    if not page.expected:
+        return None
+    lines = set(text.splitlines())
+    return sum(line in lines for line in page.expected) / len(page.expected)
+
+
+def main(pages: list[CorpusPage], budget: int) -> None:
+    total_before = total_after = 0
+    print(f"{'page':<16} {'before':>8} {'after':>7} {'saved':>6} {'kept':>6}")
+    for page in pages:
+        before = estimate_tokens(_previous_text(page.html))
+        text = reduce_page_text(parse_recipe_page(page.html).text, budget)
+        after = estimate_tokens(text)
+        kept = _kept(page, text)
+        total_before += before
+        total_after += after
+        print(
+            f"{page.name:<16} {before:>8} {after:>7} {1 - after / before:>6.0%} "
+            f"{'-' if kept is None else f'{kept:.0%}':>6}"
+        )
+    print(
+        f"{'total':<16} {total_before:>8} {total_after:>7} "
+        f"{1 - total_after / total_before:>6.0%}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path)
+    parser.add_argument("--budget", type=int, default=2500)
+    args = parser.parse_args()
+    main(load_corpus(args.corpus) if args.corpus else synthetic_pages(), args.budget)
@@ -0,0 +1,285 @@
+"""Recipe pages for the page text benchmarks.
+
+synthetic_pages() builds pages in the shape of real recipe sites: a recipe
+buried in navigation menus, a cookie banner, inline app state, a related
+recipes sidebar, a comment thread and a footer link farm, some served
+minified. load_corpus() reads pages from a directory instead: every
+<name>.html, with the lines the recipe must keep in an optional <name>.txt.
+
+CORPUS_DIR holds small pages written after the markup of common kinds of
+recipe sites (a WordPress recipe plugin, a Next.js app, a latin-1 table
+layout with microdata, XHTML, unclosed tags). Recorded pages can be added
+next to them.
+"""
+
+import dataclasses
+import html
+import json
+import random
+from pathlib import Path
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+
+
+@dataclasses.dataclass(frozen=True)
+class CorpusPage:
+    name: str
+    html: bytes
+    # Lines of the recipe that a good text extraction keeps
+    expected: list[str]
+
+
+RECIPES = [
+    (
+        "en",
+        "Classic banana bread",
+        [
+            "3 ripe bananas",
+            "75 g melted butter",
+            "150 g sugar",
+            "1 egg, beaten",
+            "1 tsp vanilla extract",
+            "1 tsp baking soda",
+            "Pinch of salt",
+            "190 g all-purpose flour",
+        ],
+        [
+            "Preheat the oven to 175°C and butter a loaf pan.",
+            "Mash the bananas with a fork in a large bowl.",
+            "Stir in the melted butter, then the sugar, egg and vanilla.",
+            "Sprinkle the baking soda and salt over the mixture and mix in.",
+            "Add the flour and stir until just combined.",
+            "Pour the batter into the pan and bake for 60 minutes.",
+            "Let cool in the pan for 10 minutes before slicing.",
+        ],
+    ),
+    (
+        "en",
+        "Weeknight chicken curry",
+        [
+            "2 tbsp vegetable oil",
+            "1 onion, finely chopped",
+            "3 cloves garlic, minced",
+            "1 tbsp grated ginger",
+            "2 tbsp curry powder",
+            "600 g chicken thighs, diced",
+            "400 ml coconut milk",
+            "1 can chopped tomatoes",
+            "Fresh coriander",
+        ],
+        [
+            "Heat the oil in a large pan over medium heat.",
+            "Cook the onion for 5 minutes until soft.",
+            "Add the garlic, ginger and curry powder and cook for 1 minute.",
+            "Add the chicken and brown on all sides.",
+            "Pour in the coconut milk and tomatoes and bring to a simmer.",
+            "Simmer for 25 minutes, stirring occasionally.",
+            "Season to taste and serve with rice and coriander.",
+        ],
+    ),
+    (
+        "fr",
+        "Spaghetti carbonara traditionnelle",
+        [
+            "4 jaunes d'œufs",
+            "200 g de pancetta",
+            "400 g de spaghetti",
+            "40 g de parmesan râpé",
+            "sel",
+            "poivre",
+            "1 cuillère à soupe d'huile d'olive",
+        ],
+        [
+            "Battre les jaunes d'œufs avec le sel, le poivre et le parmesan.",
+            "Faire chauffer une grande casserole d'eau salée.",
+            "Couper la pancetta et la faire dorer 5 minutes dans l'huile.",
+            "Quand l'eau bout, mettez les pâtes à cuire.",
+            "Égoutter les pâtes et les mettre dans la poêle.",
+            "Incorporer la préparation aux jaunes d'œufs hors du feu.",
+            "Servez aussitôt avec du poivre.",
+        ],
+    ),
+    (
+        "fr",
+        "Gratin dauphinois",
+        [
+            "1 kg de pommes de terre",
+            "50 cl de crème liquide",
+            "25 cl de lait",
+            "2 gousses d'ail",
+            "noix de muscade",
+            "30 g de beurre",
+            "sel, poivre",
+        ],
+        [
+            "Préchauffer le four à 160°C.",
+            "Éplucher les pommes de terre et les couper en fines rondelles.",
+            "Frotter le plat avec l'ail puis le beurrer.",
+            "Porter à ébullition le lait et la crème avec la muscade.",
+            "Disposer les pommes de terre en couches dans le plat.",
+            "Verser le mélange lait-crème par-dessus, saler et poivrer.",
+            "Enfourner pour 1 h 30 jusqu'à ce que le dessus soit doré.",
+        ],
+    ),
+]
+
+WORDS = {
+    "en": [
+        "quick",
+        "easy",
+        "dinner",
+        "healthy",
+        "vegan",
+        "dessert",
+        "cake",
+        "soup",
+        "salad",
+        "pasta",
+        "chicken",
+        "beef",
+        "budget",
+        "family",
+        "holiday",
+        "summer",
+        "winter",
+        "baking",
+        "grill",
+        "slow",
+        "cooker",
+        "best",
+        "ever",
+        "perfect",
+        "homemade",
+        "simple",
+        "classic",
+        "spicy",
+        "creamy",
+    ],
+    "fr": [
+        "rapide",
+        "facile",
+        "dîner",
+        "léger",
+        "végétarien",
+        "dessert",
+        "gâteau",
+        "soupe",
+        "salade",
+        "pâtes",
+        "poulet",
+        "bœuf",
+        "économique",
+        "famille",
+        "fêtes",
+        "été",
+        "hiver",
+        "four",
+        "gratin",
+        "tarte",
+        "maison",
+        "simple",
+        "classique",
+        "épicé",
+        "crémeux",
+        "recette",
+    ],
+}
+LABELS = {
+    "en": ("Ingredients", "Instructions", "Comments", "You may also like"),
+    "fr": ("Ingrédients", "Préparation", "Commentaires", "Vous aimerez aussi"),
+}
+
+
+def _phrase(rng: random.Random, lang: str, words: int) -> str:
+    return " ".join(rng.choice(WORDS[lang]) for _ in range(words)).capitalize()
+
+
+def _links(rng: random.Random, lang: str, count: int) -> str:
+    return "\n".join(
+        f'<li><a href="/c/{rng.randrange(10**6)}">{_phrase(rng, lang, 3)}</a></li>'
+        for _ in range(count)
+    )
+
+
+def _page(seed: int, lang: str, title: str, ingredients, steps, minified: bool):
+    rng = random.Random(seed)
+    ingredients_label, steps_label, comments_label, related_label = LABELS[lang]
+    state = {
+        "props": {
+            "page": [
+                {"id": rng.randrange(10**9), "slug": _phrase(rng, lang, 6)}
+                for _ in range(300)
+            ]
+        }
+    }
+    comments = "\n".join(
+        f'<article class="comment"><p class="author">user{rng.randrange(999)}</p>'
+        f"<p>{_phrase(rng, lang, rng.randint(10, 40))}.</p></article>"
+        for _ in range(40)
+    )
+    related = "\n".join(
+        f'<div class="card"><h3>{_phrase(rng, lang, 4)}</h3>'
+        f"<p>{_phrase(rng, lang, 15)}</p><span>{rng.randint(10, 90)} min</span></div>"
+        for _ in range(25)
+    )
+    page = f"""<!DOCTYPE html>
+<html lang="{lang}">
+<head>
+<title>{html.escape(title)} | Example Recipes</title>
+<style>body {{ font-family: sans-serif; }} .card {{ margin: 1em; }}</style>
+<script>window.dataLayer = window.dataLayer || []; gtag('config', 'G-XXXX');</script>
+</head>
+<body>
+<div id="cookie-banner"><p>We use cookies to improve your experience.</p>
+<button>Accept</button><button>Manage cookies</button></div>
+<header><a href="/">Example Recipes</a>
+<nav><ul>{_links(rng, lang, 120)}</ul></nav></header>
+<div class="site-wrapper">
+<main>
+<h1>{html.escape(title)}</h1>
+<p class="intro">{_phrase(rng, lang, 60)}.</p>
+<p>{_phrase(rng, lang, 80)}.</p>
+<div class="share-buttons"><a>Facebook</a><a>Pinterest</a><a>Email</a></div>
+<h2>{ingredients_label}</h2>
+<ul>{"".join(f"<li>{html.escape(i)}</li>" for i in ingredients)}</ul>
+<h2>{steps_label}</h2>
+<ol>{"".join(f"<li><p>{html.escape(s)}</p></li>" for s in steps)}</ol>
+<p>{_phrase(rng, lang, 40)}.</p>
+</main>
+<aside><h2>{related_label}</h2>{related}</aside>
+<section id="comments"><h2>{comments_label}</h2>{comments}</section>
+</div>
+<div class="newsletter"><p>{_phrase(rng, lang, 20)}</p></div>
+<footer><ul>{_links(rng, lang, 200)}</ul><p>© 2026 Example Recipes</p></footer>
+<script id="__NEXT_DATA__" type="application/json">{json.dumps(state)}</script>
+</body>
+</html>
+"""
+    if minified:
+        page = "".join(line.strip() for line in page.splitlines())
+    return page.encode()
+
+
+def synthetic_pages() -> list[CorpusPage]:
+    """The recipes above, each in a formatted and a minified page."""
+    pages = []
+    for seed, (lang, title, ingredients, steps) in enumerate(RECIPES):
+        for minified in (False, True):
+            name = f"{lang}-{seed}{'-min' if minified else ''}"
+            page = _page(seed, lang, title, ingredients, steps, minified)
+            pages.append(CorpusPage(name, page, [*ingredients, *steps]))
+    return pages
+
+
+def load_corpus(directory: Path) -> list[CorpusPage]:
+    """Recorded pages of directory, in name order."""
+    pages = []
+    for path in sorted(directory.glob("*.html")):
+        expected_path = path.with_suffix(".txt")
+        expected = (
+            [line for line in expected_path.read_text().splitlines() if line.strip()]
+            if expected_path.exists()
+            else []
+        )
+        pages.append(CorpusPage(path.stem, path.read_bytes(), expected))
+    return pages
@@ -1,26 +1,81 @@
 """FastAPI application for Recipe Gantt."""
 
+import asyncio
+import dataclasses
+import json
 import logging
+from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
 from typing import Annotated, Literal
 
 from fastapi import Depends, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, HttpUrl, field_validator
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
-from sqlalchemy.orm import Session
-from starlette.concurrency import run_in_threadpool
-
-from src.db.database import check_database_connection, get_db, run_migrations
-from src.db.repository import RecipeHistoryRepository
-from src.services.graph import ganntify_recipe
-from src.services.search import search_recipes
-from src.services.url_safety import validate_public_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.environment import (
+    get_hit_flush_interval,
+    get_llm_cache_persist,
+    get_openai_prewarm,
+    get_parse_pool_workers,
+    get_popular_refresh_interval,
+    get_recipe_cache_max_entries,
+    get_recipe_cache_ttl,
+)
+from src.db.database import (
+    check_async_database_connection,
+    check_database_connection,
+    dispose_async_engine,
+    get_async_db,
+    get_async_session_local,
+    run_migrations,
+)
+from src.db.locks import run_with_claim
+from src.db.repository import (
+    LlmResultRepository,
+    RecipeHistoryRepository,
+    UrlVerdictRepository,
+)
+from src.services.ai_service import (
+    close_openai_client,
+    count_llm_calls,
+    extraction_stats,
+    llm_results,
+    warm_openai_client,
+)
+from src.services.graph import StageCallback, ganntify_recipe, pipeline_stats
+from src.services.hit_tracker import HitTracker
+from src.services.http_client import close_http_client, get_http_client
+from src.services.loop_monitor import LoopLagMonitor
+from src.services.parse_pool import (
+    close_parse_pool,
+    parse_pool_stats,
+    start_parse_pool,
+    warm_parse_pool,
+)
+from src.services.prefetch import prefetched_pages
+from src.services.scraping import prefetch_downloads, url_verdicts
+from src.services.search import (
+    search_provider,
+    search_recipes,
+    stream_search_recipes,
+)
+from src.services.singleflight import SingleFlight
+from src.services.snapshot import SnapshotCache
+from src.services.ttl_cache import CacheStats, TTLCache
+from src.services.url_canonical import canonicalize_url
+from src.services.url_safety import validate_public_url_async
 
 logger = logging.getLogger(__name__)
 
+# URLs accepted by one GET /recipes call
+MAX_BULK_RECIPES = 50
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -39,10 +94,109 @@ async def lifespan(app: FastAPI):
         logger.error(f"Database initialization failed: {e}")
         raise
 
+    # Pooled clients reused by every recipe page fetch and LLM call
+    get_http_client()
+    start_parse_pool(get_parse_pool_workers())
+    await warm_parse_pool()
+    if get_openai_prewarm():
+        logger.info("Pre-warming OpenAI connection...")
+        await warm_openai_client()
+
+    await _load_url_verdicts()
+    if get_llm_cache_persist():
+        llm_results.persist_with(_load_llm_result, _save_llm_result)
+
+    hit_flusher = asyncio.create_task(hit_tracker.run(get_hit_flush_interval()))
+    popular_refresher = asyncio.create_task(
+        popular_snapshot.run(get_popular_refresh_interval())
+    )
+    verdict_saver = asyncio.create_task(
+        _save_url_verdicts_periodically(URL_VERDICT_SAVE_INTERVAL_SECONDS)
+    )
+    lag_sampler = asyncio.create_task(loop_lag.run())
+
     yield
 
     # Shutdown
     logger.info("Shutting down...")
+    popular_refresher.cancel()
+    lag_sampler.cancel()
+    # Both write out what they still hold before exiting
+    hit_flusher.cancel()
+    verdict_saver.cancel()
+    await asyncio.gather(
+        popular_refresher,
+        lag_sampler,
+        hit_flusher,
+        verdict_saver,
+        return_exceptions=True,
+    )
+    for download in prefetch_downloads:
+        download.cancel()
+    await asyncio.gather(*prefetch_downloads, return_exceptions=True)
+    await close_parse_pool()
+    await close_http_client()
+    await close_openai_client()
+    await dispose_async_engine()
+
+
+URL_VERDICT_SAVE_INTERVAL_SECONDS = 30.0
+LOOP_LAG_SAMPLE_INTERVAL_SECONDS = 0.1
+
+loop_lag = LoopLagMonitor(LOOP_LAG_SAMPLE_INTERVAL_SECONDS)
+
+
+async def _load_url_verdicts() -> None:
+    """Seed the accessibility verdicts with stored ones and processed recipes."""
+    try:
+        async with get_async_session_local()() as db:
+            recipe_urls = await RecipeHistoryRepository(db).get_urls()
+            stored = []
+            if url_verdicts.persist:
+                verdict_repo = UrlVerdictRepository(db)
+                await verdict_repo.delete_expired()
+                stored = await verdict_repo.get_live()
+    except Exception as e:
+        logger.error(f"Failed to load URL verdicts: {e}")
+        return
+
+    url_verdicts.load(stored)
+    # Recipes that went through the pipeline are known to be scrapable
+    expires_at = datetime.now(UTC) + timedelta(seconds=url_verdicts.positive_ttl)
+    url_verdicts.load((url, True, expires_at) for url in recipe_urls)
+    logger.info(
+        f"Loaded {len(stored)} stored URL verdicts and {len(recipe_urls)} recipes"
+    )
+
+
+async def _save_url_verdicts() -> None:
+    unsaved = url_verdicts.drain_unsaved()
+    if unsaved:
+        async with get_async_session_local()() as db:
+            await UrlVerdictRepository(db).save_many(unsaved)
+
+
+async def _save_url_verdicts_periodically(interval: float) -> None:
+    """Write new verdicts every interval seconds, and once more when cancelled."""
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await _save_url_verdicts()
+            except Exception:
+                logger.exception("Failed to save URL verdicts")
+    finally:
+        await _save_url_verdicts()
+
+
+async def _load_llm_result(key: str) -> str | None:
+    async with get_async_session_local()() as db:
+        return await LlmResultRepository(db).get(key)
+
+
+async def _save_llm_result(key: str, stage: str, result: str) -> None:
+    async with get_async_session_local()() as db:
+        await LlmResultRepository(db).save(key, stage, result)
 
 
 limiter = Limiter(key_func=get_remote_address)
@@ -95,6 +249,8 @@ class SearchResult(BaseModel):
     title: str
     url: str
     snippet: str
+    # A plan is stored for this recipe, so it opens without the pipeline
+    already_planned: bool = False
 
 
 class SearchResponse(BaseModel):
@@ -102,10 +258,73 @@ class SearchResponse(BaseModel):
     has_more: bool
 
 
+class SearchStreamEnd(BaseModel):
+    has_more: bool
+
+
+class StoredRecipe(BaseModel):
+    url: str
+    title: str
+    planned_steps: list[PlannedStep]
+
+
+class StoredRecipesResponse(BaseModel):
+    recipes: list[StoredRecipe]
+
+
 class PopularRecipesResponse(BaseModel):
     recipes: list[SearchResult]
 
 
+@dataclasses.dataclass
+class PipelineRun:
+    steps: list[dict]
+    # OpenAI requests the run made; none when another worker made the plan
+    llm_calls: int = 0
+
+
+@dataclasses.dataclass
+class CoalescingStats:
+    # OpenAI requests callers would have made without joining a run
+    llm_calls_saved: int = 0
+
+
+# Concurrent requests for the same uncached URL share a single pipeline run
+recipe_pipeline: SingleFlight[PipelineRun] = SingleFlight()
+coalescing_stats = CoalescingStats()
+
+# Planned steps of the hottest recipes, served without a database read
+recipe_cache: TTLCache[str, list[dict]] = TTLCache(
+    maxsize=get_recipe_cache_max_entries(), ttl=get_recipe_cache_ttl()
+)
+
+
+async def _flush_hits(hits: dict[str, int]) -> None:
+    async with get_async_session_local()() as db:
+        await RecipeHistoryRepository(db).record_hits(hits)
+
+
+# Recipe requests, written to the popularity score in the background
+hit_tracker = HitTracker(_flush_hits)
+
+
+async def _build_popular_recipes() -> bytes:
+    async with get_async_session_local()() as db:
+        entries = await RecipeHistoryRepository(db).get_popular(limit=10)
+    response = PopularRecipesResponse(
+        recipes=[
+            SearchResult(title=e.title, url=e.url, snippet=e.snippet) for e in entries
+        ]
+    )
+    return response.model_dump_json().encode()
+
+
+# Serialized /popular_recipes body, shared by every request until rebuilt
+popular_snapshot = SnapshotCache(
+    _build_popular_recipes, max_age=2 * get_popular_refresh_interval()
+)
+
+
 @app.get("/")
 async def root():
     return {"message": "Hello World"}
@@ -115,7 +334,7 @@ async def root():
 async def health():
     """Health check endpoint that verifies database connectivity."""
     try:
-        check_database_connection()
+        await check_async_database_connection()
         return {"status": "healthy", "database": "connected"}
     except Exception as e:
         raise HTTPException(
@@ -124,6 +343,68 @@ async def health():
         ) from e
 
 
+@app.get("/metrics")
+async def metrics():
+    """In-process counters for this worker."""
+    stats = recipe_pipeline.stats
+    return {
+        "recipe_pipeline": {
+            "runs": stats.leaders,
+            "coalesced": stats.followers,
+            "failures": stats.failures,
+            "llm_calls_saved": coalescing_stats.llm_calls_saved,
+        },
+        "recipe_cache": {
+            "size": len(recipe_cache),
+            **dataclasses.asdict(recipe_cache.stats),
+        },
+        "popular_snapshot": dataclasses.asdict(popular_snapshot.stats),
+        "url_verdicts": {
+            "size": len(url_verdicts),
+            **dataclasses.asdict(url_verdicts.stats),
+        },
+        "hit_tracker": {
+            "pending": hit_tracker.pending,
+            **dataclasses.asdict(hit_tracker.stats),
+        },
+        "pipeline_modes": {
+            mode: dataclasses.asdict(stats) for mode, stats in pipeline_stats.items()
+        },
+        "recipe_extraction": dataclasses.asdict(extraction_stats),
+        "llm_cache": {
+            "memory_size": len(llm_results.memory),
+            "stages": {
+                stage: dataclasses.asdict(stats)
+                for stage, stats in llm_results.stats.items()
+            },
+        },
+        "event_loop": {
+            "lag_ms_p50": loop_lag.percentile(0.5),
+            "lag_ms_p99": loop_lag.percentile(0.99),
+            **dataclasses.asdict(loop_lag.stats),
+        },
+        "parse_pool": dataclasses.asdict(parse_pool_stats),
+        "prefetched_pages": {
+            "size": len(prefetched_pages),
+            "bytes": prefetched_pages.weight,
+            "hit_rate": _hit_rate(prefetched_pages.stats),
+            **dataclasses.asdict(prefetched_pages.stats),
+        },
+        "search_providers": {
+            provider.name: {
+                **dataclasses.asdict(search_provider.stats[provider.name]),
+                "abandoned_threads": provider.abandoned_threads,
+            }
+            for provider in search_provider.providers
+        },
+    }
+
+
+def _hit_rate(stats: CacheStats) -> float | None:
+    lookups = stats.hits + stats.misses
+    return stats.hits / lookups if lookups else None
+
+
 @app.get("/search_recipes")
 @limiter.limit("30/minute")
 async def search_recipes_api(
@@ -132,68 +413,317 @@ async def search_recipes_api(
     locale: Literal["en", "fr"],
     page: Annotated[int, Query(ge=0, le=100)] = 0,
 ) -> SearchResponse:
-    data = await run_in_threadpool(search_recipes, query, locale, page)
+    data = await search_recipes(query, locale, page, find_planned=_find_planned_urls)
     return SearchResponse(
         results=[SearchResult(**r) for r in data["results"]],
         has_more=data["has_more"],
     )
 
 
-@app.get("/popular_recipes")
+@app.get("/search_recipes/stream")
+@limiter.limit("30/minute")
+async def search_recipes_stream_api(
+    request: Request,
+    query: Annotated[str, Query(min_length=1, max_length=200)],
+    locale: Literal["en", "fr"],
+    page: Annotated[int, Query(ge=0, le=100)] = 0,
+) -> StreamingResponse:
+    """Newline-delimited JSON variant of /search_recipes.
+
+    Emits one SearchResult per line as soon as it is verified, in rank
+    order, then a final {"has_more": bool} line.
+    """
+    records = await stream_search_recipes(
+        query, locale, page, find_planned=_find_planned_urls
+    )
+    return StreamingResponse(
+        _ndjson_search_records(records),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _find_planned_urls(urls: list[str]) -> set[str]:
+    """Return which canonical urls have a stored plan, in memory first.
+
+    A failed lookup only costs the flags, never the search.
+    """
+    planned = {url for url in urls if url in recipe_cache}
+    missing = [url for url in urls if url not in planned]
+    if not missing:
+        return planned
+    try:
+        async with get_async_session_local()() as db:
+            planned |= await RecipeHistoryRepository(db).get_planned_urls(missing)
+    except Exception as e:
+        logger.warning(f"Failed to look up planned recipes: {e}")
+    return planned
+
+
+async def _ndjson_search_records(records: AsyncIterator[dict]) -> AsyncIterator[str]:
+    async for record in records:
+        if "has_more" in record:
+            line = SearchStreamEnd(**record).model_dump_json()
+        else:
+            line = SearchResult(**record).model_dump_json()
+        yield line + "\n"
+
+
+@app.get("/popular_recipes", response_model=PopularRecipesResponse)
 @limiter.limit("60/minute")
-async def get_popular_recipes(
-    request: Request, db: Session = Depends(get_db)
-) -> PopularRecipesResponse:
-    """Return the list of recently processed recipes."""
-    repo = RecipeHistoryRepository(db)
-    entries = repo.get_popular(limit=10)
-    return PopularRecipesResponse(
-        recipes=[
-            SearchResult(title=e.title, url=e.url, snippet=e.snippet) for e in entries
+async def get_popular_recipes(request: Request) -> Response:
+    """Return the most requested recipes, favouring recent requests.
+
+    Served from a periodically rebuilt snapshot, with an ETag so clients and
+    caches can revalidate without downloading the list again.
+    """
+    snapshot = await popular_snapshot.get()
+    headers = {
+        "ETag": snapshot.etag,
+        "Cache-Control": f"public, max-age={int(get_popular_refresh_interval())}",
+    }
+    if _etag_matches(request.headers.get("if-none-match"), snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(snapshot.body, media_type="application/json", headers=headers)
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if if_none_match is None:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+@app.get("/recipes")
+@limiter.limit("30/minute")
+async def get_recipes_api(
+    request: Request,
+    urls: Annotated[list[str], Query(min_length=1, max_length=MAX_BULK_RECIPES)],
+    db: AsyncSession = Depends(get_async_db),
+) -> StoredRecipesResponse:
+    """Return the stored plans of several recipes in one round trip.
+
+    Lets clients warm their own cache. Recipes without a stored plan and
+    malformed URLs are left out, and each plan is listed under the URL it
+    was requested with.
+    """
+    requested: dict[str, list[str]] = {}
+    for url in urls:
+        try:
+            requested.setdefault(canonicalize_url(url), []).append(url)
+        except ValueError:
+            continue
+
+    rows = await RecipeHistoryRepository(db).get_many(list(requested))
+    recipes = []
+    for row in rows:
+        recipe_cache.set(row.url, row.planned_steps)
+        steps = _to_planned_steps(row.planned_steps).planned_steps
+        recipes += [
+            StoredRecipe(url=url, title=row.title, planned_steps=steps)
+            for url in requested[row.url]
         ]
-    )
+    return StoredRecipesResponse(recipes=recipes)
 
 
 @app.post("/ganntify_recipe_data")
 @limiter.limit("10/minute")
 async def ganntify_recipe_data_api(
-    request: Request, recipe_url: RecipeUrl, db: Session = Depends(get_db)
+    request: Request, recipe_url: RecipeUrl, db: AsyncSession = Depends(get_async_db)
 ):
-    url = str(recipe_url.recipe_url)
-    try:
-        validate_public_url(url)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e)) from e
-
+    url, cache_key = await _validated_url(recipe_url)
     repo = RecipeHistoryRepository(db)
 
     # Check cache first
-    cached = repo.get_by_url(url)
-    if cached:
-        repo.touch(url)
-        return PlannedSteps(
-            planned_steps=[
-                PlannedStep(
-                    step_id=str(step["step_id"]),
-                    step_name=step["step_name"],
-                    duration_minute=step.get("duration_minute"),
-                    dependencies=step.get("dependencies", []),
-                    ingredients=step.get("ingredients", []),
-                )
-                for step in cached.planned_steps
-            ]
-        )
+    cached_steps = await _get_cached_steps(repo, cache_key)
+    if cached_steps is not None:
+        hit_tracker.record(cache_key)
+        return _to_planned_steps(cached_steps)
 
-    # Process recipe
+    # Hand the connection back: the pipeline takes its own while it runs
+    await db.close()
+
+    # Process recipe, joining any run already in flight for this page
     try:
-        planned_steps, extracted_title = await ganntify_recipe(url)
+        steps_data = await _shared_pipeline_run(url, cache_key, recipe_url)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to process recipe: {str(e)}",
         ) from e
 
-    # Store in database
+    hit_tracker.record(cache_key)
+    return _to_planned_steps(steps_data)
+
+
+@app.post("/ganntify_recipe_data/stream")
+@limiter.limit("10/minute")
+async def ganntify_recipe_data_stream_api(
+    request: Request, recipe_url: RecipeUrl, db: AsyncSession = Depends(get_async_db)
+) -> StreamingResponse:
+    """Server-Sent Events variant of /ganntify_recipe_data.
+
+    Emits "fetched", "extracted" (title and ingredients) and "graph" events as
+    the pipeline progresses, then a "result" event carrying the planned steps,
+    or an "error" event. Cache hits emit the "result" event alone.
+    """
+    url, cache_key = await _validated_url(recipe_url)
+    repo = RecipeHistoryRepository(db)
+
+    cached_steps = await _get_cached_steps(repo, cache_key)
+    if cached_steps is not None:
+        hit_tracker.record(cache_key)
+        events = _single_event(_to_planned_steps(cached_steps))
+    else:
+        await db.close()
+        events = _stream_pipeline(url, cache_key, recipe_url)
+
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _get_cached_steps(
+    repo: RecipeHistoryRepository, cache_key: str
+) -> list[dict] | None:
+    """Look up a stored plan, in memory first, then in recipe_history."""
+    steps_data = recipe_cache.get(cache_key)
+    if steps_data is None:
+        cached = await repo.get_by_url(cache_key)
+        if cached:
+            steps_data = cached.planned_steps
+            recipe_cache.set(cache_key, steps_data)
+    return steps_data
+
+
+async def _validated_url(recipe_url: RecipeUrl) -> tuple[str, str]:
+    """Return the URL to fetch and its canonical form, the cache key."""
+    url = str(recipe_url.recipe_url)
+    try:
+        await validate_public_url_async(url)
+        return url, canonicalize_url(url)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _single_event(planned_steps: PlannedSteps) -> AsyncIterator[str]:
+    yield _sse_event("result", planned_steps.model_dump())
+
+
+async def _stream_pipeline(
+    url: str, cache_key: str, recipe_url: RecipeUrl
+) -> AsyncIterator[str]:
+    # Stage events only come from a run this request starts; joining a run
+    # already in flight here or on another worker yields the result alone.
+    stages: asyncio.Queue[tuple[str, dict]] = asyncio.Queue()
+    run = asyncio.ensure_future(
+        _shared_pipeline_run(
+            url,
+            cache_key,
+            recipe_url,
+            on_stage=lambda *event: stages.put_nowait(event),
+        )
+    )
+    next_stage = None
+    try:
+        while True:
+            next_stage = asyncio.ensure_future(stages.get())
+            await asyncio.wait({run, next_stage}, return_when=asyncio.FIRST_COMPLETED)
+            if not next_stage.done():
+                break
+            yield _sse_event(*next_stage.result())
+
+        while not stages.empty():
+            yield _sse_event(*stages.get_nowait())
+
+        try:
+            steps_data = run.result()
+        except Exception as e:
+            yield _sse_event("error", {"detail": f"Failed to process recipe: {e}"})
+            return
+        hit_tracker.record(cache_key)
+        yield _sse_event("result", _to_planned_steps(steps_data).model_dump())
+    finally:
+        # Only stops waiting: the shared run carries on for other callers
+        run.cancel()
+        if next_stage is not None:
+            next_stage.cancel()
+
+
+def _to_planned_steps(steps_data: list[dict]) -> PlannedSteps:
+    return PlannedSteps(
+        planned_steps=[
+            PlannedStep(
+                step_id=str(step["step_id"]),
+                step_name=step["step_name"],
+                duration_minute=step.get("duration_minute"),
+                dependencies=step.get("dependencies", []),
+                ingredients=step.get("ingredients", []),
+            )
+            for step in steps_data
+        ]
+    )
+
+
+async def _shared_pipeline_run(
+    url: str,
+    cache_key: str,
+    recipe_url: RecipeUrl,
+    on_stage: StageCallback | None = None,
+) -> list[dict]:
+    """Run _process_recipe, or join the run already in flight for cache_key.
+
+    on_stage is only notified by a run this call starts.
+    """
+    joined = recipe_pipeline.is_in_flight(cache_key)
+    run = await recipe_pipeline.do(
+        cache_key, lambda: _process_recipe(url, cache_key, recipe_url, on_stage)
+    )
+    if joined:
+        coalescing_stats.llm_calls_saved += run.llm_calls
+    return run.steps
+
+
+async def _process_recipe(
+    url: str,
+    cache_key: str,
+    recipe_url: RecipeUrl,
+    on_stage: StageCallback | None = None,
+) -> PipelineRun:
+    """Run the recipe pipeline once across all workers.
+
+    Fetches url and stores the result under its canonical cache_key. Runs
+    detached from the request that started it, so it uses its own database
+    sessions rather than the request-scoped one.
+    """
+    return await run_with_claim(
+        f"recipe_pipeline:{cache_key}",
+        compute=lambda: _run_pipeline(url, cache_key, recipe_url, on_stage),
+        lookup=lambda: _find_cached_steps(cache_key),
+    )
+
+
+async def _find_cached_steps(cache_key: str) -> PipelineRun | None:
+    async with get_async_session_local()() as db:
+        cached = await RecipeHistoryRepository(db).get_by_url(cache_key)
+        return PipelineRun(cached.planned_steps) if cached else None
+
+
+async def _run_pipeline(
+    url: str,
+    cache_key: str,
+    recipe_url: RecipeUrl,
+    on_stage: StageCallback | None,
+) -> PipelineRun:
+    with count_llm_calls() as llm_calls:
+        planned_steps, extracted_title = await ganntify_recipe(url, on_stage=on_stage)
+
     title = recipe_url.title or extracted_title or "Recipe"
     snippet = recipe_url.snippet or ""
     steps_data = [
@@ -206,6 +736,12 @@ async def ganntify_recipe_data_api(
         }
         for step in planned_steps
     ]
-    repo.upsert(url=url, title=title, snippet=snippet, planned_steps=steps_data)
 
-    return PlannedSteps(planned_steps=[PlannedStep(**step) for step in steps_data])
+    async with get_async_session_local()() as db:
+        await RecipeHistoryRepository(db).upsert(
+            url=cache_key, title=title, snippet=snippet, planned_steps=steps_data
+        )
+    recipe_cache.set(cache_key, steps_data)
+    url_verdicts.set(cache_key, True)
+
+    return PipelineRun(steps_data, llm_calls.calls)
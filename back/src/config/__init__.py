@@ -1,5 +1,91 @@
 """Configuration module."""
 
-from src.config.environment import get_openai_api_key
+from src.config.environment import (
+    get_access_check_max_bytes,
+    get_access_check_max_concurrency,
+    get_db_lock_pool_size,
+    get_db_max_overflow,
+    get_db_pool_size,
+    get_extract_token_budget,
+    get_hit_flush_interval,
+    get_html_text_engine_name,
+    get_http_keepalive_expiry,
+    get_http_max_connections,
+    get_http_max_connections_per_host,
+    get_http_max_keepalive_connections,
+    get_llm_cache_memory_entries,
+    get_llm_cache_memory_ttl,
+    get_llm_cache_persist,
+    get_openai_api_key,
+    get_openai_keepalive_expiry,
+    get_openai_max_connections,
+    get_openai_max_keepalive_connections,
+    get_openai_max_retries,
+    get_openai_prewarm,
+    get_parse_pool_workers,
+    get_popular_refresh_interval,
+    get_prefetch_max_bytes,
+    get_prefetch_max_page_bytes,
+    get_prefetch_parse,
+    get_prefetch_top_n,
+    get_prefetch_ttl,
+    get_recipe_cache_max_entries,
+    get_recipe_cache_ttl,
+    get_search_backends,
+    get_search_hedge_delay,
+    get_search_merge_grace,
+    get_search_provider_max_threads,
+    get_search_provider_timeout,
+    get_search_session_max_entries,
+    get_search_session_ttl,
+    get_single_call_fraction,
+    get_url_verdict_max_entries,
+    get_url_verdict_negative_ttl,
+    get_url_verdict_persist,
+    get_url_verdict_positive_ttl,
+)
 
-__all__ = ["get_openai_api_key"]
+__all__ = [
+    "get_access_check_max_bytes",
+    "get_access_check_max_concurrency",
+    "get_db_lock_pool_size",
+    "get_db_max_overflow",
+    "get_db_pool_size",
+    "get_extract_token_budget",
+    "get_hit_flush_interval",
+    "get_html_text_engine_name",
+    "get_http_keepalive_expiry",
+    "get_http_max_connections",
+    "get_http_max_connections_per_host",
+    "get_http_max_keepalive_connections",
+    "get_llm_cache_memory_entries",
+    "get_llm_cache_memory_ttl",
+    "get_llm_cache_persist",
+    "get_openai_api_key",
+    "get_openai_keepalive_expiry",
+    "get_openai_max_connections",
+    "get_openai_max_keepalive_connections",
+    "get_openai_max_retries",
+    "get_openai_prewarm",
+    "get_parse_pool_workers",
+    "get_popular_refresh_interval",
+    "get_prefetch_max_bytes",
+    "get_prefetch_max_page_bytes",
+    "get_prefetch_parse",
+    "get_prefetch_top_n",
+    "get_prefetch_ttl",
+    "get_recipe_cache_max_entries",
+    "get_recipe_cache_ttl",
+    "get_search_backends",
+    "get_search_hedge_delay",
+    "get_search_merge_grace",
+    "get_search_provider_max_threads",
+    "get_search_provider_timeout",
+    "get_search_session_max_entries",
+    "get_search_session_ttl",
+    "get_single_call_fraction",
+    "get_url_verdict_max_entries",
+    "get_url_verdict_negative_ttl",
+    "get_url_verdict_persist",
+    "get_url_verdict_positive_ttl",
+]
@@ -13,3 +13,226 @@ def get_openai_api_key() -> str:
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY environment variable is required")
     return api_key
+
+
+def _get_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _get_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def _get_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def get_http_max_connections() -> int:
+    """Total connection cap of the shared outbound HTTP client."""
+    return _get_int("HTTP_MAX_CONNECTIONS", 100)
+
+
+def get_http_max_keepalive_connections() -> int:
+    """Idle connections the shared outbound HTTP client keeps open."""
+    return _get_int("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20)
+
+
+def get_http_keepalive_expiry() -> float:
+    """Seconds an idle outbound connection is kept before being closed."""
+    return _get_float("HTTP_KEEPALIVE_EXPIRY_SECONDS", 30.0)
+
+
+def get_http_max_connections_per_host() -> int:
+    """Concurrent outbound requests allowed to a single host."""
+    return _get_int("HTTP_MAX_CONNECTIONS_PER_HOST", 6)
+
+
+def get_openai_max_connections() -> int:
+    """Connection cap of the shared OpenAI client."""
+    return _get_int("OPENAI_MAX_CONNECTIONS", 50)
+
+
+def get_openai_max_keepalive_connections() -> int:
+    """Idle connections to the OpenAI API kept open for reuse."""
+    return _get_int("OPENAI_MAX_KEEPALIVE_CONNECTIONS", 20)
+
+
+def get_openai_keepalive_expiry() -> float:
+    """Seconds an idle OpenAI connection is kept before being closed."""
+    return _get_float("OPENAI_KEEPALIVE_EXPIRY_SECONDS", 60.0)
+
+
+def get_openai_max_retries() -> int:
+    """Retries the OpenAI client makes on connection errors and 429/5xx."""
+    return _get_int("OPENAI_MAX_RETRIES", 2)
+
+
+def get_openai_prewarm() -> bool:
+    """Whether to open a connection to the OpenAI API at startup."""
+    return _get_bool("OPENAI_PREWARM", False)
+
+
+def get_db_pool_size() -> int:
+    """Connections kept open by the async database pool, per worker."""
+    return _get_int("DB_POOL_SIZE", 5)
+
+
+def get_db_max_overflow() -> int:
+    """Connections opened past DB_POOL_SIZE under load, per worker."""
+    return _get_int("DB_MAX_OVERFLOW", 10)
+
+
+def get_db_lock_pool_size() -> int:
+    """Pipeline claims held at once, per worker, each on its own connection."""
+    return _get_int("DB_LOCK_POOL_SIZE", 8)
+
+
+def get_recipe_cache_max_entries() -> int:
+    """Planned recipes kept in each worker's in-memory cache."""
+    return _get_int("RECIPE_CACHE_MAX_ENTRIES", 1000)
+
+
+def get_recipe_cache_ttl() -> float:
+    """Seconds a planned recipe is served from memory before re-reading it."""
+    return _get_float("RECIPE_CACHE_TTL_SECONDS", 3600.0)
+
+
+def get_hit_flush_interval() -> float:
+    """Seconds between batched writes of recipe hit counts."""
+    return _get_float("HIT_FLUSH_INTERVAL_SECONDS", 5.0)
+
+
+def get_popular_refresh_interval() -> float:
+    """Seconds between rebuilds of the /popular_recipes response."""
+    return _get_float("POPULAR_REFRESH_INTERVAL_SECONDS", 30.0)
+
+
+def get_search_session_ttl() -> float:
+    """Seconds a search's candidates and verdicts are reused across pages."""
+    return _get_float("SEARCH_SESSION_TTL_SECONDS", 600.0)
+
+
+def get_search_session_max_entries() -> int:
+    """Searches whose candidates and verdicts are kept in memory."""
+    return _get_int("SEARCH_SESSION_MAX_ENTRIES", 256)
+
+
+def get_search_backends() -> list[str]:
+    """ddgs backends queried for recipe search, in order of preference."""
+    value = os.getenv("SEARCH_BACKENDS", "auto")
+    return [backend.strip() for backend in value.split(",") if backend.strip()]
+
+
+def get_search_provider_timeout() -> float:
+    """Seconds a search backend may take before it counts as failed."""
+    return _get_float("SEARCH_PROVIDER_TIMEOUT_SECONDS", 5.0)
+
+
+def get_search_provider_max_threads() -> int:
+    """Threads each blocking search backend may use at once."""
+    return _get_int("SEARCH_PROVIDER_MAX_THREADS", 4)
+
+
+def get_search_hedge_delay() -> float:
+    """Seconds without an answer before the next search backend is queried."""
+    return _get_float("SEARCH_HEDGE_DELAY_SECONDS", 1.0)
+
+
+def get_search_merge_grace() -> float:
+    """Seconds other search backends get to add results once one answered."""
+    return _get_float("SEARCH_MERGE_GRACE_SECONDS", 0.2)
+
+
+def get_url_verdict_positive_ttl() -> float:
+    """Seconds a URL found scrapable is trusted without checking it again."""
+    return _get_float("URL_VERDICT_POSITIVE_TTL_SECONDS", 7 * 24 * 3600.0)
+
+
+def get_url_verdict_negative_ttl() -> float:
+    """Seconds before a URL that failed the scrapability check is retried."""
+    return _get_float("URL_VERDICT_NEGATIVE_TTL_SECONDS", 3600.0)
+
+
+def get_url_verdict_max_entries() -> int:
+    """URL accessibility verdicts kept in each worker's memory."""
+    return _get_int("URL_VERDICT_MAX_ENTRIES", 10000)
+
+
+def get_url_verdict_persist() -> bool:
+    """Whether URL accessibility verdicts are shared through the database."""
+    return _get_bool("URL_VERDICT_PERSIST", True)
+
+
+def get_access_check_max_concurrency() -> int:
+    """Search result accessibility checks in flight at once, per worker."""
+    return _get_int("ACCESS_CHECK_MAX_CONCURRENCY", 16)
+
+
+def get_access_check_max_bytes() -> int:
+    """Bytes of a search result page read at most to check its accessibility."""
+    return _get_int("ACCESS_CHECK_MAX_BYTES", 512 * 1024)
+
+
+def get_prefetch_top_n() -> int:
+    """Top results of a search page whose pages are kept for a likely click."""
+    return _get_int("PREFETCH_TOP_N", 3)
+
+
+def get_prefetch_max_bytes() -> int:
+    """Memory cap of the prefetched recipe pages, per worker."""
+    return _get_int("PREFETCH_MAX_BYTES", 64 * 1024 * 1024)
+
+
+def get_prefetch_max_page_bytes() -> int:
+    """Largest recipe page kept by prefetching."""
+    return _get_int("PREFETCH_MAX_PAGE_BYTES", 2 * 1024 * 1024)
+
+
+def get_prefetch_ttl() -> float:
+    """Seconds a prefetched recipe page is kept for a click."""
+    return _get_float("PREFETCH_TTL_SECONDS", 300.0)
+
+
+def get_prefetch_parse() -> bool:
+    """Whether the text of prefetched pages is extracted ahead of the click."""
+    return _get_bool("PREFETCH_PARSE", True)
+
+
+def get_single_call_fraction() -> float:
+    """Share of recipes planned with one LLM call instead of two (0 to 1)."""
+    return _get_float("PIPELINE_SINGLE_CALL_FRACTION", 0.0)
+
+
+def get_llm_cache_memory_entries() -> int:
+    """LLM answers kept in memory per worker, 0 to only use the database."""
+    return _get_int("LLM_CACHE_MEMORY_ENTRIES", 1000)
+
+
+def get_llm_cache_memory_ttl() -> float:
+    """Seconds an LLM answer is kept in memory."""
+    return _get_float("LLM_CACHE_MEMORY_TTL_SECONDS", 3600.0)
+
+
+def get_llm_cache_persist() -> bool:
+    """Whether LLM answers are also stored in the database."""
+    return _get_bool("LLM_CACHE_PERSIST", True)
+
+
+def get_extract_token_budget() -> int:
+    """Estimated tokens of page text sent to the LLM, 0 for the whole page."""
+    return _get_int("EXTRACT_TOKEN_BUDGET", 2500)
+
+
+def get_parse_pool_workers() -> int:
+    """Processes parsing recipe pages off the event loop, 0 to use a thread."""
+    return _get_int("PARSE_POOL_WORKERS", 2)
+
+
+def get_html_text_engine_name() -> str:
+    """Engine extracting recipe page text: streaming, lxml, bs4 or bs4-lxml."""
+    return os.getenv("HTML_TEXT_ENGINE", "streaming")
@@ -2,24 +2,50 @@
 
 from src.db.database import (
     Base,
+    check_async_database_connection,
     check_database_connection,
+    dispose_async_engine,
+    get_async_database_url,
+    get_async_db,
+    get_async_engine,
+    get_async_session_local,
     get_database_url,
     get_db,
     get_engine,
+    get_lock_engine,
     get_session_local,
     run_migrations,
 )
-from src.db.models import RecipeHistory
-from src.db.repository import RecipeHistoryRepository
+from src.db.locks import advisory_lock_key, run_with_claim, try_advisory_lock
+from src.db.models import LlmResult, RecipeHistory, UrlVerdict
+from src.db.repository import (
+    LlmResultRepository,
+    RecipeHistoryRepository,
+    UrlVerdictRepository,
+)
 
 __all__ = [
     "Base",
+    "LlmResult",
+    "LlmResultRepository",
     "RecipeHistory",
     "RecipeHistoryRepository",
+    "UrlVerdict",
+    "UrlVerdictRepository",
+    "advisory_lock_key",
+    "check_async_database_connection",
     "check_database_connection",
+    "dispose_async_engine",
+    "get_async_database_url",
+    "get_async_db",
+    "get_async_engine",
+    "get_async_session_local",
     "get_database_url",
     "get_db",
     "get_engine",
+    "get_lock_engine",
     "get_session_local",
     "run_migrations",
+    "run_with_claim",
+    "try_advisory_lock",
 ]
@@ -1,10 +1,23 @@
 """Database configuration and connection management."""
 
 import os
-
-from sqlalchemy import create_engine, text
+from collections.abc import AsyncIterator
+
+from sqlalchemy import create_engine, make_url, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
+from src.config.environment import (
+    get_db_lock_pool_size,
+    get_db_max_overflow,
+    get_db_pool_size,
+)
+
 
 def get_database_url() -> str:
     """Get the database URL from environment variables.
@@ -30,7 +43,21 @@ def get_database_url() -> str:
     return f"postgresql://{user}:{password}@{host}:{port}/{name}"
 
 
+def get_async_database_url() -> str:
+    """Get the database URL for the asyncpg driver used by the application."""
+    url = make_url(get_database_url()).set(drivername="postgresql+asyncpg")
+    # asyncpg takes "ssl" where libpq URLs use "sslmode"
+    if "sslmode" in url.query:
+        sslmode = url.query["sslmode"]
+        url = url.difference_update_query(["sslmode"]).update_query_dict(
+            {"ssl": sslmode}
+        )
+    return url.render_as_string(hide_password=False)
+
+
 # Create engine - will be initialized on first use
+# The sync engine serves Alembic migrations and startup checks; request
+# handlers go through the async engine below.
 _engine = None
 
 
@@ -66,6 +93,74 @@ def get_db():
         db.close()
 
 
+_async_engine: AsyncEngine | None = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """Get or create the asyncpg-backed SQLAlchemy engine."""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            get_async_database_url(),
+            pool_pre_ping=True,
+            pool_size=get_db_pool_size(),
+            max_overflow=get_db_max_overflow(),
+        )
+    return _async_engine
+
+
+_lock_engine: AsyncEngine | None = None
+
+
+def get_lock_engine() -> AsyncEngine:
+    """Get or create the engine whose connections hold advisory locks.
+
+    Its pool is separate from the request pool, so that long-held locks never
+    take the connections the code holding them needs.
+    """
+    global _lock_engine
+    if _lock_engine is None:
+        _lock_engine = create_async_engine(
+            get_async_database_url(),
+            pool_pre_ping=True,
+            pool_size=get_db_lock_pool_size(),
+            max_overflow=0,
+            isolation_level="AUTOCOMMIT",
+        )
+    return _lock_engine
+
+
+AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_async_session_local() -> async_sessionmaker[AsyncSession]:
+    """Get or create the async session factory."""
+    global AsyncSessionLocal
+    if AsyncSessionLocal is None:
+        AsyncSessionLocal = async_sessionmaker(
+            bind=get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return AsyncSessionLocal
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Dependency for FastAPI to get an async database session."""
+    async with get_async_session_local()() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    """Close the pooled async connections."""
+    global _async_engine, _lock_engine, AsyncSessionLocal
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        AsyncSessionLocal = None
+    if _lock_engine is not None:
+        await _lock_engine.dispose()
+        _lock_engine = None
+
+
 class Base(DeclarativeBase):
     """Base class for all SQLAlchemy models."""
 
@@ -83,6 +178,13 @@ def check_database_connection() -> bool:
     return True
 
 
+async def check_async_database_connection() -> bool:
+    """Check database reachability without blocking the event loop."""
+    async with get_async_engine().connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    return True
+
+
 def run_migrations():
     """Run pending Alembic migrations."""
     from alembic import command
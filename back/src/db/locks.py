@@ -0,0 +1,87 @@
+"""Cross-worker coordination using Postgres advisory locks."""
+
+import asyncio
+import hashlib
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import TypeVar
+
+from sqlalchemy import text
+
+from src.db.database import get_lock_engine
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CLAIM_POLL_INTERVAL_SECONDS = 1.0
+# Slightly above a slow pipeline run (page fetch + two LLM calls)
+CLAIM_WAIT_TIMEOUT_SECONDS = 60.0
+
+
+def advisory_lock_key(name: str) -> int:
+    """Map a name to the signed 64-bit key space of Postgres advisory locks."""
+    digest = hashlib.sha256(name.encode()).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+@asynccontextmanager
+async def try_advisory_lock(name: str) -> AsyncIterator[bool]:
+    """Try to take a session-level advisory lock without waiting.
+
+    Yields whether the lock was acquired. The lock is held on a dedicated
+    connection for the duration of the block; Postgres also releases it if that
+    connection is lost, e.g. when the worker crashes. The connection comes from
+    the lock engine, outside the request pool, and is in autocommit mode, so it
+    does not sit idle in a transaction meanwhile.
+    """
+    key = advisory_lock_key(name)
+    async with get_lock_engine().connect() as conn:
+        result = await conn.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": key}
+        )
+        acquired = bool(result.scalar())
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                await conn.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": key}
+                )
+
+
+async def run_with_claim(
+    name: str,
+    compute: Callable[[], Awaitable[T]],
+    lookup: Callable[[], Awaitable[T | None]],
+    poll_interval: float = CLAIM_POLL_INTERVAL_SECONDS,
+    wait_timeout: float = CLAIM_WAIT_TIMEOUT_SECONDS,
+) -> T:
+    """Compute a result at most once across workers.
+
+    The worker holding the claim on name runs compute(); the others poll
+    lookup() until the result has been stored. If the holder dies, its claim is
+    released and the next poll takes it over. Past wait_timeout, the result is
+    computed without a claim rather than failing the request.
+    """
+    deadline = asyncio.get_running_loop().time() + wait_timeout
+    while True:
+        async with try_advisory_lock(name) as acquired:
+            if acquired:
+                # Another worker may have stored the result since our cache miss
+                existing = await lookup()
+                if existing is not None:
+                    return existing
+                return await compute()
+
+        existing = await lookup()
+        if existing is not None:
+            logger.info(f"Reused result computed by another worker: {name}")
+            return existing
+
+        if asyncio.get_running_loop().time() >= deadline:
+            logger.warning(f"Timed out waiting for claim, computing anyway: {name}")
+            return await compute()
+
+        await asyncio.sleep(poll_interval)
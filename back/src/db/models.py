@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, String, Text, func
+from sqlalchemy import BigInteger, Boolean, DateTime, Float, String, Text, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -27,3 +27,35 @@ class RecipeHistory(Base):
         onupdate=func.now(),
         nullable=False,
     )
+    hit_count: Mapped[int] = mapped_column(
+        BigInteger, server_default="0", nullable=False
+    )
+    # Forward-decayed hit count, in log space (see repository.popularity_weight)
+    popularity_score: Mapped[float] = mapped_column(
+        Float, server_default="0", nullable=False
+    )
+
+
+class UrlVerdict(Base):
+    """Model for storing whether a page can be scraped, until it expires."""
+
+    __tablename__ = "url_verdicts"
+
+    url: Mapped[str] = mapped_column(String(2048), primary_key=True)
+    accessible: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
+
+
+class LlmResult(Base):
+    """Model for storing LLM answers by a hash of their inputs."""
+
+    __tablename__ = "llm_results"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    stage: Mapped[str] = mapped_column(String(32), nullable=False)
+    result: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
@@ -1,69 +1,215 @@
 """Repository for database operations."""
 
 import logging
-from datetime import UTC, datetime
+import math
+from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import desc
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    Row,
+    String,
+    any_,
+    bindparam,
+    delete,
+    desc,
+    func,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.db.models import RecipeHistory
+from src.db.models import LlmResult, RecipeHistory, UrlVerdict
 
 logger = logging.getLogger(__name__)
 
+# Popularity halves for every half-life without hits. Changing either value
+# invalidates the stored scores.
+POPULARITY_EPOCH = datetime(2026, 1, 1, tzinfo=UTC)
+POPULARITY_HALF_LIFE = timedelta(days=7)
+
+
+def popularity_weight(hits: int, at: datetime) -> float:
+    """Log of the forward-decayed weight of hits recorded at time at.
+
+    Hits are weighted by 2 ** (age since epoch / half-life), so recent hits
+    count more without ever rescoring old rows. Weights are summed in log
+    space to keep scores small.
+    """
+    age = (at - POPULARITY_EPOCH) / POPULARITY_HALF_LIFE
+    return math.log(hits) + age * math.log(2)
+
+
+def _any_url(urls: list[str]):
+    return any_(bindparam("urls", urls, type_=ARRAY(String)))
+
 
 class RecipeHistoryRepository:
     """Repository for recipe history operations."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def get_by_url(self, url: str) -> RecipeHistory | None:
+    async def get_by_url(self, url: str) -> RecipeHistory | None:
         """Fetch a cached recipe by URL."""
-        return self.db.query(RecipeHistory).filter(RecipeHistory.url == url).first()
+        result = await self.db.execute(
+            select(RecipeHistory).where(RecipeHistory.url == url)
+        )
+        return result.scalar_one_or_none()
 
-    def upsert(
+    async def upsert(
         self, url: str, title: str, snippet: str, planned_steps: list[dict]
     ) -> RecipeHistory:
-        """Insert or update a recipe in the history."""
-        existing = self.get_by_url(url)
-
-        if existing:
-            existing.title = title
-            existing.snippet = snippet
-            existing.planned_steps = planned_steps
-            existing.updated_at = datetime.now(UTC)
-            self.db.commit()
-            self.db.refresh(existing)
-            logger.info(f"Updated cached recipe: {url}")
-            return existing
-
-        recipe = RecipeHistory(
-            url=url,
-            title=title,
-            snippet=snippet,
-            planned_steps=planned_steps,
+        """Insert or update a recipe in the history.
+
+        A single INSERT ... ON CONFLICT statement, so concurrent writers of
+        the same URL cannot collide on the primary key.
+        """
+        stmt = insert(RecipeHistory).values(
+            url=url, title=title, snippet=snippet, planned_steps=planned_steps
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[RecipeHistory.url],
+            set_={
+                "title": stmt.excluded.title,
+                "snippet": stmt.excluded.snippet,
+                "planned_steps": stmt.excluded.planned_steps,
+                "updated_at": func.now(),
+            },
+        ).returning(RecipeHistory)
+
+        result = await self.db.execute(
+            select(RecipeHistory).from_statement(stmt),
+            execution_options={"populate_existing": True},
         )
-        self.db.add(recipe)
-        self.db.commit()
-        self.db.refresh(recipe)
-        logger.info(f"Cached new recipe: {url}")
+        recipe = result.scalar_one()
+        await self.db.commit()
+        logger.info(f"Cached recipe: {url}")
         return recipe
 
-    def touch(self, url: str) -> bool:
-        """Update the updated_at timestamp to move recipe to top of popular list."""
-        recipe = self.get_by_url(url)
-        if recipe:
-            recipe.updated_at = datetime.now(UTC)
-            self.db.commit()
-            logger.info(f"Touched recipe (cache hit): {url}")
-            return True
-        return False
-
-    def get_popular(self, limit: int = 10) -> list[RecipeHistory]:
-        """Get the most recently accessed recipes."""
-        return (
-            self.db.query(RecipeHistory)
-            .order_by(desc(RecipeHistory.updated_at))
+    async def record_hits(self, hits: dict[str, int]) -> None:
+        """Add batched hit counts to hit_count and popularity_score."""
+        now = datetime.now(UTC)
+        table = RecipeHistory.__table__
+        weight = bindparam("weight")
+        score = table.c.popularity_score
+        # log(exp(score) + exp(weight)) without overflowing
+        new_score = func.greatest(score, weight) + func.ln(
+            1 + func.exp(-func.abs(score - weight))
+        )
+        # Core statement on the table, so the batch goes out as one executemany
+        await self.db.execute(
+            update(table)
+            .where(table.c.url == bindparam("hit_url"))
+            .values(
+                hit_count=table.c.hit_count + bindparam("hits"),
+                popularity_score=new_score,
+            ),
+            [
+                {"hit_url": url, "hits": n, "weight": popularity_weight(n, now)}
+                for url, n in hits.items()
+            ],
+        )
+        await self.db.commit()
+
+    async def get_planned_urls(self, urls: list[str]) -> set[str]:
+        """Return which of urls have a stored plan, in one query.
+
+        The URLs are bound as a single array (url = ANY(:urls)), so every
+        batch size shares one prepared statement.
+        """
+        result = await self.db.execute(
+            select(RecipeHistory.url).where(RecipeHistory.url == _any_url(urls))
+        )
+        return set(result.scalars().all())
+
+    async def get_many(self, urls: list[str]) -> list[Row]:
+        """Get url, title and planned_steps of the stored recipes among urls."""
+        result = await self.db.execute(
+            select(
+                RecipeHistory.url, RecipeHistory.title, RecipeHistory.planned_steps
+            ).where(RecipeHistory.url == _any_url(urls))
+        )
+        return list(result.all())
+
+    async def get_urls(self) -> list[str]:
+        """Get the URL of every processed recipe."""
+        result = await self.db.execute(select(RecipeHistory.url))
+        return list(result.scalars().all())
+
+    async def get_popular(self, limit: int = 10) -> list[Row]:
+        """Get title, url and snippet of the recipes with the highest scores.
+
+        Only the listed columns are read, never the planned_steps document.
+        """
+        result = await self.db.execute(
+            select(RecipeHistory.title, RecipeHistory.url, RecipeHistory.snippet)
+            .order_by(desc(RecipeHistory.popularity_score))
             .limit(limit)
-            .all()
         )
+        return list(result.all())
+
+
+class UrlVerdictRepository:
+    """Repository for URL accessibility verdicts."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_live(self) -> list[Row]:
+        """Get url, accessible and expires_at of every unexpired verdict."""
+        result = await self.db.execute(
+            select(UrlVerdict.url, UrlVerdict.accessible, UrlVerdict.expires_at).where(
+                UrlVerdict.expires_at > func.now()
+            )
+        )
+        return list(result.all())
+
+    async def save_many(self, verdicts: dict[str, tuple[bool, datetime]]) -> None:
+        """Insert or replace verdicts, given as url -> (accessible, expires_at)."""
+        stmt = insert(UrlVerdict)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UrlVerdict.url],
+            set_={
+                "accessible": stmt.excluded.accessible,
+                "expires_at": stmt.excluded.expires_at,
+            },
+        )
+        await self.db.execute(
+            stmt,
+            [
+                {"url": url, "accessible": accessible, "expires_at": expires_at}
+                for url, (accessible, expires_at) in verdicts.items()
+            ],
+        )
+        await self.db.commit()
+
+    async def delete_expired(self) -> int:
+        """Delete expired verdicts and return how many were removed."""
+        result = await self.db.execute(
+            delete(UrlVerdict).where(UrlVerdict.expires_at <= func.now())
+        )
+        await self.db.commit()
+        return result.rowcount
+
+
+class LlmResultRepository:
+    """Repository for cached LLM answers."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get(self, key: str) -> str | None:
+        """Fetch the answer stored under key."""
+        result = await self.db.execute(
+            select(LlmResult.result).where(LlmResult.key == key)
+        )
+        return result.scalar_one_or_none()
+
+    async def save(self, key: str, stage: str, result: str) -> None:
+        """Store an answer, keeping the existing one if another worker won."""
+        await self.db.execute(
+            insert(LlmResult)
+            .values(key=key, stage=stage, result=result)
+            .on_conflict_do_nothing(index_elements=[LlmResult.key])
+        )
+        await self.db.commit()
@@ -1,15 +1,29 @@
 """Services module."""
 
-from src.services.ai_service import extract_recipe, generate_dependency_graph
+from src.services.ai_service import (
+    extract_recipe,
+    extract_recipe_from_page,
+    generate_dependency_graph,
+    generate_recipe_plan,
+    load_recipe_page,
+)
 from src.services.graph import (
     PlannedStep,
+    StageCallback,
     ganntify_recipe,
     parse_recipe_graph,
     plan_steps,
     to_time,
     visit_recipe_graph,
 )
-from src.services.schemas import Dependency, ExtractedRecipe, RecipeGraph, Step
+from src.services.page_text import ParsedPage, parse_recipe_page
+from src.services.schemas import (
+    Dependency,
+    ExtractedRecipe,
+    RecipeGraph,
+    RecipePlan,
+    Step,
+)
 from src.services.scraping import (
     can_fetch_content,
     filter_accessible_urls,
@@ -17,22 +31,32 @@ from src.services.scraping import (
     is_blacklisted_domain,
 )
 from src.services.search import search_recipes
+from src.services.text_reduction import estimate_tokens, reduce_page_text
 
 __all__ = [
     "Dependency",
     "ExtractedRecipe",
+    "ParsedPage",
     "PlannedStep",
     "RecipeGraph",
+    "RecipePlan",
+    "StageCallback",
     "Step",
     "can_fetch_content",
+    "estimate_tokens",
     "extract_recipe",
+    "extract_recipe_from_page",
     "filter_accessible_urls",
     "ganntify_recipe",
     "generate_dependency_graph",
+    "generate_recipe_plan",
     "get_website_text",
     "is_blacklisted_domain",
+    "load_recipe_page",
     "parse_recipe_graph",
+    "parse_recipe_page",
     "plan_steps",
+    "reduce_page_text",
     "search_recipes",
     "to_time",
     "visit_recipe_graph",
@@ -1,19 +1,43 @@
 """OpenAI integration for recipe extraction and processing."""
 
-import re
+import dataclasses
+import logging
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from urllib.parse import urljoin
 
-from bs4 import BeautifulSoup
-from httpx import AsyncClient, HTTPError, Timeout
-from openai import AsyncOpenAI
+from httpx import HTTPError, Limits, Timeout
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from pydantic import BaseModel
+
+from src.config.environment import (
+    get_extract_token_budget,
+    get_llm_cache_memory_entries,
+    get_llm_cache_memory_ttl,
+    get_openai_api_key,
+    get_openai_keepalive_expiry,
+    get_openai_max_connections,
+    get_openai_max_keepalive_connections,
+    get_openai_max_retries,
+)
+from src.services.http_client import get_http_client, host_slot
+from src.services.llm_cache import LlmResultCache, stage_key
+from src.services.page_text import ParsedPage
+from src.services.parse_pool import parse_page
+from src.services.prefetch import take_prefetched_page
+from src.services.schemas import ExtractedRecipe, RecipeGraph, RecipePlan
+from src.services.text_reduction import reduce_page_text
+from src.services.url_safety import validate_public_url_async
 
-from src.config.environment import get_openai_api_key
-from src.services.schemas import ExtractedRecipe
-from src.services.url_safety import validate_public_url
+logger = logging.getLogger(__name__)
 
 MODEL = "gpt-4.1-mini"
 REQUEST_TIMEOUT = Timeout(connect=5.0, read=20.0, write=10.0, pool=5.0)
 MAX_REDIRECTS = 5
+
+# Validates a parsed LLM answer beyond its schema, raising if it is unusable
+AnswerCheck = Callable[[BaseModel], object]
 USER_AGENT = (
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
     "AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -109,9 +133,116 @@ Here are the ingredients:
 {ingredients}
 """
 
+prompt_page_to_plan = """
+I will provide you with the full text of a cooking website page.
+Your goal is to extract the recipe and represent it as a dependency graph, where each edge represents the fact\
+ that a step must be performed before another.
+The output will be:
+- "title": the name of the recipe
+- "ingredients": the list of ingredients as text, preserving quantities
+- "steps": a list of steps of the recipe (not headers/footers), each with:
+  - a unique id
+  - a simple description (name)
+  - a duration in minutes ONLY if explicitly mentioned in the recipe (e.g. "cook for 10 minutes"). If no duration is stated, set to null. If duration is variable (2 to 3 minutes), take the longest interval. Never add a duration if it is not explicitly stated in the recipe.
+  - a list of ingredients used in this step (ingredients). Include quantities when relevant (e.g. "400g of tomatoes"), but some ingredients don't need quantities (e.g. "salt", "pepper", "olive oil").
+- "dependencies": a list of edges that determines the dependencies between steps
+
+Answer in JSON format.
+
+___
+Example output (excerpt):
+{{
+    "title": "Spaghetti carbonara",
+    "ingredients": "4 jaunes d'œufs, 200g de pancetta, 400g de spaghetti, 40g de parmesan râpé, sel, poivre, huile d'olive",
+    "steps": [
+        {{"id": 1, "name": "Battre les jaunes d'oeufs et ajouter du sel et du parmesan", "duration": null, "ingredients": ["4 jaunes d'oeufs", "40g de parmesan râpé", "sel", "poivre"]}},
+        {{"id": 2, "name": "Faire bouillir une grande casserole d'eau", "duration": null, "ingredients": ["sel"]}},
+        {{"id": 3, "name": "Cuire les pâtes quand l'eau bout", "duration": null, "ingredients": ["400g de spaghetti"]}},
+        {{"id": 4, "name": "Mélanger les pâtes avec la préparation de jaunes d'oeufs", "duration": null, "ingredients": []}}
+    ],
+    "dependencies": [{{"do": 1, "before": 4}}, {{"do": 2, "before": 3}}, {{"do": 3, "before": 4}}]
+}}
+___
+Here is the text:
+{text}
+"""
+
+
+@dataclasses.dataclass
+class ExtractionStats:
+    # Recipes read from structured data, without an OpenAI call
+    structured: int = 0
+    llm: int = 0
+
+
+extraction_stats = ExtractionStats()
+
+
+@dataclasses.dataclass
+class LlmCallCount:
+    # OpenAI requests made, not counting answers from the LLM result cache
+    calls: int = 0
+
+
+_llm_call_count: ContextVar[LlmCallCount | None] = ContextVar(
+    "llm_call_count", default=None
+)
+
+
+@contextmanager
+def count_llm_calls() -> Iterator[LlmCallCount]:
+    """Count the OpenAI requests made by the current task within the block."""
+    count = LlmCallCount()
+    token = _llm_call_count.set(count)
+    try:
+        yield count
+    finally:
+        _llm_call_count.reset(token)
+
+
+llm_results = LlmResultCache(
+    maxsize=get_llm_cache_memory_entries(), ttl=get_llm_cache_memory_ttl()
+)
+
+_openai_client: AsyncOpenAI | None = None
+
+
+def create_openai_client() -> AsyncOpenAI:
+    """Build an OpenAI client with a connection pool sized from config."""
+    return AsyncOpenAI(
+        api_key=get_openai_api_key(),
+        max_retries=get_openai_max_retries(),
+        http_client=DefaultAsyncHttpxClient(
+            limits=Limits(
+                max_connections=get_openai_max_connections(),
+                max_keepalive_connections=get_openai_max_keepalive_connections(),
+                keepalive_expiry=get_openai_keepalive_expiry(),
+            )
+        ),
+    )
+
 
 def _get_openai_client() -> AsyncOpenAI:
-    return AsyncOpenAI(api_key=get_openai_api_key())
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = create_openai_client()
+    return _openai_client
+
+
+async def warm_openai_client() -> None:
+    """Open a pooled connection to the API before the first recipe comes in."""
+    try:
+        await _get_openai_client().models.list()
+    except Exception as e:
+        logger.warning(f"OpenAI connection pre-warm failed: {e}")
+
+
+async def close_openai_client() -> None:
+    """Close the shared OpenAI client and its pooled connections."""
+    global _openai_client
+    if _openai_client is not None:
+        await _openai_client.close()
+        _openai_client = None
 
 
 async def _safe_get(url: str) -> bytes:
@@ -119,77 +250,129 @@ async def _safe_get(url: str) -> bytes:
     headers = {"User-Agent": USER_AGENT}
 
     current_url = url
-    validate_public_url(current_url)
-
-    async with AsyncClient(timeout=REQUEST_TIMEOUT, follow_redirects=False) as client:
-        for _ in range(MAX_REDIRECTS + 1):
-            try:
-                response = await client.get(current_url, headers=headers)
-                if 300 <= response.status_code < 400:
-                    location = response.headers.get("location")
-                    if not location:
-                        raise RuntimeError(
-                            "Recipe URL redirected without location header"
-                        )
-                    current_url = urljoin(str(response.url), location)
-                    validate_public_url(current_url)
-                    continue
-
-                response.raise_for_status()
-            except HTTPError as exc:
-                raise RuntimeError(f"Failed to fetch recipe URL: {exc}") from exc
-            return response.content
+    await validate_public_url_async(current_url)
+
+    client = get_http_client()
+    for _ in range(MAX_REDIRECTS + 1):
+        try:
+            async with host_slot(current_url):
+                response = await client.get(
+                    current_url, headers=headers, timeout=REQUEST_TIMEOUT
+                )
+            if 300 <= response.status_code < 400:
+                location = response.headers.get("location")
+                if not location:
+                    raise RuntimeError("Recipe URL redirected without location header")
+                current_url = urljoin(str(response.url), location)
+                await validate_public_url_async(current_url)
+                continue
+
+            response.raise_for_status()
+        except HTTPError as exc:
+            raise RuntimeError(f"Failed to fetch recipe URL: {exc}") from exc
+        return response.content
 
     raise RuntimeError("Recipe URL redirected too many times")
 
 
+async def load_recipe_page(url: str) -> tuple[bytes, ParsedPage]:
+    """Return a recipe page and its text, reusing any prefetched work."""
+    prefetched = take_prefetched_page(url)
+    if prefetched is None:
+        html_content = await _safe_get(url)
+        return html_content, await parse_page(html_content)
+    parsed = prefetched.parsed or await parse_page(prefetched.html)
+    return prefetched.html, parsed
+
+
 async def extract_recipe(url: str) -> ExtractedRecipe:
     """Extract recipe content from a URL using AI."""
-    # Fetch page and extract title
-    html_content = await _safe_get(url)
-    soup = BeautifulSoup(html_content, "html.parser")
-
-    # Extract title
-    title = ""
-    title_tag = soup.find("title")
-    if title_tag and title_tag.string:
-        title = title_tag.string.strip()
-    elif h1_tag := soup.find("h1"):
-        title = h1_tag.get_text().strip()
-
-    # Extract body text
-    body = soup.find("body")
-    website_text = re.sub(r"\n+", "\n", body.get_text()) if body else ""
-
-    chat_completion = await _get_openai_client().chat.completions.create(
-        messages=[
-            {
-                "role": "user",
-                "content": prompt_extract_recipe_content.format(text=website_text),
-            }
-        ],
-        model=MODEL,
-        response_format={"type": "json_object"},
-    )
-    result = ExtractedRecipe.model_validate_json(
-        chat_completion.choices[0].message.content
+    _, page = await load_recipe_page(url)
+    return await extract_recipe_from_page(page)
+
+
+async def extract_recipe_from_page(page: ParsedPage) -> ExtractedRecipe:
+    """Extract recipe content from a parsed page.
+
+    Uses the page's schema.org structured data when it has some, and AI on
+    the page text otherwise.
+    """
+    if page.recipe is not None:
+        extraction_stats.structured += 1
+        return page.recipe.model_copy()
+
+    extraction_stats.llm += 1
+    content = await _complete_cached(
+        "extract",
+        ExtractedRecipe,
+        prompt_extract_recipe_content,
+        text=_prompt_text(page),
     )
-    result.title = title
+    result = ExtractedRecipe.model_validate_json(content)
+    result.title = page.title
     return result
 
 
-async def generate_dependency_graph(recipe_string: str, ingredients: str) -> str:
-    """Generate a dependency graph from recipe text using AI."""
-    chat_completion = await _get_openai_client().chat.completions.create(
-        messages=[
-            {
-                "role": "user",
-                "content": prompt_recipe_to_graph.format(
-                    recipe=recipe_string, ingredients=ingredients
-                ),
-            }
-        ],
-        model=MODEL,
-        response_format={"type": "json_object"},
+async def generate_recipe_plan(
+    page: ParsedPage, check: AnswerCheck | None = None
+) -> str:
+    """Extract the recipe and its dependency graph from page text in one call.
+
+    check, if given, must accept the parsed plan for it to be cached.
+    """
+    return await _complete_cached(
+        "plan", RecipePlan, prompt_page_to_plan, check, text=_prompt_text(page)
+    )
+
+
+async def generate_dependency_graph(
+    recipe_string: str, ingredients: str, check: AnswerCheck | None = None
+) -> str:
+    """Generate a dependency graph from recipe text using AI.
+
+    check, if given, must accept the parsed graph for it to be cached.
+    """
+    return await _complete_cached(
+        "graph",
+        RecipeGraph,
+        prompt_recipe_to_graph,
+        check,
+        recipe=recipe_string,
+        ingredients=ingredients,
     )
-    return chat_completion.choices[0].message.content
+
+
+def _prompt_text(page: ParsedPage) -> str:
+    """Page text cut down to the extraction token budget."""
+    return reduce_page_text(page.text, get_extract_token_budget())
+
+
+async def _complete_cached(
+    stage: str,
+    schema: type[BaseModel],
+    prompt: str,
+    check: AnswerCheck | None = None,
+    **inputs: str,
+) -> str:
+    """Answer prompt formatted with inputs, reusing any answer to the same call.
+
+    Answers that do not match schema, or that check rejects by raising,
+    raise instead of being cached.
+    """
+    key = stage_key(stage, prompt, MODEL, *(inputs[name] for name in sorted(inputs)))
+
+    async def complete() -> str:
+        if (count := _llm_call_count.get()) is not None:
+            count.calls += 1
+        chat_completion = await _get_openai_client().chat.completions.create(
+            messages=[{"role": "user", "content": prompt.format(**inputs)}],
+            model=MODEL,
+            response_format={"type": "json_object"},
+        )
+        content = chat_completion.choices[0].message.content
+        answer = schema.model_validate_json(content)
+        if check is not None:
+            check(answer)
+        return content
+
+    return await llm_results.get_or_compute(stage, key, complete)
@@ -2,10 +2,42 @@
 
 import dataclasses
 import datetime
+import hashlib
+import logging
+import time
 from collections import defaultdict
+from collections.abc import Callable
 
-from src.services.ai_service import extract_recipe, generate_dependency_graph
-from src.services.schemas import RecipeGraph, Step
+from src.config.environment import get_single_call_fraction
+from src.services.ai_service import (
+    extract_recipe_from_page,
+    generate_dependency_graph,
+    generate_recipe_plan,
+    load_recipe_page,
+)
+from src.services.page_text import ParsedPage
+from src.services.schemas import RecipeGraph, RecipePlan, Step
+from src.services.url_canonical import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# Called with a stage name and its partial results as the pipeline progresses
+StageCallback = Callable[[str, dict], None]
+
+
+@dataclasses.dataclass
+class PipelineModeStats:
+    runs: int = 0
+    # Single-call runs whose answer was unusable and redone in two calls
+    fallbacks: int = 0
+    # Time from fetched page to plan, over runs that produced one
+    seconds_total: float = 0.0
+
+
+pipeline_stats = {
+    "two_call": PipelineModeStats(),
+    "single_call": PipelineModeStats(),
+}
 
 
 @dataclasses.dataclass
@@ -115,12 +147,90 @@ def to_time(minute_offset: int) -> datetime.datetime:
     )
 
 
-async def ganntify_recipe(url: str) -> tuple[list[PlannedStep], str]:
-    """Process a recipe URL into planned steps with timing."""
-    extracted = await extract_recipe(url)
+def use_single_call(url: str) -> bool:
+    """Whether url falls in the configured share of single-call pipeline runs.
+
+    Decided by a hash of the canonical URL, so a recipe always takes the
+    same path while the share is unchanged.
+    """
+    fraction = get_single_call_fraction()
+    if fraction <= 0:
+        return False
+    digest = hashlib.blake2b(canonicalize_url(url).encode(), digest_size=8).digest()
+    return int.from_bytes(digest) / 2**64 < fraction
+
+
+async def ganntify_recipe(
+    url: str, on_stage: StageCallback | None = None
+) -> tuple[list[PlannedStep], str]:
+    """Process a recipe URL into planned steps with timing.
+
+    on_stage, if given, is notified after the page is fetched ("fetched"), the
+    recipe extracted ("extracted") and the dependency graph built ("graph").
+
+    Pages without structured data in the single-call share (see
+    use_single_call) get the recipe and its graph from one LLM call. If that
+    answer is unusable, they fall back to the two-call path.
+    """
+
+    def notify(stage: str, data: dict) -> None:
+        if on_stage is not None:
+            on_stage(stage, data)
+
+    html_content, page = await load_recipe_page(url)
+    notify("fetched", {"size_bytes": len(html_content)})
+
+    if page.recipe is None and use_single_call(url):
+        planned = await _plan_in_one_call(page, notify)
+        if planned is not None:
+            return planned
+    return await _plan_in_two_calls(page, notify)
+
+
+async def _plan_in_one_call(
+    page: ParsedPage, notify: StageCallback
+) -> tuple[list[PlannedStep], str] | None:
+    stats = pipeline_stats["single_call"]
+    stats.runs += 1
+    start = time.perf_counter()
+    try:
+        # Checked before caching, so an unusable plan is not served again
+        recipe_plan = RecipePlan.model_validate_json(
+            await generate_recipe_plan(page, check=plan_steps)
+        )
+        planned_steps = plan_steps(recipe_plan)
+    except (ValueError, KeyError, AssertionError) as e:
+        # Invalid JSON or schema, unknown step ids or a cyclic graph
+        stats.fallbacks += 1
+        logger.warning(f"Single-call plan unusable, using two calls: {e}")
+        return None
+
+    title = recipe_plan.title or page.title
+    notify("extracted", {"title": title, "ingredients": recipe_plan.ingredients})
+    notify("graph", {"step_count": len(recipe_plan.steps)})
+    stats.seconds_total += time.perf_counter() - start
+    return planned_steps, title
+
+
+async def _plan_in_two_calls(
+    page: ParsedPage, notify: StageCallback
+) -> tuple[list[PlannedStep], str]:
+    stats = pipeline_stats["two_call"]
+    stats.runs += 1
+    start = time.perf_counter()
+
+    extracted = await extract_recipe_from_page(page)
+    notify(
+        "extracted",
+        {"title": extracted.title, "ingredients": extracted.ingredients},
+    )
+
     graph_string = await generate_dependency_graph(
-        extracted.recipe, extracted.ingredients
+        extracted.recipe, extracted.ingredients, check=plan_steps
     )
     recipe_graph = parse_recipe_graph(graph_string)
+    notify("graph", {"step_count": len(recipe_graph.steps)})
+
     planned_steps = plan_steps(recipe_graph)
+    stats.seconds_total += time.perf_counter() - start
     return planned_steps, extracted.title
@@ -0,0 +1,67 @@
+"""In-memory recipe access counts, flushed to the database in batches."""
+
+import asyncio
+import dataclasses
+import logging
+from collections import Counter
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+FlushFn = Callable[[dict[str, int]], Awaitable[None]]
+
+
+@dataclasses.dataclass
+class HitTrackerStats:
+    recorded: int = 0
+    flushed: int = 0
+    flushes: int = 0
+    failures: int = 0
+
+
+class HitTracker:
+    """Accumulate hits per key and hand them to flush in periodic batches.
+
+    Recording is a dict increment, so the request path does no I/O. Hits
+    from a failed flush are kept and retried with the next batch.
+    """
+
+    def __init__(self, flush: FlushFn) -> None:
+        self.stats = HitTrackerStats()
+        self._flush = flush
+        self._pending: Counter[str] = Counter()
+        self._lock = asyncio.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Number of keys with hits not yet flushed."""
+        return len(self._pending)
+
+    def record(self, key: str, hits: int = 1) -> None:
+        self._pending[key] += hits
+        self.stats.recorded += hits
+
+    async def flush(self) -> None:
+        """Write out every pending hit."""
+        async with self._lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, Counter()
+            try:
+                await self._flush(dict(batch))
+            except Exception:
+                self.stats.failures += 1
+                self._pending.update(batch)
+                logger.exception(f"Failed to flush hits for {len(batch)} recipes")
+                return
+            self.stats.flushes += 1
+            self.stats.flushed += batch.total()
+
+    async def run(self, interval: float) -> None:
+        """Flush every interval seconds until cancelled, then flush once more."""
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                await self.flush()
+        finally:
+            await self.flush()
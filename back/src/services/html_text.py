@@ -0,0 +1,410 @@
+"""Engines turning recipe page HTML into its title, body text and JSON-LD.
+
+Every engine follows the BeautifulSoup html.parser engine, the reference:
+the text of <body> without page chrome (NOISE_TAGS and sections named by
+NOISE_SECTION), with a line ending at each block and <br>, and blank lines
+collapsed. The others trade small differences on malformed HTML for speed
+(see benchmarks.bench_html_text).
+"""
+
+import dataclasses
+import re
+import warnings
+from collections.abc import Iterable
+from html.parser import HTMLParser
+from typing import Protocol
+
+import lxml.html
+from bs4 import BeautifulSoup, Tag, XMLParsedAsHTMLWarning
+from bs4.dammit import UnicodeDammit
+from lxml import etree
+
+# Page chrome that never holds the recipe
+NOISE_TAGS = frozenset(
+    {
+        "script",
+        "style",
+        "noscript",
+        "template",
+        "svg",
+        "iframe",
+        "nav",
+        "footer",
+        "aside",
+    }
+)
+# Words of the ids and classes of comment threads, banners and link lists
+NOISE_SECTION = re.compile(
+    r"^(comments?|commentaires?|disqus|respond|cookies?|consent|gdpr|newsletter|"
+    r"related|share|social|breadcrumbs?)$",
+    re.IGNORECASE,
+)
+# Elements ending a line of text, so minified pages still have lines
+BLOCK_TAGS = frozenset(
+    {
+        "address",
+        "article",
+        "blockquote",
+        "dd",
+        "div",
+        "dt",
+        "figcaption",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "header",
+        "li",
+        "main",
+        "ol",
+        "p",
+        "pre",
+        "section",
+        "table",
+        "td",
+        "th",
+        "tr",
+        "ul",
+    }
+)
+JSON_LD_TYPE = "application/ld+json"
+# Elements without an end tag, other than <br>
+VOID_TAGS = frozenset(
+    {
+        "area",
+        "base",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "source",
+        "track",
+        "wbr",
+    }
+)
+# lxml refuses text that still declares its encoding
+XML_DECLARATION = re.compile(r"^\s*<\?xml[^>]*>")
+
+# XHTML pages are parsed as HTML on purpose
+warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
+
+
+@dataclasses.dataclass(frozen=True)
+class PageContent:
+    title: str
+    text: str
+    # Contents of the application/ld+json scripts, in page order
+    json_ld: tuple[str, ...] = ()
+
+
+class HtmlTextEngine(Protocol):
+    name: str
+
+    def extract(self, html_content: bytes) -> PageContent:
+        pass
+
+
+def has_noise_name(tag_id: str, classes: Iterable[str]) -> bool:
+    """Whether an id or class names a comment thread, banner or link list."""
+    return any(
+        NOISE_SECTION.match(word)
+        for name in (tag_id, *classes)
+        for word in re.split(r"[-_]", name)
+    )
+
+
+def collapse_lines(text: str) -> str:
+    return re.sub(r"\n+", "\n", text).strip()
+
+
+def decode_html(html_content: bytes) -> str:
+    """Decode a page the way BeautifulSoup does, from its declared charset."""
+    return UnicodeDammit(html_content, is_html=True).unicode_markup or ""
+
+
+class SoupEngine:
+    """BeautifulSoup with the given parser; with html.parser, the reference."""
+
+    def __init__(self, name: str, features: str) -> None:
+        self.name = name
+        self.features = features
+
+    def extract(self, html_content: bytes) -> PageContent:
+        soup = BeautifulSoup(html_content, self.features)
+
+        title = ""
+        title_tag = soup.find("title")
+        if title_tag and title_tag.string:
+            title = title_tag.string.strip()
+        elif h1_tag := soup.find("h1"):
+            title = h1_tag.get_text().strip()
+
+        json_ld = tuple(
+            script.get_text() for script in soup.find_all("script", type=JSON_LD_TYPE)
+        )
+        body = soup.find("body")
+        text = self._body_text(body) if isinstance(body, Tag) else ""
+        return PageContent(title=title, text=text, json_ld=json_ld)
+
+    def _body_text(self, body: Tag) -> str:
+        for tag in body.find_all(self._is_noise):
+            if not tag.decomposed:
+                tag.decompose()
+        for tag in body.find_all("br"):
+            tag.replace_with("\n")
+        for tag in body.find_all(BLOCK_TAGS):
+            tag.append("\n")
+        return collapse_lines(body.get_text())
+
+    @staticmethod
+    def _is_noise(tag: Tag) -> bool:
+        if tag.name in NOISE_TAGS:
+            return True
+        return (
+            has_noise_name(tag.get("id") or "", tag.get("class", []))
+            # Not a wrapper of the whole page, such as <div class="has-comments">
+            and tag.name != "main"
+            and tag.find("h1") is None
+        )
+
+
+class LxmlEngine:
+    """lxml's HTML parser, walking its tree without BeautifulSoup objects.
+
+    Closes unclosed table cells and paragraphs where browsers do, so such
+    pages get more lines than with the reference. Pages nested deeper than
+    libxml2's limit (a few thousand elements) come out empty.
+    """
+
+    name = "lxml"
+    # Without huge_tree, libxml2 drops everything nested over 256 deep
+    parser = lxml.html.HTMLParser(huge_tree=True)
+
+    def extract(self, html_content: bytes) -> PageContent:
+        try:
+            markup = XML_DECLARATION.sub("", decode_html(html_content))
+            root = lxml.html.document_fromstring(markup, parser=self.parser)
+        except (etree.ParserError, ValueError):
+            # Empty or whitespace-only document
+            return PageContent(title="", text="")
+
+        title = ""
+        title_tag = root.find(".//title")
+        if title_tag is not None and title_tag.text:
+            title = title_tag.text.strip()
+        elif (h1_tag := root.find(".//h1")) is not None:
+            title = h1_tag.text_content().strip()
+
+        json_ld = tuple(
+            script.text or ""
+            for script in root.iter("script")
+            if script.get("type") == JSON_LD_TYPE
+        )
+        body = root.find("body")
+        text = collapse_lines(self._body_text(body)) if body is not None else ""
+        return PageContent(title=title, text=text, json_ld=json_ld)
+
+    def _body_text(self, body) -> str:
+        parts: list[str] = [body.text or ""]
+        skipped = set()
+        # Iterative, as pages can nest deeper than the recursion limit
+        walker = etree.iterwalk(body, events=("start", "end", "comment", "pi"))
+        for event, element in walker:
+            if element is body:
+                continue
+            if event == "start":
+                if self._is_noise(element):
+                    skipped.add(element)
+                    walker.skip_subtree()
+                elif element.tag == "br":
+                    parts.append("\n")
+                else:
+                    parts.append(element.text or "")
+                continue
+            if event == "end" and element not in skipped and element.tag in BLOCK_TAGS:
+                parts.append("\n")
+            # Comments and processing instructions only contribute their tail
+            parts.append(element.tail or "")
+        return "".join(parts)
+
+    @staticmethod
+    def _is_noise(element) -> bool:
+        if element.tag in NOISE_TAGS:
+            return True
+        return (
+            has_noise_name(
+                element.get("id") or "", (element.get("class") or "").split()
+            )
+            and element.tag != "main"
+            and element.find(".//h1") is None
+        )
+
+
+class _NoiseSection:
+    """A section named like page chrome, held back until it is closed.
+
+    It is kept after all if it holds an <h1>, as page wrappers do.
+    """
+
+    def __init__(self, depth: int) -> None:
+        # Number of open elements, itself included
+        self.depth = depth
+        self.parts: list[str] = []
+        self.has_h1 = False
+
+
+class _StreamingParser(HTMLParser):
+    """Collect what SoupEngine would from one pass over the tokens.
+
+    Only the names of the open elements are kept. Like BeautifulSoup, an end
+    tag closes every element opened inside it, and a stray one is ignored.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.title: str | None = None
+        self.h1: str | None = None
+        self.json_ld: list[str] = []
+        self.parts: list[str] = []
+        self._in_body = False
+        self._title_parts: list[str] | None = None
+        self._h1_parts: list[str] | None = None
+        self._json_ld_parts: list[str] | None = None
+        # Open elements of the body
+        self._open: list[str] = []
+        # Number of open elements when a noise tag was opened
+        self._skip_depth: int | None = None
+        self._sections: list[_NoiseSection] = []
+
+    def _out(self) -> list[str]:
+        return self._sections[-1].parts if self._sections else self.parts
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        attributes = dict(attrs)
+        if tag == "script" and attributes.get("type") == JSON_LD_TYPE:
+            self._json_ld_parts = []
+        if tag == "title" and self.title is None:
+            self._title_parts = []
+        elif tag == "h1":
+            if self.h1 is None:
+                self._h1_parts = []
+            for section in self._sections:
+                section.has_h1 = True
+        elif tag == "body":
+            self._in_body = True
+            return
+        if not self._in_body or tag in VOID_TAGS:
+            return
+        if tag == "br":
+            if self._skip_depth is None:
+                self._out().append("\n")
+            return
+
+        self._open.append(tag)
+        if self._skip_depth is not None:
+            return
+        if tag in NOISE_TAGS:
+            self._skip_depth = len(self._open)
+        elif tag != "main" and has_noise_name(
+            attributes.get("id") or "", (attributes.get("class") or "").split()
+        ):
+            self._sections.append(_NoiseSection(len(self._open)))
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "script" and self._json_ld_parts is not None:
+            self.json_ld.append("".join(self._json_ld_parts))
+            self._json_ld_parts = None
+        if tag == "title" and self._title_parts is not None:
+            self.title = "".join(self._title_parts)
+            self._title_parts = None
+        elif tag == "h1" and self._h1_parts is not None:
+            self.h1 = "".join(self._h1_parts)
+            self._h1_parts = None
+        elif tag == "body":
+            self._close_to(0)
+            self._in_body = False
+            return
+        if self._in_body and tag in self._open:
+            # Index of the innermost open element of that name
+            self._close_to(len(self._open) - 1 - self._open[::-1].index(tag))
+
+    def _close_to(self, depth: int) -> None:
+        """Close open elements until only depth of them remain."""
+        while len(self._open) > depth:
+            tag = self._open.pop()
+            if self._skip_depth is not None:
+                if len(self._open) < self._skip_depth:
+                    self._skip_depth = None
+                continue
+            if tag in BLOCK_TAGS:
+                self._out().append("\n")
+            if self._sections and len(self._open) < self._sections[-1].depth:
+                section = self._sections.pop()
+                if section.has_h1:
+                    self._out().extend(section.parts)
+
+    def handle_data(self, data: str) -> None:
+        if self._json_ld_parts is not None:
+            self._json_ld_parts.append(data)
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+        if self._h1_parts is not None:
+            self._h1_parts.append(data)
+        if self._skip_depth is not None:
+            return
+        if self._in_body:
+            self._out().append(data)
+
+    def close(self) -> None:
+        super().close()
+        # Elements still open end with the page
+        self._close_to(0)
+
+
+class StreamingEngine:
+    """One pass of the standard library tokenizer, never building a tree."""
+
+    name = "streaming"
+
+    def extract(self, html_content: bytes) -> PageContent:
+        parser = _StreamingParser()
+        parser.feed(decode_html(html_content))
+        parser.close()
+
+        title = ""
+        if parser.title:
+            title = parser.title.strip()
+        elif parser.h1 is not None:
+            title = parser.h1.strip()
+        return PageContent(
+            title=title,
+            text=collapse_lines("".join(parser.parts)),
+            json_ld=tuple(parser.json_ld),
+        )
+
+
+ENGINES: dict[str, HtmlTextEngine] = {
+    engine.name: engine
+    for engine in (
+        SoupEngine("bs4", "html.parser"),
+        SoupEngine("bs4-lxml", "lxml"),
+        LxmlEngine(),
+        StreamingEngine(),
+    )
+}
+REFERENCE_ENGINE = "bs4"
+
+
+def get_html_text_engine(name: str) -> HtmlTextEngine:
+    """Engine registered under name."""
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown HTML text engine {name!r}, expected one of {sorted(ENGINES)}"
+        ) from None
@@ -0,0 +1,83 @@
+"""Application-wide HTTP client for outbound page fetches."""
+
+import asyncio
+import dataclasses
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+from httpx import AsyncClient, Limits, Timeout
+
+from src.config.environment import (
+    get_http_keepalive_expiry,
+    get_http_max_connections,
+    get_http_max_connections_per_host,
+    get_http_max_keepalive_connections,
+)
+
+DEFAULT_TIMEOUT = Timeout(connect=5.0, read=20.0, write=10.0, pool=5.0)
+ACCEPT_ENCODING = "gzip, deflate, br"
+
+_client: AsyncClient | None = None
+
+
+@dataclasses.dataclass
+class _HostSlot:
+    semaphore: asyncio.Semaphore
+    users: int = 0
+
+
+_host_slots: dict[str, _HostSlot] = {}
+
+
+def create_http_client() -> AsyncClient:
+    """Build a pooled HTTP/2 client.
+
+    Redirects are not followed so callers can validate every hop against SSRF.
+    """
+    return AsyncClient(
+        http2=True,
+        timeout=DEFAULT_TIMEOUT,
+        follow_redirects=False,
+        headers={"Accept-Encoding": ACCEPT_ENCODING},
+        limits=Limits(
+            max_connections=get_http_max_connections(),
+            max_keepalive_connections=get_http_max_keepalive_connections(),
+            keepalive_expiry=get_http_keepalive_expiry(),
+        ),
+    )
+
+
+def get_http_client() -> AsyncClient:
+    """Return the shared client, creating it if the app lifespan did not."""
+    global _client
+    if _client is None:
+        _client = create_http_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+@asynccontextmanager
+async def host_slot(url: str) -> AsyncIterator[None]:
+    """Cap concurrent requests to the host of url across the application."""
+    host = (urlparse(url).hostname or "").lower()
+    slot = _host_slots.get(host)
+    if slot is None:
+        slot = _HostSlot(asyncio.Semaphore(get_http_max_connections_per_host()))
+        _host_slots[host] = slot
+
+    slot.users += 1
+    try:
+        async with slot.semaphore:
+            yield
+    finally:
+        slot.users -= 1
+        if slot.users == 0:
+            del _host_slots[host]
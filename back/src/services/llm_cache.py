@@ -0,0 +1,94 @@
+"""Content-addressed cache of LLM answers, per pipeline stage."""
+
+import dataclasses
+import hashlib
+import json
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+
+from src.services.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Persistent tier: load(key) and save(key, stage, result)
+LoadResult = Callable[[str], Awaitable[str | None]]
+SaveResult = Callable[[str, str, str], Awaitable[None]]
+
+
+@dataclasses.dataclass
+class StageCacheStats:
+    memory_hits: int = 0
+    store_hits: int = 0
+    misses: int = 0
+    store_errors: int = 0
+
+
+def stage_key(stage: str, prompt: str, model: str, *inputs: str) -> str:
+    """Hash of everything that determines a stage's answer.
+
+    The prompt template is part of the key, so editing one stage's prompt
+    only invalidates that stage's results.
+    """
+    payload = json.dumps([stage, prompt, model, *inputs], ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LlmResultCache:
+    """LLM answers by stage_key, in memory and optionally in a persistent store.
+
+    Answers never go stale, since the key covers all their inputs: the
+    memory TTL only bounds how long they take up room. A memory tier of
+    maxsize 0 is disabled. Store errors are logged and treated as misses.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.memory: TTLCache[str, str] = TTLCache(
+            maxsize=maxsize, ttl=ttl, clock=clock
+        )
+        self.stats: dict[str, StageCacheStats] = defaultdict(StageCacheStats)
+        self._load: LoadResult | None = None
+        self._save: SaveResult | None = None
+
+    def persist_with(self, load: LoadResult, save: SaveResult) -> None:
+        """Back the memory tier with a persistent store."""
+        self._load = load
+        self._save = save
+
+    async def get_or_compute(
+        self, stage: str, key: str, compute: Callable[[], Awaitable[str]]
+    ) -> str:
+        """Return the answer stored under key, computing and storing it if new."""
+        stats = self.stats[stage]
+        result = self.memory.get(key)
+        if result is not None:
+            stats.memory_hits += 1
+            return result
+
+        if self._load is not None:
+            try:
+                result = await self._load(key)
+            except Exception as e:
+                stats.store_errors += 1
+                logger.warning(f"Failed to read cached {stage} result: {e}")
+            if result is not None:
+                stats.store_hits += 1
+                self.memory.set(key, result)
+                return result
+
+        stats.misses += 1
+        result = await compute()
+        self.memory.set(key, result)
+        if self._save is not None:
+            try:
+                await self._save(key, stage, result)
+            except Exception as e:
+                stats.store_errors += 1
+                logger.warning(f"Failed to store {stage} result: {e}")
+        return result
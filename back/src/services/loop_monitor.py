@@ -0,0 +1,61 @@
+"""Event loop lag: how late the loop runs callbacks that are due."""
+
+import asyncio
+import dataclasses
+import time
+from collections import deque
+from collections.abc import Callable
+
+
+@dataclasses.dataclass
+class LoopLagStats:
+    samples: int = 0
+    # Samples at least slow_ms late
+    slow: int = 0
+    lag_ms_total: float = 0.0
+    lag_ms_max: float = 0.0
+
+
+class LoopLagMonitor:
+    """Sleep for interval again and again, and record how late each wake-up is.
+
+    A wake-up is late by as long as something blocked the loop, which every
+    other coroutine waited out as well. Percentiles cover the last window
+    samples.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        slow_ms: float = 50.0,
+        window: int = 600,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.interval = interval
+        self.slow_ms = slow_ms
+        self.stats = LoopLagStats()
+        self._recent: deque[float] = deque(maxlen=window)
+        self._clock = clock
+
+    def record(self, lag_ms: float) -> None:
+        self.stats.samples += 1
+        self.stats.lag_ms_total += lag_ms
+        self.stats.lag_ms_max = max(self.stats.lag_ms_max, lag_ms)
+        if lag_ms >= self.slow_ms:
+            self.stats.slow += 1
+        self._recent.append(lag_ms)
+
+    def percentile(self, q: float) -> float | None:
+        """Lag in ms that q (0 to 1) of the recent samples stay under."""
+        if not self._recent:
+            return None
+        ordered = sorted(self._recent)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+    async def run(self) -> None:
+        """Sample until cancelled."""
+        while True:
+            start = self._clock()
+            await asyncio.sleep(self.interval)
+            late = self._clock() - start - self.interval
+            self.record(max(0.0, late * 1000))
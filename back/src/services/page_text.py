@@ -0,0 +1,44 @@
+"""Text extraction from fetched recipe pages."""
+
+import dataclasses
+import re
+
+from bs4 import BeautifulSoup
+
+from src.config.environment import get_html_text_engine_name
+from src.services.html_text import HtmlTextEngine, get_html_text_engine
+from src.services.schemas import ExtractedRecipe
+from src.services.structured_data import (
+    recipe_from_json_ld,
+    recipe_from_microdata,
+)
+
+# Only pages with microdata need a second, full parse
+MICRODATA_RECIPE = re.compile(rb"itemtype\s*=\s*[\"']?[^\"'>]*schema\.org/Recipe", re.I)
+
+
+@dataclasses.dataclass(frozen=True)
+class ParsedPage:
+    title: str
+    text: str
+    # Recipe read from schema.org structured data, if the page has it
+    recipe: ExtractedRecipe | None = None
+
+
+def parse_recipe_page(
+    html_content: bytes, engine: HtmlTextEngine | None = None
+) -> ParsedPage:
+    """Extract the title, the body text and any structured recipe of a page.
+
+    Uses the HTML_TEXT_ENGINE engine unless given one.
+    """
+    if engine is None:
+        engine = get_html_text_engine(get_html_text_engine_name())
+    content = engine.extract(html_content)
+
+    recipe = recipe_from_json_ld(content.json_ld)
+    if recipe is None and MICRODATA_RECIPE.search(html_content):
+        recipe = recipe_from_microdata(BeautifulSoup(html_content, "html.parser"))
+    if recipe is not None and not recipe.title:
+        recipe.title = content.title
+    return ParsedPage(title=content.title, text=content.text, recipe=recipe)
@@ -0,0 +1,83 @@
+"""Recipe page parsing in worker processes, off the event loop."""
+
+import asyncio
+import dataclasses
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from src.services.page_text import ParsedPage, parse_recipe_page
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class ParsePoolStats:
+    process: int = 0
+    # Pages parsed in a thread: no pool, or a broken one
+    thread: int = 0
+    restarts: int = 0
+
+
+parse_pool_stats = ParsePoolStats()
+
+_pool: ProcessPoolExecutor | None = None
+_workers = 0
+
+
+def start_parse_pool(workers: int) -> None:
+    """Parse pages in this many worker processes; with 0, in a thread instead."""
+    global _pool, _workers
+    _workers = workers
+    if workers > 0 and _pool is None:
+        # Forking a process that runs threads (HTTP and DB pools) is unsafe
+        _pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+
+async def warm_parse_pool() -> None:
+    """Start the worker processes before the first page comes in."""
+    if _pool is not None:
+        page = b"<html><body></body></html>"
+        await asyncio.gather(*(parse_page(page) for _ in range(_workers)))
+
+
+async def close_parse_pool() -> None:
+    """Stop the worker processes."""
+    global _pool
+    if _pool is not None:
+        pool, _pool = _pool, None
+        await asyncio.to_thread(pool.shutdown, cancel_futures=True)
+
+
+async def parse_page(html_content: bytes) -> ParsedPage:
+    """Run parse_recipe_page in the pool, or in a thread if there is none.
+
+    A pool whose worker died is replaced, and the page parsed in a thread.
+    """
+    pool = _pool
+    if pool is not None:
+        try:
+            page = await asyncio.get_running_loop().run_in_executor(
+                pool, parse_recipe_page, html_content
+            )
+        except BrokenProcessPool:
+            logger.error("Parse pool worker died, restarting the pool")
+            _restart(pool)
+        else:
+            parse_pool_stats.process += 1
+            return page
+    parse_pool_stats.thread += 1
+    return await asyncio.to_thread(parse_recipe_page, html_content)
+
+
+def _restart(broken: ProcessPoolExecutor) -> None:
+    global _pool
+    # Another parse may have restarted it already
+    if _pool is broken:
+        _pool = None
+        broken.shutdown(wait=False, cancel_futures=True)
+        parse_pool_stats.restarts += 1
+        start_parse_pool(_workers)
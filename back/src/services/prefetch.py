@@ -0,0 +1,58 @@
+"""Recipe pages downloaded ahead of a likely click on a search result."""
+
+import dataclasses
+
+from src.config.environment import (
+    get_prefetch_max_bytes,
+    get_prefetch_parse,
+    get_prefetch_ttl,
+)
+from src.services.page_text import ParsedPage
+from src.services.parse_pool import parse_page
+from src.services.ttl_cache import TTLCache
+from src.services.url_canonical import canonicalize_url
+
+
+@dataclasses.dataclass(frozen=True)
+class PrefetchedPage:
+    html: bytes
+    # Text extracted ahead of time, if enabled
+    parsed: ParsedPage | None = None
+
+
+def _page_weight(page: PrefetchedPage) -> int:
+    weight = len(page.html)
+    if page.parsed is not None:
+        # Text takes at least a byte per character
+        weight += len(page.parsed.title) + len(page.parsed.text)
+    return weight
+
+
+# Keyed by the canonical URL of the search result, not of the final redirect
+prefetched_pages: TTLCache[str, PrefetchedPage] = TTLCache(
+    maxsize=get_prefetch_max_bytes(), ttl=get_prefetch_ttl(), weigh=_page_weight
+)
+
+
+async def store_prefetched_page(url: str, html_content: bytes) -> None:
+    """Keep a downloaded page, extracting its text first if enabled."""
+    parsed = None
+    if get_prefetch_parse():
+        parsed = await parse_page(html_content)
+    prefetched_pages.set(canonicalize_url(url), PrefetchedPage(html_content, parsed))
+
+
+def take_prefetched_page(url: str) -> PrefetchedPage | None:
+    """Return and forget the prefetched page for url, if any.
+
+    A page is only needed once: after that its plan is cached.
+    """
+    key = canonicalize_url(url)
+    page = prefetched_pages.get(key)
+    if page is not None:
+        prefetched_pages.invalidate(key)
+    return page
+
+
+def is_prefetched(url: str) -> bool:
+    return canonicalize_url(url) in prefetched_pages
@@ -24,3 +24,10 @@ class ExtractedRecipe(BaseModel):
     recipe: str
     ingredients: str
     title: str = ""
+
+
+class RecipePlan(RecipeGraph):
+    """Recipe and dependency graph produced by a single LLM call."""
+
+    title: str = ""
+    ingredients: str = ""
@@ -1,13 +1,33 @@
 """Web scraping utilities for fetching recipe content."""
 
-import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from urllib.parse import urlparse
+import asyncio
+import codecs
+import logging
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse
 
 import requests
-from bs4 import BeautifulSoup
+from httpx import Response, Timeout
 
-from src.services.url_safety import validate_public_url
+from src.config.environment import (
+    get_access_check_max_bytes,
+    get_access_check_max_concurrency,
+    get_html_text_engine_name,
+    get_prefetch_max_page_bytes,
+    get_url_verdict_max_entries,
+    get_url_verdict_negative_ttl,
+    get_url_verdict_persist,
+    get_url_verdict_positive_ttl,
+)
+from src.services.html_text import get_html_text_engine
+from src.services.http_client import get_http_client, host_slot
+from src.services.prefetch import store_prefetched_page
+from src.services.url_safety import validate_public_url, validate_public_url_async
+from src.services.verdict_cache import VerdictCache
+
+logger = logging.getLogger(__name__)
 
 # Domains that require payment or login to access recipes
 BLACKLISTED_DOMAINS = {
@@ -19,12 +39,69 @@ BLACKLISTED_DOMAINS = {
 }
 
 REQUEST_TIMEOUT_SECONDS = (5, 10)
+CHECK_TIMEOUT = Timeout(connect=5.0, read=10.0, write=10.0, pool=5.0)
+MAX_REDIRECTS = 5
+# Pages with less body text than this are not worth scraping
+MIN_TEXT_CHARS = 200
+# JavaScript walls are short pages: past this much body text, stop reading
+ENOUGH_TEXT_CHARS = 2000
 USER_AGENT = (
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
     "AppleWebKit/537.36 (KHTML, like Gecko) "
     "Chrome/120.0.0.0 Safari/537.36"
 )
 
+# Outcomes of can_fetch_content, shared by every search
+url_verdicts = VerdictCache(
+    positive_ttl=get_url_verdict_positive_ttl(),
+    negative_ttl=get_url_verdict_negative_ttl(),
+    maxsize=get_url_verdict_max_entries(),
+    persist=get_url_verdict_persist(),
+)
+
+# Caps checks in flight across all searches; one per event loop
+_check_slots: tuple[asyncio.AbstractEventLoop, asyncio.Semaphore] | None = None
+
+# Pages still downloading for the prefetch cache after their check returned
+prefetch_downloads: set[asyncio.Task[None]] = set()
+
+
+class _BodyTextProbe(HTMLParser):
+    """Collect the visible text of <body> from HTML fed in chunks."""
+
+    SKIPPED_TAGS = frozenset({"script", "style", "template"})
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.has_body = False
+        self._skip_depth = 0
+        self._parts: list[str] = []
+        self._length = 0
+
+    def handle_starttag(self, tag: str, _attrs) -> None:
+        if tag == "body":
+            self.has_body = True
+        elif tag in self.SKIPPED_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self.SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data: str) -> None:
+        if self.has_body and not self._skip_depth:
+            self._parts.append(data)
+            self._length += len(data)
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def has_enough_text(self) -> bool:
+        return self._length >= ENOUGH_TEXT_CHARS and (
+            len(self.text.strip()) >= ENOUGH_TEXT_CHARS
+        )
+
 
 def is_blacklisted_domain(url: str) -> bool:
     """Check if URL belongs to a blacklisted domain."""
@@ -44,51 +121,136 @@ def get_website_text(url: str) -> str:
     headers = {"User-Agent": USER_AGENT}
     response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT_SECONDS)
     response.raise_for_status()
-    html_content = response.content
-    soup = BeautifulSoup(html_content, "html.parser")
-    element = soup.find("body")
-    if element is None:
-        return ""
-    text = element.get_text()
-    return re.sub(r"\n+", "\n", text)
+    engine = get_html_text_engine(get_html_text_engine_name())
+    return engine.extract(response.content).text
+
+
+async def can_fetch_content(url: str, prefetch: bool = False) -> bool:
+    """Check if a URL can be scraped (returns real content, not JS blocker).
 
+    Streams the page and stops reading once it has seen enough body text or
+    the byte cap, so large pages cost only their first few kilobytes.
+    Validates every redirect hop against SSRF.
 
-def can_fetch_content(url: str) -> bool:
-    """Check if a URL can be scraped (returns real content, not JS blocker)."""
+    With prefetch, a scrapable page is also read to the end in the
+    background (see prefetch_downloads) and kept in the prefetch cache,
+    unless it is larger than the prefetch page cap. The verdict does not
+    wait for it.
+    """
     try:
-        validate_public_url(url)
+        await validate_public_url_async(url)
         headers = {"User-Agent": USER_AGENT}
-        response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT_SECONDS)
-        if response.status_code != 200:
-            return False
+        client = get_http_client()
+        current_url = url
+        for _ in range(MAX_REDIRECTS + 1):
+            async with AsyncExitStack() as stack:
+                await stack.enter_async_context(host_slot(current_url))
+                response = await stack.enter_async_context(
+                    client.stream(
+                        "GET", current_url, headers=headers, timeout=CHECK_TIMEOUT
+                    )
+                )
+                if not response.is_redirect:
+                    if response.status_code != 200:
+                        return False
+                    body, chunks = await _read_start(response)
+                    if body is None:
+                        return False
+                    if prefetch:
+                        # The download takes over the stream and its host slot
+                        _start_prefetch_download(url, body, chunks, stack.pop_all())
+                    return True
+                location = response.headers.get("location")
+            if not location:
+                return False
+            current_url = urljoin(current_url, location)
+            await validate_public_url_async(current_url)
+        return False
+    except Exception:
+        return False
 
-        soup = BeautifulSoup(response.content, "html.parser")
-        body = soup.find("body")
-        if not body:
-            return False
 
-        text = body.get_text()
-        if len(text.strip()) < 200:
-            return False
+async def _read_start(
+    response: Response,
+) -> tuple[bytearray | None, AsyncIterator[bytes]]:
+    """Read a page until it proves scrapable or not.
 
-        return "enable javascript" not in text.lower()
-    except Exception:
+    Returns the bytes read, or None if the page is not scrapable, and the
+    rest of the stream.
+    """
+    max_bytes = get_access_check_max_bytes()
+    probe = _BodyTextProbe()
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")("replace")
+    chunks = response.aiter_bytes()
+    body = bytearray()
+    async for chunk in chunks:
+        body += chunk
+        probe.feed(decoder.decode(chunk))
+        if probe.has_enough_text() or response.num_bytes_downloaded >= max_bytes:
+            break
+
+    return (body if _is_scrapable(probe) else None), chunks
+
+
+def _start_prefetch_download(
+    url: str, body: bytearray, chunks: AsyncIterator[bytes], stream: AsyncExitStack
+) -> None:
+    task = asyncio.ensure_future(_finish_prefetch_download(url, body, chunks, stream))
+    prefetch_downloads.add(task)
+    task.add_done_callback(prefetch_downloads.discard)
+
+
+async def _finish_prefetch_download(
+    url: str, body: bytearray, chunks: AsyncIterator[bytes], stream: AsyncExitStack
+) -> None:
+    """Read the rest of a checked page and keep it in the prefetch cache."""
+    max_page_bytes = get_prefetch_max_page_bytes()
+    try:
+        async with stream:
+            # Continues the same stream where the check stopped reading
+            async for chunk in chunks:
+                if len(body) > max_page_bytes:
+                    break
+                body += chunk
+        if len(body) <= max_page_bytes:
+            await store_prefetched_page(url, bytes(body))
+    except Exception as e:
+        logger.info(f"Failed to prefetch {url}: {e}")
+
+
+def _is_scrapable(probe: _BodyTextProbe) -> bool:
+    text = probe.text
+    if not probe.has_body or len(text.strip()) < MIN_TEXT_CHARS:
         return False
+    return "enable javascript" not in text.lower()
+
+
+def _get_check_slots() -> asyncio.Semaphore:
+    global _check_slots
+    loop = asyncio.get_running_loop()
+    if _check_slots is None or _check_slots[0] is not loop:
+        _check_slots = (loop, asyncio.Semaphore(get_access_check_max_concurrency()))
+    return _check_slots[1]
+
+
+async def check_url_accessible(url: str, prefetch: bool = False) -> bool:
+    """Run can_fetch_content within the global limit and cache the verdict."""
+    async with _get_check_slots():
+        accessible = await can_fetch_content(url, prefetch)
+    url_verdicts.set(url, accessible)
+    return accessible
+
 
+async def filter_accessible_urls(results: list[dict]) -> list[dict]:
+    """Filter search results to only include accessible URLs.
 
-def filter_accessible_urls(results: list[dict], max_workers: int = 4) -> list[dict]:
-    """Filter search results to only include accessible URLs."""
-    accessible_with_index: list[tuple[int, dict]] = []
+    Only URLs without a cached verdict are fetched, concurrently up to the
+    configured global and per-host limits.
+    """
+    verdicts = {r["url"]: url_verdicts.get(r["url"]) for r in results}
+    unchecked = [url for url, verdict in verdicts.items() if verdict is None]
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_result = {
-            executor.submit(can_fetch_content, r["url"]): (i, r)
-            for i, r in enumerate(results)
-        }
-        for future in as_completed(future_to_result):
-            index, result = future_to_result[future]
-            if future.result():
-                accessible_with_index.append((index, result))
+    checked = await asyncio.gather(*(check_url_accessible(url) for url in unchecked))
+    verdicts.update(zip(unchecked, checked, strict=True))
 
-    accessible_with_index.sort(key=lambda pair: pair[0])
-    return [result for _, result in accessible_with_index]
+    return [r for r in results if verdicts[r["url"]]]
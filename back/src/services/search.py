@@ -1,13 +1,36 @@
-"""Recipe search functionality using DuckDuckGo."""
+"""Recipe search over web search backends (DuckDuckGo by default)."""
 
+import asyncio
+import dataclasses
+from collections.abc import AsyncIterator, Awaitable, Callable
+from functools import partial
 from typing import Literal
 
-from ddgs import DDGS
-
-from src.services.scraping import filter_accessible_urls, is_blacklisted_domain
+from src.config.environment import (
+    get_prefetch_top_n,
+    get_search_backends,
+    get_search_hedge_delay,
+    get_search_merge_grace,
+    get_search_provider_max_threads,
+    get_search_provider_timeout,
+    get_search_session_max_entries,
+    get_search_session_ttl,
+)
+from src.services.prefetch import is_prefetched
+from src.services.scraping import (
+    check_url_accessible,
+    is_blacklisted_domain,
+    url_verdicts,
+)
+from src.services.search_providers import DDGSProvider, FederatedSearch
+from src.services.ttl_cache import TTLCache
+from src.services.url_canonical import canonicalize_url
 
 PAGE_SIZE = 10
+MAX_FETCH = 50  # Safety limit to avoid infinite fetching
 SearchLocale = Literal["en", "fr"]
+# Returns which of the given canonical URLs already have a stored plan
+PlannedLookup = Callable[[list[str]], Awaitable[set[str]]]
 
 SEARCH_CONFIG: dict[SearchLocale, dict[str, str]] = {
     "en": {"region": "us-en", "recipe_term": "recipe"},
@@ -15,56 +38,227 @@ SEARCH_CONFIG: dict[SearchLocale, dict[str, str]] = {
 }
 
 
-def search_recipes(query: str, locale: SearchLocale, page: int = 0) -> dict:
-    """Search for recipes using DuckDuckGo with pagination.
+@dataclasses.dataclass
+class SearchSession:
+    """Search candidates for one search, with their accessibility verdicts.
 
-    Filters out blacklisted domains and inaccessible URLs.
-    Continues fetching more results if filtering reduces count below PAGE_SIZE.
+    Shared by every page of the search, so each candidate is fetched and
+    checked at most once. Checks in flight are kept in checks, where
+    concurrent identical searches and later pages pick them up. The lock
+    makes concurrent identical searches wait for one web search.
+    """
 
-    Returns a dict with 'results' (list of recipes) and 'has_more' (boolean).
+    candidates: list[dict] | None = None
+    verdicts: dict[str, bool] = dataclasses.field(default_factory=dict)
+    checks: dict[str, asyncio.Task[bool]] = dataclasses.field(default_factory=dict)
+    lock: asyncio.Lock = dataclasses.field(default_factory=asyncio.Lock)
+
+
+search_provider = FederatedSearch(
+    [
+        DDGSProvider(
+            backend,
+            timeout=get_search_provider_timeout(),
+            max_threads=get_search_provider_max_threads(),
+        )
+        for backend in get_search_backends()
+    ],
+    timeout=get_search_provider_timeout(),
+    hedge_delay=get_search_hedge_delay(),
+    merge_grace=get_search_merge_grace(),
+)
+
+search_sessions: TTLCache[tuple[str, SearchLocale], SearchSession] = TTLCache(
+    maxsize=get_search_session_max_entries(), ttl=get_search_session_ttl()
+)
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _get_session(query: str, locale: SearchLocale) -> SearchSession:
+    key = (_normalize_query(query), locale)
+    session = search_sessions.get(key)
+    if session is None:
+        session = SearchSession()
+        search_sessions.set(key, session)
+    return session
+
+
+def _record_verdict(session: SearchSession, url: str, task: asyncio.Task) -> None:
+    session.checks.pop(url, None)
+    if not task.cancelled() and task.exception() is None:
+        session.verdicts[url] = task.result()
+
+
+def _start_checks(
+    session: SearchSession, candidates: list[dict], prefetch_urls: set[str]
+) -> None:
+    """Start accessibility checks for candidates without a verdict.
+
+    Candidates in prefetch_urls are checked with prefetch, even when their
+    verdict is cached, unless their page is already prefetched.
     """
-    target_count = (page + 1) * PAGE_SIZE  # Total results needed through current page
-    max_fetch = 50  # Safety limit to avoid infinite fetching
+    for result in candidates:
+        url = result["url"]
+        if url in session.verdicts or url in session.checks:
+            continue
+        prefetch = url in prefetch_urls
+        cached = url_verdicts.get(url)
+        if cached is not None:
+            session.verdicts[url] = cached
+            if not (cached and prefetch and not is_prefetched(url)):
+                continue
+        task = asyncio.ensure_future(check_url_accessible(url, prefetch))
+        task.add_done_callback(partial(_record_verdict, session, url))
+        session.checks[url] = task
+
+
+async def _is_accessible(session: SearchSession, url: str) -> bool:
+    if url in session.verdicts:
+        return session.verdicts[url]
+    # A request giving up must not cancel a check other searches rely on
+    return await asyncio.shield(session.checks[url])
+
+
+async def _fetch_candidates(query: str, locale: SearchLocale) -> list[dict]:
+    """Run the web search, dropping duplicates and blacklisted domains."""
     search_config = SEARCH_CONFIG[locale]
+    candidates = []
+    seen_urls = set()
 
-    with DDGS() as ddgs:
-        all_results = []
-        seen_urls = set()
+    for result in await search_provider.search(
+        f"{query} {search_config['recipe_term']}",
+        region=search_config["region"],
+        max_results=MAX_FETCH,
+    ):
+        url = result["href"]
 
-        for result in ddgs.text(
-            f"{query} {search_config['recipe_term']}",
-            region=search_config["region"],
-            max_results=max_fetch,
-        ):
-            url = result["href"]
+        # Skip results that are not web pages
+        try:
+            canonicalize_url(url)
+        except ValueError:
+            continue
 
-            # Skip duplicates
-            if url in seen_urls:
-                continue
-            seen_urls.add(url)
+        # Skip duplicates
+        if url in seen_urls:
+            continue
+        seen_urls.add(url)
 
-            # Skip blacklisted domains
-            if is_blacklisted_domain(url):
-                continue
+        # Skip blacklisted domains
+        if is_blacklisted_domain(url):
+            continue
+
+        candidates.append(
+            {"title": result["title"], "url": url, "snippet": result["body"]}
+        )
+
+    return candidates
+
+
+async def stream_search_recipes(
+    query: str,
+    locale: SearchLocale,
+    page: int = 0,
+    find_planned: PlannedLookup | None = None,
+) -> AsyncIterator[dict]:
+    """Search for recipes, returning the page as an iterator of records.
 
-            all_results.append(
-                {"title": result["title"], "url": url, "snippet": result["body"]}
+    Filters out blacklisted domains and inaccessible URLs, considering one
+    page more of candidates than needed to make up for filtered ones. The
+    query and the verdicts are cached per (query, locale) session, so later
+    pages only check candidates that earlier pages did not reach.
+
+    The web search runs before this returns, so its errors surface
+    here. All checks of the window then start at once, and the iterator
+    yields each result of the page as soon as it and every candidate ranked
+    above it are verified, followed by a final {"has_more": bool} record.
+    Checks further down keep running for later pages, and has_more assumes
+    they will succeed.
+
+    Each result carries already_planned, telling whether its canonical URL
+    is among those find_planned returns. find_planned is called once per
+    page, with every candidate the page can draw from, while the checks run.
+    """
+    session = _get_session(query, locale)
+
+    async with session.lock:
+        if session.candidates is None:
+            session.candidates = await _fetch_candidates(
+                _normalize_query(query), locale
             )
 
-            # Stop early if we have enough candidates to potentially fill the page
-            # (we still need to filter for accessibility)
-            if len(all_results) >= target_count + PAGE_SIZE:
-                break
+    # Candidates that can fill the pages through this one
+    window = session.candidates[: (page + 2) * PAGE_SIZE]
+    # Likely clicks, assuming the candidates at the top of the page pass
+    first = page * PAGE_SIZE
+    prefetch_urls = {r["url"] for r in window[first : first + get_prefetch_top_n()]}
+    _start_checks(session, window, prefetch_urls)
 
-    # Filter for accessible URLs
-    accessible_results = filter_accessible_urls(all_results)
+    planned = None
+    if find_planned is not None:
+        # Results of the page can only come from this far down the window
+        urls = list({canonicalize_url(r["url"]) for r in window[first:]})
+        planned = asyncio.ensure_future(find_planned(urls))
+    return _iter_page(session, window, page, planned)
 
+
+async def _iter_page(
+    session: SearchSession,
+    window: list[dict],
+    page: int,
+    planned: asyncio.Future[set[str]] | None,
+) -> AsyncIterator[dict]:
     # Paginate
     start_idx = page * PAGE_SIZE
     end_idx = start_idx + PAGE_SIZE
-    page_results = accessible_results[start_idx:end_idx]
 
-    # Check if there are more results beyond current page
-    has_more = len(accessible_results) > end_idx
+    accessible_count = 0
+    has_more = False
+    try:
+        for position, result in enumerate(window):
+            if not await _is_accessible(session, result["url"]):
+                continue
+            accessible_count += 1
+            if accessible_count > start_idx:
+                planned_urls = await planned if planned is not None else set()
+                yield {
+                    **result,
+                    "already_planned": canonicalize_url(result["url"]) in planned_urls,
+                }
+            if accessible_count == end_idx:
+                # Check if there are more results beyond current page
+                has_more = any(
+                    session.verdicts.get(r["url"], True) for r in window[position + 1 :]
+                )
+                break
+    finally:
+        if planned is not None:
+            planned.cancel()
+
+    yield {"has_more": has_more}
+
+
+async def search_recipes(
+    query: str,
+    locale: SearchLocale,
+    page: int = 0,
+    find_planned: PlannedLookup | None = None,
+) -> dict:
+    """Search for recipes with pagination.
+
+    Collects the records of stream_search_recipes.
+
+    Returns a dict with 'results' (list of recipes) and 'has_more' (boolean).
+    """
+    results = []
+    has_more = False
+    records = await stream_search_recipes(query, locale, page, find_planned)
+    async for record in records:
+        if "has_more" in record:
+            has_more = record["has_more"]
+        else:
+            results.append(record)
 
-    return {"results": page_results, "has_more": has_more}
+    return {"results": results, "has_more": has_more}
@@ -0,0 +1,240 @@
+"""Web search backends, queried together with hedged requests."""
+
+import asyncio
+import dataclasses
+import logging
+import math
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Protocol
+
+from ddgs import DDGS
+
+from src.services.url_canonical import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+
+class SearchProvider(Protocol):
+    """A search backend returning ddgs-style results (title, href, body)."""
+
+    name: str
+    # Queries still running after their caller stopped waiting for them
+    abandoned_threads: int
+
+    async def search(self, query: str, region: str, max_results: int) -> list[dict]:
+        pass
+
+
+class DDGSProvider:
+    """One ddgs backend, such as "duckduckgo", "brave" or "auto".
+
+    ddgs is blocking, so queries run on a thread pool of max_threads threads
+    owned by the provider. Cancelling a search, on timeout or once another
+    provider answered, only stops waiting for it: a query already running
+    keeps its thread until ddgs returns (bounded by timeout), and is counted
+    in abandoned_threads meanwhile. Queries waiting for a thread are dropped.
+    """
+
+    def __init__(
+        self, backend: str = "auto", timeout: float = 5.0, max_threads: int = 4
+    ) -> None:
+        self.name = f"ddgs:{backend}"
+        self.backend = backend
+        self.timeout = timeout
+        self.abandoned_threads = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_threads, thread_name_prefix=f"ddgs-{backend}"
+        )
+        self._lock = threading.Lock()
+
+    async def search(self, query: str, region: str, max_results: int) -> list[dict]:
+        future = self._executor.submit(self._search, query, region, max_results)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            if not future.cancel():
+                with self._lock:
+                    self.abandoned_threads += 1
+                future.add_done_callback(lambda _: self._release())
+            raise
+
+    def _release(self) -> None:
+        with self._lock:
+            self.abandoned_threads -= 1
+
+    def _search(self, query: str, region: str, max_results: int) -> list[dict]:
+        with DDGS(timeout=math.ceil(self.timeout)) as ddgs:
+            return ddgs.text(
+                query, region=region, max_results=max_results, backend=self.backend
+            )
+
+
+class FakeSearchProvider:
+    """In-process provider with canned results, for tests and benchmarks.
+
+    delay is a number of seconds, or a callable returning one per call, to
+    model a latency distribution.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        results: list[dict],
+        delay: float | Callable[[], float] = 0.0,
+        error: Exception | None = None,
+    ) -> None:
+        self.name = name
+        self.results = results
+        self.delay = delay
+        self.error = error
+        self.queries: list[tuple[str, str]] = []
+        self.abandoned_threads = 0
+
+    async def search(self, query: str, region: str, max_results: int) -> list[dict]:
+        self.queries.append((query, region))
+        await asyncio.sleep(self.delay() if callable(self.delay) else self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.results[:max_results]
+
+
+@dataclasses.dataclass
+class ProviderStats:
+    calls: int = 0
+    hedges: int = 0
+    wins: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    cancelled: int = 0
+    latency_ms_total: float = 0.0
+    latency_ms_max: float = 0.0
+
+
+def _dedup_key(url: str) -> str:
+    try:
+        return canonicalize_url(url)
+    except ValueError:
+        # Left for the caller to reject
+        return url
+
+
+def merge_results(result_lists: Sequence[list[dict]]) -> list[dict]:
+    """Interleave ranked result lists, keeping the first of each URL."""
+    merged = []
+    seen_urls = set()
+    for rank in range(max(map(len, result_lists), default=0)):
+        for results in result_lists:
+            if rank >= len(results):
+                continue
+            url = _dedup_key(results[rank]["href"])
+            if url not in seen_urls:
+                seen_urls.add(url)
+                merged.append(results[rank])
+    return merged
+
+
+class FederatedSearch:
+    """Query providers in order of preference, hedging against slow ones.
+
+    The first provider is queried alone. Whenever hedge_delay passes without
+    an answer, or a provider fails or exceeds its timeout, the next one is
+    started as well. Once one answers, the others still running get
+    merge_grace seconds to add their results, and are then cancelled. The
+    answers are merged in provider order, without duplicate URLs.
+    """
+
+    def __init__(
+        self,
+        providers: Sequence[SearchProvider],
+        timeout: float,
+        hedge_delay: float,
+        merge_grace: float = 0.0,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        if not providers:
+            raise ValueError("FederatedSearch needs at least one provider")
+        self.providers = list(providers)
+        self.timeout = timeout
+        self.hedge_delay = hedge_delay
+        self.merge_grace = merge_grace
+        self.stats = {provider.name: ProviderStats() for provider in providers}
+        self._clock = clock
+
+    async def search(self, query: str, region: str, max_results: int) -> list[dict]:
+        """Return merged results, or raise the last error if every provider failed."""
+        running: dict[asyncio.Task[list[dict]], int] = {}
+        answers: dict[int, list[dict]] = {}
+        errors: list[BaseException] = []
+
+        def start(index: int) -> None:
+            provider = self.providers[index]
+            if index > 0:
+                self.stats[provider.name].hedges += 1
+            task = asyncio.ensure_future(
+                self._query(provider, query, region, max_results)
+            )
+            running[task] = index
+
+        def collect(done: set[asyncio.Task[list[dict]]]) -> None:
+            for task in done:
+                index = running.pop(task)
+                if task.exception() is None:
+                    answers[index] = task.result()
+                else:
+                    errors.append(task.exception())
+
+        started = 1
+        start(0)
+        try:
+            while running and not answers:
+                can_hedge = started < len(self.providers)
+                failed_before = len(errors)
+                done, _ = await asyncio.wait(
+                    running,
+                    timeout=self.hedge_delay if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                collect(done)
+                stalled = not done or len(errors) > failed_before
+                if not answers and can_hedge and stalled:
+                    start(started)
+                    started += 1
+            if answers and running and self.merge_grace > 0:
+                done, _ = await asyncio.wait(running, timeout=self.merge_grace)
+                collect(done)
+        finally:
+            for task, index in running.items():
+                task.cancel()
+                self.stats[self.providers[index].name].cancelled += 1
+
+        if not answers:
+            raise errors[-1]
+        for index in answers:
+            self.stats[self.providers[index].name].wins += 1
+        return merge_results([answers[index] for index in sorted(answers)])
+
+    async def _query(
+        self, provider: SearchProvider, query: str, region: str, max_results: int
+    ) -> list[dict]:
+        stats = self.stats[provider.name]
+        stats.calls += 1
+        start = self._clock()
+        try:
+            results = await asyncio.wait_for(
+                provider.search(query, region, max_results), self.timeout
+            )
+        except TimeoutError:
+            stats.timeouts += 1
+            logger.warning(f"Search provider {provider.name} timed out")
+            raise
+        except Exception as e:
+            stats.failures += 1
+            logger.warning(f"Search provider {provider.name} failed: {e}")
+            raise
+        latency_ms = (self._clock() - start) * 1000
+        stats.latency_ms_total += latency_ms
+        stats.latency_ms_max = max(stats.latency_ms_max, latency_ms)
+        return results
@@ -0,0 +1,58 @@
+"""In-process coalescing of concurrent calls that compute the same result."""
+
+import asyncio
+import dataclasses
+import functools
+import logging
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclasses.dataclass
+class SingleFlightStats:
+    leaders: int = 0
+    followers: int = 0
+    failures: int = 0
+
+
+class SingleFlight(Generic[T]):
+    """Run at most one call per key at a time; concurrent callers share its result.
+
+    The call runs in its own task, so a caller being cancelled (e.g. the client
+    that triggered it disconnected) does not abort the work for the others.
+    Failures are propagated to every waiting caller and are not remembered: the
+    next call for the same key starts a fresh attempt.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[Hashable, asyncio.Task[T]] = {}
+        self.stats = SingleFlightStats()
+
+    def is_in_flight(self, key: Hashable) -> bool:
+        return key in self._in_flight
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Return the result of fn(), sharing an already running call for key."""
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(functools.partial(self._forget, key))
+            self.stats.leaders += 1
+        else:
+            self.stats.followers += 1
+            logger.info(f"Joined in-flight call for {key}")
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task[T]) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Retrieving the exception here also silences "never retrieved" warnings
+        # when every caller was cancelled before the task finished.
+        if not task.cancelled() and task.exception() is not None:
+            self.stats.failures += 1
+            logger.warning(f"In-flight call for {key} failed: {task.exception()}")
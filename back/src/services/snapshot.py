@@ -0,0 +1,90 @@
+"""Periodically rebuilt, pre-serialized response bodies."""
+
+import asyncio
+import dataclasses
+import hashlib
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class Snapshot:
+    body: bytes
+    etag: str
+    built_at: float
+
+
+@dataclasses.dataclass
+class SnapshotStats:
+    refreshes: int = 0
+    failures: int = 0
+
+
+class SnapshotCache:
+    """Serve the latest body produced by build, rebuilding it in the background.
+
+    run() rebuilds every interval. If it is not running, or has fallen
+    behind, get() rebuilds once the snapshot is older than max_age, with
+    concurrent callers sharing that rebuild. A failed rebuild keeps the
+    previous snapshot.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[], Awaitable[bytes]],
+        max_age: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_age = max_age
+        self.stats = SnapshotStats()
+        self._build = build
+        self._clock = clock
+        self._current: Snapshot | None = None
+        self._lock = asyncio.Lock()
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._current is not None
+            and self._clock() - self._current.built_at < self.max_age
+        )
+
+    async def get(self) -> Snapshot:
+        if not self._is_fresh():
+            async with self._lock:
+                if not self._is_fresh():
+                    await self._refresh_or_keep()
+        return self._current
+
+    async def refresh(self) -> Snapshot:
+        """Rebuild the snapshot now."""
+        async with self._lock:
+            await self._refresh_or_keep()
+        return self._current
+
+    async def _refresh_or_keep(self) -> None:
+        try:
+            body = await self._build()
+        except Exception:
+            self.stats.failures += 1
+            if self._current is None:
+                raise
+            logger.exception("Snapshot rebuild failed, serving the previous one")
+            return
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self._current = Snapshot(body, f'"{digest}"', self._clock())
+        self.stats.refreshes += 1
+
+    def invalidate(self) -> None:
+        self._current = None
+
+    async def run(self, interval: float) -> None:
+        """Rebuild every interval seconds until cancelled."""
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Snapshot rebuild failed")
+            await asyncio.sleep(interval)
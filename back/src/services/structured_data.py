@@ -0,0 +1,142 @@
+"""schema.org Recipe data embedded in pages, as JSON-LD or microdata."""
+
+import html
+import json
+import logging
+import re
+from collections.abc import Iterable, Iterator
+
+from bs4 import BeautifulSoup, Tag
+
+from src.services.schemas import ExtractedRecipe
+
+logger = logging.getLogger(__name__)
+
+RECIPE_ITEMTYPE = re.compile(r"schema\.org/Recipe/?$", re.IGNORECASE)
+INGREDIENT_PROPS = re.compile(r"^(recipeIngredient|ingredients)$")
+# Recipe objects are rarely nested deeper than @graph > mainEntity > ...
+MAX_JSON_DEPTH = 8
+
+
+def recipe_from_json_ld(blocks: Iterable[str]) -> ExtractedRecipe | None:
+    """Build the recipe from the contents of application/ld+json scripts.
+
+    Returns None unless a Recipe object provides both instructions and
+    ingredients. Ingredients are given one per line, as for microdata.
+    """
+    for block in blocks:
+        try:
+            # Sites often leave raw newlines in strings
+            data = json.loads(block, strict=False)
+        except ValueError:
+            logger.debug("Skipping invalid JSON-LD block")
+            continue
+        for recipe in _find_recipes(data, 0):
+            extracted = _from_json_ld(recipe)
+            if extracted is not None:
+                return extracted
+    return None
+
+
+def recipe_from_microdata(soup: BeautifulSoup) -> ExtractedRecipe | None:
+    """Build the recipe from the page's schema.org microdata."""
+    scope = soup.find(attrs={"itemtype": RECIPE_ITEMTYPE})
+    if isinstance(scope, Tag):
+        return _from_microdata(scope)
+    return None
+
+
+def _find_recipes(data, depth: int) -> Iterator[dict]:
+    if depth > MAX_JSON_DEPTH:
+        return
+    if isinstance(data, list):
+        for item in data:
+            yield from _find_recipes(item, depth + 1)
+    elif isinstance(data, dict):
+        if _is_recipe_type(data.get("@type")):
+            yield data
+            return
+        for value in data.values():
+            if isinstance(value, dict | list):
+                yield from _find_recipes(value, depth + 1)
+
+
+def _is_recipe_type(value) -> bool:
+    types = value if isinstance(value, list) else [value]
+    return any(
+        isinstance(t, str) and re.split(r"[/:]", t)[-1] == "Recipe" for t in types
+    )
+
+
+def _from_json_ld(recipe: dict) -> ExtractedRecipe | None:
+    ingredients = recipe.get("recipeIngredient") or recipe.get("ingredients") or []
+    if isinstance(ingredients, str):
+        ingredients = [ingredients]
+    ingredient_lines = [_clean(i) for i in ingredients if isinstance(i, str)]
+    instruction_lines = _instruction_lines(recipe.get("recipeInstructions"))
+    return _build(
+        _clean(recipe.get("name")) if isinstance(recipe.get("name"), str) else "",
+        instruction_lines,
+        ingredient_lines,
+    )
+
+
+def _instruction_lines(value) -> list[str]:
+    """Flatten recipeInstructions: text, HowToStep, HowToSection or lists."""
+    if isinstance(value, str):
+        return [_clean(value)]
+    if isinstance(value, list):
+        return [line for item in value for line in _instruction_lines(item)]
+    if not isinstance(value, dict):
+        return []
+    if "itemListElement" in value:
+        # HowToSection or ItemList: keep the section name as a heading
+        heading = [_clean(value["name"])] if isinstance(value.get("name"), str) else []
+        return heading + _instruction_lines(value["itemListElement"])
+    text = value.get("text") or value.get("name")
+    return [_clean(text)] if isinstance(text, str) else []
+
+
+def _from_microdata(scope: Tag) -> ExtractedRecipe | None:
+    name_tag = scope.find(attrs={"itemprop": "name"})
+    ingredient_lines = [
+        _prop_text(tag) for tag in scope.find_all(attrs={"itemprop": INGREDIENT_PROPS})
+    ]
+    instruction_lines = [
+        _prop_text(tag)
+        for tag in scope.find_all(attrs={"itemprop": "recipeInstructions"})
+    ]
+    return _build(
+        _prop_text(name_tag) if isinstance(name_tag, Tag) else "",
+        instruction_lines,
+        ingredient_lines,
+    )
+
+
+def _prop_text(tag: Tag) -> str:
+    content = tag.get("content")
+    if isinstance(content, str):
+        return _clean(content)
+    return tag.get_text("\n", strip=True)
+
+
+def _build(
+    title: str, instruction_lines: list[str], ingredient_lines: list[str]
+) -> ExtractedRecipe | None:
+    instruction_lines = [line for line in instruction_lines if line]
+    ingredient_lines = [line for line in ingredient_lines if line]
+    if not instruction_lines or not ingredient_lines:
+        return None
+    return ExtractedRecipe(
+        recipe="\n\n".join(instruction_lines),
+        ingredients="\n".join(ingredient_lines),
+        title=title,
+    )
+
+
+def _clean(text: str) -> str:
+    """Unescape entities and drop markup some sites leave in JSON-LD."""
+    text = html.unescape(text)
+    if "<" in text:
+        text = BeautifulSoup(text, "html.parser").get_text("\n")
+    return text.strip()
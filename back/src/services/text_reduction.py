@@ -0,0 +1,139 @@
+"""Reduction of page text to the part that holds the recipe."""
+
+import re
+
+# Quantities such as "200 g", "2 cups", "1/2 c. à soupe", "3 gousses"
+QUANTITY = re.compile(
+    r"(\d+(?:[.,/]\d+)?|[½¼¾⅓⅔])\s*"
+    r"(g|kg|mg|ml|cl|dl|l|oz|lbs?|pounds?|cups?|tbsps?|tsps?|tablespoons?|"
+    r"teaspoons?|pinch(es)?|cloves?|slices?|cans?|cuill[èe]res?|c\.\s?à\s?[sc]\.?|"
+    r"pinc[ée]es?|gousses?|tasses?|sachets?|tranches?|brins?|bottes?)(?!\w)",
+    re.IGNORECASE,
+)
+# "4 eggs", "2 jaunes d'œufs": a count starting an ingredient line
+LEADING_COUNT = re.compile(r"^(\d+|[½¼¾⅓⅔])\s+[^\W\d_]")
+DURATION = re.compile(
+    r"\d+\s*(min|minutes?|mn|h|hours?|heures?|secondes?|seconds?)(?!\w)"
+    r"|\d+\s*°\s*[CF]?",
+    re.IGNORECASE,
+)
+SECTION_HEADING = re.compile(
+    r"^(ingr[ée]dients?|pr[ée]paration|instructions|directions|method|steps|"
+    r"[ée]tapes|cuisson|ustensiles|equipment)\b",
+    re.IGNORECASE,
+)
+# A step starts with an imperative, optionally after its number
+IMPERATIVE = re.compile(
+    r"^(?:(?:step|[ée]tape)?\s*\d+\s*[.):-]?\s*)?"
+    r"(?:add|bake|beat|blend|boil|bring|chop|combine|cook|cover|cut|drain|fold|"
+    r"fry|grate|grill|heat|knead|let|melt|mix|peel|place|pour|preheat|put|"
+    r"reduce|remove|roast|season|serve|simmer|slice|spread|sprinkle|stir|"
+    r"toss|transfer|whisk|ajouter|battre|couper|cuire|disposer|[ée]goutter|"
+    r"[ée]mincer|[ée]plucher|enfourner|faire|fouetter|hacher|incorporer|"
+    r"laisser|m[ée]langer|mettre|poivrer|porter|pr[ée]chauffer|remuer|"
+    r"r[ée]server|retirer|saler|servir|verser|faites|mettez|[^\W\d_]{3,}ez)\b",
+    re.IGNORECASE,
+)
+BOILERPLATE = re.compile(
+    r"cookie|newsletter|subscribe|abonnez|privacy|confidentialit[ée]|copyright|"
+    r"©|all rights reserved|tous droits|sign up|log in|connexion|inscri",
+    re.IGNORECASE,
+)
+TOKEN_PIECE = re.compile(r"[^\W\d_]+|\d{1,3}|\S")
+# Unscored lines kept on each side of the recipe, such as its name
+CONTEXT_LINES = 2
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the LLM token count of text without a tokenizer.
+
+    Short words count as one token and longer ones as one per five letters,
+    numbers as one per three digits and other symbols as one each, which
+    stays close to BPE tokenizers on English and French text.
+    """
+    return sum(
+        1 + (len(piece) - 1) // 5 if piece[0].isalpha() else 1
+        for piece in TOKEN_PIECE.findall(text)
+    )
+
+
+def score_line(line: str) -> int:
+    """How much a line looks like part of a recipe, negative for boilerplate."""
+    if BOILERPLATE.search(line):
+        return -1
+    score = 0
+    if SECTION_HEADING.match(line):
+        score += 3
+    if QUANTITY.search(line) or LEADING_COUNT.match(line):
+        score += 2
+    if IMPERATIVE.match(line):
+        score += 2
+    if DURATION.search(line):
+        score += 1
+    return score
+
+
+def reduce_page_text(text: str, token_budget: int) -> str:
+    """Strip the lines of text and keep its most recipe-like part within budget.
+
+    Blank lines are dropped. If the text is over budget, boilerplate lines
+    are dropped and the contiguous run of lines with the highest total score
+    that fits is kept, so unscored lines inside the recipe (such as "salt"
+    in an ingredient list) stay in, with CONTEXT_LINES on each side. A
+    budget of 0 keeps every line.
+    """
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    tokens = [estimate_tokens(line) for line in lines]
+    if token_budget <= 0 or sum(tokens) <= token_budget:
+        return "\n".join(lines)
+
+    scores = [score_line(line) for line in lines]
+    kept = [i for i, score in enumerate(scores) if score >= 0]
+    start, end = _best_window(kept, scores, tokens, token_budget)
+    if start == end:
+        # Not even one line fits, or nothing looks like a recipe
+        return _truncate("\n".join(lines), token_budget)
+    return "\n".join(lines[i] for i in kept[start:end])
+
+
+def _best_window(
+    indices: list[int], scores: list[int], tokens: list[int], token_budget: int
+) -> tuple[int, int]:
+    """Bounds in indices of the highest scoring run fitting the budget."""
+    best, best_score = (0, 0), 0
+    start = window_score = window_tokens = 0
+    for end, i in enumerate(indices, 1):
+        window_score += scores[i]
+        window_tokens += tokens[i]
+        while window_tokens > token_budget:
+            window_score -= scores[indices[start]]
+            window_tokens -= tokens[indices[start]]
+            start += 1
+        if window_score > best_score:
+            best, best_score = (start, end), window_score
+    if best_score == 0:
+        return 0, 0
+    # Trim unscored lines at the edges, keeping a few around the recipe
+    start, end = best
+    while scores[indices[start]] == 0:
+        start += 1
+    while scores[indices[end - 1]] == 0:
+        end -= 1
+    window_tokens = sum(tokens[i] for i in indices[start:end])
+    for _ in range(CONTEXT_LINES):
+        if end < len(indices) and window_tokens + tokens[indices[end]] <= token_budget:
+            window_tokens += tokens[indices[end]]
+            end += 1
+        if start > 0 and window_tokens + tokens[indices[start - 1]] <= token_budget:
+            start -= 1
+            window_tokens += tokens[indices[start]]
+    return start, end
+
+
+def _truncate(text: str, token_budget: int) -> str:
+    pieces = 0
+    for match in TOKEN_PIECE.finditer(text):
+        pieces += estimate_tokens(match.group())
+        if pieces > token_budget:
+            return text[: match.start()].rstrip()
+    return text
@@ -0,0 +1,98 @@
+"""Bounded in-memory cache with LRU eviction and expiry."""
+
+import dataclasses
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclasses.dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class TTLCache(Generic[K, V]):
+    """Mapping of at most maxsize entries that each expire after a TTL.
+
+    With weigh, maxsize bounds the total weight of the values instead (for
+    example their size in bytes), and values heavier than that are not
+    stored. When full, the least recently used entry is evicted. Safe to
+    share between the event loop and worker threads.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+        weigh: Callable[[V], int] | None = None,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self.weight = 0
+        self._clock = clock
+        self._weigh = weigh or (lambda _: 1)
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        """Whether key has a live value, without counting a hit or miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[0] > self._clock()
+
+    def get(self, key: K) -> V | None:
+        """Return the live value for key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._clock():
+                self._pop(key)
+                self.stats.expirations += 1
+                entry = None
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[1]
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Store value for ttl seconds (the cache default if not given)."""
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        weight = self._weigh(value)
+        with self._lock:
+            self._pop(key)
+            if weight > self.maxsize:
+                return
+            self._entries[key] = (expires_at, value)
+            self.weight += weight
+            while self.weight > self.maxsize:
+                self._pop(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        """Drop key if present."""
+        with self._lock:
+            self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.weight = 0
+
+    def _pop(self, key: K) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.weight -= self._weigh(entry[1])
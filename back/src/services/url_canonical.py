@@ -0,0 +1,143 @@
+"""Canonical form of recipe URLs, used as cache keys."""
+
+import dataclasses
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a visit came from
+TRACKING_PARAMS = frozenset(
+    {
+        "_ga",
+        "_gl",
+        "dclid",
+        "fbclid",
+        "gclid",
+        "igshid",
+        "mc_cid",
+        "mc_eid",
+        "msclkid",
+        "ref",
+        "ref_src",
+        "share",
+        "si",
+        "yclid",
+    }
+)
+TRACKING_PARAM_PREFIXES = ("utm_", "pk_", "mtm_", "hsa_")
+
+# Query parameters that request the AMP rendering of a page
+AMP_PARAMS = frozenset({"amp", "outputtype"})
+
+# Host prefixes serving alternate (desktop/mobile/AMP) versions of one page
+ALTERNATE_HOST_PREFIXES = ("www.", "m.", "mobile.", "amp.")
+
+
+@dataclasses.dataclass(frozen=True)
+class DomainRule:
+    """Canonicalization overrides for one domain and its subdomains.
+
+    keep_params, when set, is the complete list of query parameters that
+    identify a page on the domain; everything else is dropped.
+    """
+
+    keep_params: frozenset[str] | None = None
+    strip_params: frozenset[str] = frozenset()
+
+
+DOMAIN_RULES: dict[str, DomainRule] = {
+    # Recipe identity is entirely in the path on these sites
+    "marmiton.org": DomainRule(keep_params=frozenset()),
+    "allrecipes.com": DomainRule(keep_params=frozenset()),
+    "bbcgoodfood.com": DomainRule(keep_params=frozenset()),
+    "cuisineaz.com": DomainRule(keep_params=frozenset()),
+    "journaldesfemmes.fr": DomainRule(keep_params=frozenset()),
+    "750g.com": DomainRule(keep_params=frozenset()),
+    "seriouseats.com": DomainRule(keep_params=frozenset()),
+    # Comment threads and print views of the same recipe
+    "foodnetwork.com": DomainRule(strip_params=frozenset({"ic1", "nl"})),
+    "food.com": DomainRule(strip_params=frozenset({"nav", "scaleto", "units"})),
+    # The video id lives in the query string
+    "youtube.com": DomainRule(keep_params=frozenset({"v"})),
+}
+
+
+def _domain_rule(host: str) -> DomainRule:
+    for domain, rule in DOMAIN_RULES.items():
+        if host == domain or host.endswith("." + domain):
+            return rule
+    return DomainRule()
+
+
+def _strip_host_prefix(host: str) -> str:
+    for prefix in ALTERNATE_HOST_PREFIXES:
+        # Keep at least a registrable domain ("m.example.com" -> "example.com")
+        if host.startswith(prefix) and "." in host[len(prefix) :]:
+            return host[len(prefix) :]
+    return host
+
+
+def _canonical_host(host: str) -> str:
+    host = host.lower().rstrip(".")
+    stripped = _strip_host_prefix(host)
+    # A single prefix is stripped, and only if the result is canonical too:
+    # "www.www.example.com" is kept as is rather than changing on each pass
+    if _strip_host_prefix(stripped) != stripped:
+        return host
+    return stripped
+
+
+def _canonical_path(path: str) -> str:
+    segments = [segment for segment in path.split("/") if segment]
+    amp = [segment.lower() == "amp" for segment in segments]
+    # As for hosts, a single "amp" is dropped at each end, and only when the
+    # segment next to it would not be dropped on a second pass
+    start, end = 0, len(segments)
+    if amp[:2] == [True] or amp[:2] == [True, False]:
+        start = 1
+    if end > start and amp[-2:] in ([True], [False, True]):
+        end -= 1
+    return "/" + "/".join(segments[start:end])
+
+
+def _is_dropped_param(name: str, rule: DomainRule) -> bool:
+    lowered = name.lower()
+    if rule.keep_params is not None:
+        return lowered not in rule.keep_params
+    return (
+        lowered in TRACKING_PARAMS
+        or lowered in AMP_PARAMS
+        or lowered in rule.strip_params
+        or lowered.startswith(TRACKING_PARAM_PREFIXES)
+    )
+
+
+def canonicalize_url(url: str) -> str:
+    """Map the variants of a page URL to a single cache key.
+
+    Normalizes to https, drops the fragment, default ports, www/mobile/AMP
+    host and path variants, trailing slashes and tracking parameters, and
+    sorts the remaining query parameters. The result identifies a page; it
+    is not guaranteed to be fetchable as-is, but canonicalizing it again
+    leaves it unchanged.
+
+    Raises ValueError for a string without a host, or with an invalid port.
+    """
+    parts = urlsplit(url.strip())
+    if not parts.hostname:
+        raise ValueError(f"Not a URL with a host: {url!r}")
+    host = _canonical_host(parts.hostname)
+    if ":" in host:
+        # IPv6 literal
+        host = f"[{host}]"
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    rule = _domain_rule(host)
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_dropped_param(name, rule)
+    )
+
+    return urlunsplit(
+        ("https", host, _canonical_path(parts.path), urlencode(query), "")
+    )
@@ -1,5 +1,6 @@
 """URL safety checks to mitigate SSRF attacks."""
 
+import asyncio
 import ipaddress
 import socket
 from urllib.parse import urlparse
@@ -18,9 +19,37 @@ def _is_public_ip_address(address: str) -> bool:
 def validate_public_url(url: str) -> None:
     """Validate that URL is public and safe to fetch.
 
+    Resolves the hostname with a blocking DNS lookup; event loop code should
+    use validate_public_url_async instead.
+
+    Raises:
+        ValueError: if URL is invalid or resolves to non-public addresses.
+    """
+    hostname, port = _public_host(url)
+    try:
+        addr_info = socket.getaddrinfo(hostname, port, proto=socket.IPPROTO_TCP)
+    except socket.gaierror as exc:
+        raise ValueError("Unable to resolve hostname") from exc
+    _check_resolved(addr_info)
+
+
+async def validate_public_url_async(url: str) -> None:
+    """Validate that URL is public and safe to fetch, without blocking the loop.
+
     Raises:
         ValueError: if URL is invalid or resolves to non-public addresses.
     """
+    hostname, port = _public_host(url)
+    loop = asyncio.get_running_loop()
+    try:
+        addr_info = await loop.getaddrinfo(hostname, port, proto=socket.IPPROTO_TCP)
+    except socket.gaierror as exc:
+        raise ValueError("Unable to resolve hostname") from exc
+    _check_resolved(addr_info)
+
+
+def _public_host(url: str) -> tuple[str, int | None]:
+    """Return the hostname and port of URL, rejecting non-public names."""
     parsed = urlparse(url)
     if parsed.scheme not in {"http", "https"}:
         raise ValueError("URL must use http or https")
@@ -33,11 +62,10 @@ def validate_public_url(url: str) -> None:
     if normalized in {"localhost"} or normalized.endswith(".local"):
         raise ValueError("Localhost and local domains are not allowed")
 
-    try:
-        addr_info = socket.getaddrinfo(hostname, parsed.port, proto=socket.IPPROTO_TCP)
-    except socket.gaierror as exc:
-        raise ValueError("Unable to resolve hostname") from exc
+    return hostname, parsed.port
+
 
+def _check_resolved(addr_info: list) -> None:
     resolved_ips = {
         addr[4][0] for addr in addr_info if addr and len(addr) > 4 and addr[4]
     }
@@ -0,0 +1,78 @@
+"""Cache of URL accessibility verdicts, with separate TTLs per outcome."""
+
+import threading
+import time
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime, timedelta
+
+from src.services.ttl_cache import CacheStats, TTLCache
+from src.services.url_canonical import canonicalize_url
+
+# url -> (accessible, expires_at)
+StoredVerdicts = dict[str, tuple[bool, datetime]]
+
+
+class VerdictCache:
+    """Whether a URL can be scraped, remembered per canonical URL.
+
+    Accessible pages stay accessible for a long time, while a failed check
+    may be a transient error, so the two outcomes expire separately. With
+    persist, new verdicts are also queued for a persistent store (see
+    drain_unsaved).
+    """
+
+    def __init__(
+        self,
+        positive_ttl: float,
+        negative_ttl: float,
+        maxsize: int,
+        persist: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.persist = persist
+        self._verdicts: TTLCache[str, bool] = TTLCache(
+            maxsize=maxsize, ttl=positive_ttl, clock=clock
+        )
+        self._unsaved: StoredVerdicts = {}
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._verdicts.stats
+
+    def __len__(self) -> int:
+        return len(self._verdicts)
+
+    def get(self, url: str) -> bool | None:
+        """Return the cached verdict for url, or None if unknown or expired."""
+        return self._verdicts.get(canonicalize_url(url))
+
+    def set(self, url: str, accessible: bool) -> None:
+        ttl = self.positive_ttl if accessible else self.negative_ttl
+        key = canonicalize_url(url)
+        self._verdicts.set(key, accessible, ttl=ttl)
+        if self.persist:
+            expires_at = datetime.now(UTC) + timedelta(seconds=ttl)
+            with self._lock:
+                self._unsaved[key] = (accessible, expires_at)
+
+    def load(self, verdicts: Iterable[tuple[str, bool, datetime]]) -> None:
+        """Add verdicts read from the persistent store, keeping their expiry."""
+        now = datetime.now(UTC)
+        for url, accessible, expires_at in verdicts:
+            ttl = (expires_at - now).total_seconds()
+            if ttl > 0:
+                self._verdicts.set(canonicalize_url(url), accessible, ttl=ttl)
+
+    def drain_unsaved(self) -> StoredVerdicts:
+        """Return and forget the verdicts set since the last drain."""
+        with self._lock:
+            unsaved, self._unsaved = self._unsaved, {}
+        return unsaved
+
+    def clear(self) -> None:
+        self._verdicts.clear()
+        with self._lock:
+            self._unsaved.clear()
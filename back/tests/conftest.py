@@ -1,6 +1,22 @@
 import pytest
 
 
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """A clock for caches that only moves when a test sets clock.now."""
+    return FakeClock()
+
+
 @pytest.fixture
 def sample_recipe_graph_json() -> str:
     """Sample recipe graph JSON for testing."""
@@ -0,0 +1,288 @@
+"""Tests for ai_service.py - recipe page fetching."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+import respx
+
+from src.services.ai_service import (
+    _get_openai_client,
+    _safe_get,
+    close_openai_client,
+    count_llm_calls,
+    extract_recipe_from_page,
+    extraction_stats,
+    generate_dependency_graph,
+    llm_results,
+    load_recipe_page,
+    prompt_recipe_to_graph,
+    warm_openai_client,
+)
+from src.services.graph import plan_steps
+from src.services.http_client import close_http_client
+from src.services.page_text import ParsedPage
+from src.services.prefetch import PrefetchedPage, prefetched_pages
+from src.services.schemas import ExtractedRecipe
+
+
+@pytest.fixture(autouse=True)
+def shared_client():
+    """Give each test a fresh shared client bound to its own event loop."""
+    yield
+    asyncio.run(close_http_client())
+
+
+class TestSafeGet:
+    """Tests for _safe_get function."""
+
+    @respx.mock
+    @patch("src.services.ai_service.validate_public_url_async")
+    def test_returns_content(self, mock_validate):
+        """Should return the page body."""
+        respx.get("https://example.com/recipe").mock(
+            return_value=httpx.Response(200, content=b"<html></html>")
+        )
+
+        assert asyncio.run(_safe_get("https://example.com/recipe")) == b"<html></html>"
+
+    @respx.mock
+    @patch("src.services.ai_service.validate_public_url_async")
+    def test_validates_each_redirect(self, mock_validate):
+        """Should run the SSRF check on every redirect target."""
+        respx.get("https://example.com/recipe").mock(
+            return_value=httpx.Response(301, headers={"location": "/moved"})
+        )
+        respx.get("https://example.com/moved").mock(
+            return_value=httpx.Response(200, content=b"moved")
+        )
+
+        assert asyncio.run(_safe_get("https://example.com/recipe")) == b"moved"
+        assert [c.args[0] for c in mock_validate.call_args_list] == [
+            "https://example.com/recipe",
+            "https://example.com/moved",
+        ]
+
+    @respx.mock
+    @patch("src.services.ai_service.validate_public_url_async")
+    def test_rejects_redirect_to_private_network(self, mock_validate):
+        """Should stop when a redirect points to a non-public address."""
+        respx.get("https://example.com/recipe").mock(
+            return_value=httpx.Response(302, headers={"location": "http://10.0.0.1/"})
+        )
+
+        def validate(url):
+            if "10.0.0.1" in url:
+                raise ValueError("URL resolves to a non-public network")
+
+        mock_validate.side_effect = validate
+
+        with pytest.raises(ValueError):
+            asyncio.run(_safe_get("https://example.com/recipe"))
+
+    @respx.mock
+    @patch("src.services.ai_service.validate_public_url_async")
+    def test_wraps_http_errors(self, mock_validate):
+        """Should raise RuntimeError for error statuses."""
+        respx.get("https://example.com/recipe").mock(return_value=httpx.Response(404))
+
+        with pytest.raises(RuntimeError, match="Failed to fetch recipe URL"):
+            asyncio.run(_safe_get("https://example.com/recipe"))
+
+
+class TestPrefetchedPages:
+    """Tests for the use of prefetched pages."""
+
+    @pytest.fixture(autouse=True)
+    def empty_prefetched_pages(self):
+        """Start each test without prefetched pages."""
+        prefetched_pages.clear()
+        yield
+        prefetched_pages.clear()
+
+    @respx.mock
+    def test_load_uses_prefetched_page(self):
+        """Should return a prefetched page without a request, only once."""
+        prefetched_pages.set(
+            "https://example.com/recipe", PrefetchedPage(b"<html></html>")
+        )
+        route = respx.get("https://example.com/recipe").mock(
+            return_value=httpx.Response(200, content=b"fresh")
+        )
+
+        with patch("src.services.ai_service.validate_public_url_async"):
+            first, _ = asyncio.run(load_recipe_page("https://example.com/recipe/"))
+            second, _ = asyncio.run(load_recipe_page("https://example.com/recipe"))
+
+        assert first == b"<html></html>"
+        assert second == b"fresh"
+        assert route.call_count == 1
+
+    def test_load_uses_extracted_text(self):
+        """Should reuse the text extracted at prefetch time."""
+        parsed = ParsedPage(title="Stew", text="Simmer")
+        prefetched_pages.set(
+            "https://example.com/recipe", PrefetchedPage(b"<html></html>", parsed)
+        )
+
+        html_content, page = asyncio.run(load_recipe_page("https://example.com/recipe"))
+
+        assert html_content == b"<html></html>"
+        assert page is parsed
+
+    def test_load_parses_page_without_text(self):
+        """Should extract the text of a prefetched page kept without it."""
+        prefetched_pages.set(
+            "https://example.com/recipe",
+            PrefetchedPage(b"<html><title>Stew</title><body>Simmer</body></html>"),
+        )
+
+        _, page = asyncio.run(load_recipe_page("https://example.com/recipe"))
+
+        assert page == ParsedPage(title="Stew", text="Simmer")
+
+
+class TestExtractRecipeFromPage:
+    """Tests for extract_recipe_from_page function."""
+
+    @patch("src.services.ai_service._get_openai_client")
+    def test_uses_structured_data_without_openai(self, mock_get_client):
+        """Should return the structured recipe without an OpenAI call."""
+        recipe = ExtractedRecipe(recipe="Boil.", ingredients="pasta", title="P")
+        page = ParsedPage(title="P - Site", text="...", recipe=recipe)
+        structured_before = extraction_stats.structured
+
+        result = asyncio.run(extract_recipe_from_page(page))
+
+        assert result == recipe
+        assert result is not recipe
+        mock_get_client.assert_not_called()
+        assert extraction_stats.structured == structured_before + 1
+
+
+def _answer(mock_get_client, *contents):
+    create = AsyncMock()
+    create.side_effect = [
+        AsyncMock(choices=[AsyncMock(message=AsyncMock(content=content))])
+        for content in contents
+    ]
+    mock_get_client.return_value.chat.completions.create = create
+    return create
+
+
+class TestLlmResultCaching:
+    """Tests for the reuse of LLM answers across calls."""
+
+    GRAPH = '{"steps": [{"id": 1, "name": "Boil"}], "dependencies": []}'
+
+    @pytest.fixture(autouse=True)
+    def empty_llm_results(self):
+        """Start each test without cached answers."""
+        llm_results.memory.clear()
+        yield
+        llm_results.memory.clear()
+
+    @patch("src.services.ai_service._get_openai_client")
+    def test_same_page_text_extracted_once(self, mock_get_client):
+        """Should reuse the extraction for text differing only in layout."""
+        create = _answer(mock_get_client, '{"recipe": "Boil.", "ingredients": "pasta"}')
+
+        first = asyncio.run(
+            extract_recipe_from_page(ParsedPage(title="A", text="Boil.\n  pasta "))
+        )
+        second = asyncio.run(
+            extract_recipe_from_page(ParsedPage(title="B", text="  Boil.\npasta"))
+        )
+
+        create.assert_awaited_once()
+        assert (first.recipe, first.title) == ("Boil.", "A")
+        assert (second.recipe, second.title) == ("Boil.", "B")
+
+    @patch("src.services.ai_service._get_openai_client")
+    def test_graph_reused_for_same_recipe(self, mock_get_client):
+        """Should answer a repeated recipe without a new call."""
+        create = _answer(mock_get_client, self.GRAPH)
+
+        first = asyncio.run(generate_dependency_graph("Boil.", "pasta"))
+        second = asyncio.run(generate_dependency_graph("Boil.", "pasta"))
+
+        assert first == second == self.GRAPH
+        create.assert_awaited_once()
+
+    @patch("src.services.ai_service._get_openai_client")
+    def test_counts_only_requests_made(self, mock_get_client):
+        """Should not count answers served from the cache as LLM calls."""
+        _answer(mock_get_client, self.GRAPH)
+
+        async def scenario():
+            with count_llm_calls() as count:
+                await generate_dependency_graph("Boil.", "pasta")
+                await generate_dependency_graph("Boil.", "pasta")
+            return count.calls
+
+        assert asyncio.run(scenario()) == 1
+
+    @patch("src.services.ai_service._get_openai_client")
+    def test_prompt_change_invalidates_its_stage(self, mock_get_client):
+        """Should ask again once the graph prompt has changed."""
+        create = _answer(mock_get_client, self.GRAPH, self.GRAPH)
+
+        asyncio.run(generate_dependency_graph("Boil.", "pasta"))
+        with patch(
+            "src.services.ai_service.prompt_recipe_to_graph",
+            prompt_recipe_to_graph + "Be concise.",
+        ):
+            asyncio.run(generate_dependency_graph("Boil.", "pasta"))
+
+        assert create.await_count == 2
+
+    @patch("src.services.ai_service._get_openai_client")
+    def test_invalid_answer_not_cached(self, mock_get_client):
+        """Should raise on an unusable graph and ask again next time."""
+        create = _answer(mock_get_client, '{"steps": "none"}', self.GRAPH)
+
+        with pytest.raises(ValueError):
+            asyncio.run(generate_dependency_graph("Boil.", "pasta"))
+
+        assert asyncio.run(generate_dependency_graph("Boil.", "pasta")) == self.GRAPH
+        assert create.await_count == 2
+
+    @patch("src.services.ai_service._get_openai_client")
+    def test_answer_failing_check_not_cached(self, mock_get_client):
+        """Should not cache a graph that parses but cannot be planned."""
+        cyclic = (
+            '{"steps": [{"id": 1, "name": "Boil"}, {"id": 2, "name": "Drain"}],'
+            ' "dependencies": [{"do": 1, "before": 2}, {"do": 2, "before": 1}]}'
+        )
+        create = _answer(mock_get_client, cyclic, self.GRAPH)
+
+        with pytest.raises(AssertionError):
+            asyncio.run(generate_dependency_graph("Boil.", "pasta", check=plan_steps))
+
+        assert (
+            asyncio.run(generate_dependency_graph("Boil.", "pasta", check=plan_steps))
+            == self.GRAPH
+        )
+        assert create.await_count == 2
+
+
+class TestOpenAIClient:
+    """Tests for the shared OpenAI client."""
+
+    @patch.dict("os.environ", {"OPENAI_API_KEY": "test", "OPENAI_MAX_RETRIES": "5"})
+    def test_reuses_client(self):
+        """Should build the client once and reuse it for every call."""
+        client = _get_openai_client()
+        try:
+            assert _get_openai_client() is client
+            assert client.max_retries == 5
+        finally:
+            asyncio.run(close_openai_client())
+
+    @patch("src.services.ai_service._get_openai_client")
+    def test_warm_up_failure_is_not_fatal(self, mock_get_client):
+        """Should log and continue when the pre-warm request fails."""
+        mock_get_client.return_value.models.list.side_effect = Exception("down")
+
+        asyncio.run(warm_openai_client())
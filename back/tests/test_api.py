@@ -1,11 +1,27 @@
 """Tests for app.py - FastAPI endpoints."""
 
+import asyncio
+import json
+from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
-from src.app import app
+from src.app import (
+    PipelineRun,
+    RecipeUrl,
+    _find_planned_urls,
+    _load_url_verdicts,
+    _shared_pipeline_run,
+    app,
+    coalescing_stats,
+    limiter,
+    popular_snapshot,
+    recipe_cache,
+    url_verdicts,
+)
+from src.db.database import get_async_db
 
 
 @pytest.fixture
@@ -14,16 +30,41 @@ def client():
     return TestClient(app)
 
 
-@pytest.fixture
-def mock_db():
-    """Create a mock database session."""
-    return MagicMock()
+@pytest.fixture(autouse=True)
+def pipeline_claim():
+    """Grant the cross-worker pipeline claim without a database."""
+    with patch("src.db.locks.try_advisory_lock") as mock_lock:
+        mock_lock.return_value.__aenter__.return_value = True
+        yield mock_lock
 
 
-@pytest.fixture
-def mock_repo():
-    """Create a mock repository."""
-    return MagicMock()
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """Keep the per-minute limits from leaking between tests."""
+    limiter.reset()
+
+
+@pytest.fixture(autouse=True)
+def empty_recipe_cache():
+    """Start each test without plans cached in memory."""
+    recipe_cache.clear()
+    yield
+    recipe_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def fresh_popular_snapshot():
+    """Rebuild the /popular_recipes snapshot in every test."""
+    popular_snapshot.invalidate()
+
+
+@pytest.fixture(autouse=True)
+def mock_db():
+    """Serve request handlers a mock async database session."""
+    db = AsyncMock()
+    app.dependency_overrides[get_async_db] = lambda: db
+    yield db
+    app.dependency_overrides.clear()
 
 
 class TestRootEndpoint:
@@ -40,7 +81,7 @@ class TestRootEndpoint:
 class TestSearchRecipesEndpoint:
     """Tests for GET /search_recipes endpoint."""
 
-    @patch("src.app.search_recipes")
+    @patch("src.app.search_recipes", new_callable=AsyncMock)
     def test_search_returns_results(self, mock_search, client):
         """Should return search results."""
         mock_search.return_value = {
@@ -62,7 +103,7 @@ class TestSearchRecipesEndpoint:
         assert data["results"][0]["title"] == "Pasta Recipe"
         assert data["has_more"] is False
 
-    @patch("src.app.search_recipes")
+    @patch("src.app.search_recipes", new_callable=AsyncMock)
     def test_search_with_pagination(self, mock_search, client):
         """Should pass page parameter to search."""
         mock_search.return_value = {"results": [], "has_more": True}
@@ -70,9 +111,11 @@ class TestSearchRecipesEndpoint:
         response = client.get("/search_recipes?query=pasta&locale=fr&page=2")
 
         assert response.status_code == 200
-        mock_search.assert_called_once_with("pasta", "fr", 2)
+        mock_search.assert_called_once_with(
+            "pasta", "fr", 2, find_planned=_find_planned_urls
+        )
 
-    @patch("src.app.search_recipes")
+    @patch("src.app.search_recipes", new_callable=AsyncMock)
     def test_search_empty_results(self, mock_search, client):
         """Should handle empty results."""
         mock_search.return_value = {"results": [], "has_more": False}
@@ -95,23 +138,169 @@ class TestSearchRecipesEndpoint:
         assert response.status_code == 422
 
 
+class TestFindPlannedUrls:
+    """Tests for the planned-recipe lookup of search results."""
+
+    @patch("src.app.get_async_session_local")
+    @patch("src.app.RecipeHistoryRepository")
+    def test_queries_only_urls_missing_from_memory(self, mock_repo_class, _):
+        """Should answer from the plan cache and batch the rest in one query."""
+        recipe_cache.set("https://example.com/a", [])
+        mock_repo = AsyncMock()
+        mock_repo.get_planned_urls.return_value = {"https://example.com/b"}
+        mock_repo_class.return_value = mock_repo
+
+        planned = asyncio.run(
+            _find_planned_urls(
+                [
+                    "https://example.com/a",
+                    "https://example.com/b",
+                    "https://example.com/c",
+                ]
+            )
+        )
+
+        assert planned == {"https://example.com/a", "https://example.com/b"}
+        mock_repo.get_planned_urls.assert_awaited_once_with(
+            ["https://example.com/b", "https://example.com/c"]
+        )
+
+    @patch("src.app.get_async_session_local")
+    def test_skips_query_when_all_in_memory(self, mock_session_local):
+        """Should not open a session when every URL is cached in memory."""
+        recipe_cache.set("https://example.com/a", [])
+
+        planned = asyncio.run(_find_planned_urls(["https://example.com/a"]))
+
+        assert planned == {"https://example.com/a"}
+        mock_session_local.assert_not_called()
+
+    @patch("src.app.get_async_session_local")
+    def test_ignores_database_errors(self, mock_session_local):
+        """Should report nothing planned rather than fail the search."""
+        mock_session_local.side_effect = RuntimeError("db down")
+
+        assert asyncio.run(_find_planned_urls(["https://example.com/a"])) == set()
+
+
+class TestRecipesEndpoint:
+    """Tests for GET /recipes endpoint."""
+
+    @patch("src.app.RecipeHistoryRepository")
+    def test_returns_stored_plans(self, mock_repo_class, client):
+        """Should return the stored plans in one lookup, under requested URLs."""
+        mock_repo = AsyncMock()
+        mock_repo.get_many.return_value = [
+            MagicMock(
+                url="https://example.com/a",
+                title="A",
+                planned_steps=[
+                    {
+                        "step_id": "1",
+                        "step_name": "Boil",
+                        "duration_minute": 5,
+                        "dependencies": [],
+                        "ingredients": [],
+                    }
+                ],
+            )
+        ]
+        mock_repo_class.return_value = mock_repo
+
+        response = client.get(
+            "/recipes?urls=https://example.com/a?utm_source=x"
+            "&urls=https://example.com/b"
+        )
+
+        assert response.status_code == 200
+        recipes = response.json()["recipes"]
+        assert [r["url"] for r in recipes] == ["https://example.com/a?utm_source=x"]
+        assert recipes[0]["planned_steps"][0]["step_name"] == "Boil"
+        mock_repo.get_many.assert_awaited_once_with(
+            ["https://example.com/a", "https://example.com/b"]
+        )
+        assert recipe_cache.get("https://example.com/a") is not None
+
+    @pytest.mark.parametrize("malformed", ["http://a.com:99999/x", "http://[::1"])
+    @patch("src.app.RecipeHistoryRepository")
+    def test_leaves_out_malformed_urls(self, mock_repo_class, malformed, client):
+        """Should report malformed URLs as not found instead of failing."""
+        mock_repo = AsyncMock()
+        mock_repo.get_many.return_value = []
+        mock_repo_class.return_value = mock_repo
+
+        response = client.get(
+            "/recipes", params={"urls": [malformed, "https://example.com/a"]}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["recipes"] == []
+        mock_repo.get_many.assert_awaited_once_with(["https://example.com/a"])
+
+    def test_requires_urls(self, client):
+        """Should return 422 without urls."""
+        assert client.get("/recipes").status_code == 422
+
+    def test_limits_urls(self, client):
+        """Should reject more URLs than one call may ask for."""
+        query = "&".join(f"urls=https://example.com/{i}" for i in range(51))
+
+        assert client.get(f"/recipes?{query}").status_code == 422
+
+
+async def _records(*records):
+    for record in records:
+        yield record
+
+
+class TestSearchRecipesStreamEndpoint:
+    """Tests for GET /search_recipes/stream endpoint."""
+
+    @patch("src.app.stream_search_recipes", new_callable=AsyncMock)
+    def test_streams_results_then_has_more(self, mock_stream, client):
+        """Should emit one JSON line per result, then the has_more record."""
+        mock_stream.return_value = _records(
+            {"title": "A", "url": "https://example.com/a", "snippet": "a"},
+            {"title": "B", "url": "https://example.com/b", "snippet": "b"},
+            {"has_more": True},
+        )
+
+        response = client.get("/search_recipes/stream?query=pasta&locale=fr&page=1")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line.get("title") for line in lines[:2]] == ["A", "B"]
+        assert lines[2] == {"has_more": True}
+        mock_stream.assert_awaited_once_with(
+            "pasta", "fr", 1, find_planned=_find_planned_urls
+        )
+
+    def test_validates_parameters(self, client):
+        """Should apply the same parameter validation as /search_recipes."""
+        response = client.get("/search_recipes/stream?query=&locale=en")
+
+        assert response.status_code == 422
+
+
 class TestPopularRecipesEndpoint:
     """Tests for GET /popular_recipes endpoint."""
 
+    @staticmethod
+    def _popular(mock_repo_class, entries):
+        mock_repo = AsyncMock()
+        mock_repo.get_popular.return_value = entries
+        mock_repo_class.return_value = mock_repo
+        return mock_repo
+
     @patch("src.app.RecipeHistoryRepository")
-    @patch("src.app.get_db")
-    def test_returns_popular_recipes(self, mock_get_db, mock_repo_class, client):
+    def test_returns_popular_recipes(self, mock_repo_class, client):
         """Should return popular recipes from database."""
-        mock_db = MagicMock()
-        mock_get_db.return_value = iter([mock_db])
-
-        mock_repo = MagicMock()
         mock_entry = MagicMock()
         mock_entry.title = "Popular Recipe"
         mock_entry.url = "https://example.com/popular"
         mock_entry.snippet = "Very popular"
-        mock_repo.get_popular.return_value = [mock_entry]
-        mock_repo_class.return_value = mock_repo
+        self._popular(mock_repo_class, [mock_entry])
 
         response = client.get("/popular_recipes")
 
@@ -121,37 +310,72 @@ class TestPopularRecipesEndpoint:
         assert data["recipes"][0]["title"] == "Popular Recipe"
 
     @patch("src.app.RecipeHistoryRepository")
-    @patch("src.app.get_db")
-    def test_returns_empty_when_no_history(self, mock_get_db, mock_repo_class, client):
+    def test_returns_empty_when_no_history(self, mock_repo_class, client):
         """Should return empty list when no history."""
-        mock_db = MagicMock()
-        mock_get_db.return_value = iter([mock_db])
-
-        mock_repo = MagicMock()
-        mock_repo.get_popular.return_value = []
-        mock_repo_class.return_value = mock_repo
+        self._popular(mock_repo_class, [])
 
         response = client.get("/popular_recipes")
 
         assert response.status_code == 200
         assert response.json()["recipes"] == []
 
+    @patch("src.app.RecipeHistoryRepository")
+    def test_serves_snapshot_without_querying_again(self, mock_repo_class, client):
+        """Should answer repeated requests from the in-memory snapshot."""
+        mock_repo = self._popular(mock_repo_class, [])
+
+        client.get("/popular_recipes")
+        client.get("/popular_recipes")
+
+        mock_repo.get_popular.assert_awaited_once()
+
+    @patch("src.app.RecipeHistoryRepository")
+    def test_sets_cache_headers(self, mock_repo_class, client):
+        """Should send an ETag and a public Cache-Control."""
+        self._popular(mock_repo_class, [])
+
+        response = client.get("/popular_recipes")
+
+        assert response.headers["etag"].startswith('"')
+        assert response.headers["cache-control"].startswith("public, max-age=")
+        assert response.headers["content-type"] == "application/json"
+
+    @patch("src.app.RecipeHistoryRepository")
+    def test_revalidates_with_etag(self, mock_repo_class, client):
+        """Should answer 304 without a body when the client's copy is current."""
+        self._popular(mock_repo_class, [])
+        etag = client.get("/popular_recipes").headers["etag"]
+
+        response = client.get("/popular_recipes", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    @patch("src.app.RecipeHistoryRepository")
+    def test_ignores_stale_etag(self, mock_repo_class, client):
+        """Should send the full list when the client's ETag does not match."""
+        self._popular(mock_repo_class, [])
+
+        response = client.get(
+            "/popular_recipes", headers={"If-None-Match": '"outdated"'}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"recipes": []}
+
 
 class TestGanntifyRecipeDataEndpoint:
     """Tests for POST /ganntify_recipe_data endpoint."""
 
-    @patch("src.app.validate_public_url")
+    @patch("src.app.validate_public_url_async")
     @patch("src.app.RecipeHistoryRepository")
-    @patch("src.app.get_db")
     @patch("src.app.ganntify_recipe", new_callable=AsyncMock)
     def test_returns_planned_steps_from_processing(
-        self, mock_ganntify, mock_get_db, mock_repo_class, mock_validate_url, client
+        self, mock_ganntify, mock_repo_class, mock_validate_url, client
     ):
         """Should return planned steps data when not cached."""
-        mock_db = MagicMock()
-        mock_get_db.return_value = iter([mock_db])
-
-        mock_repo = MagicMock()
+        mock_repo = AsyncMock()
         mock_repo.get_by_url.return_value = None  # Not cached
         mock_repo_class.return_value = mock_repo
 
@@ -178,18 +402,15 @@ class TestGanntifyRecipeDataEndpoint:
         mock_validate_url.assert_called_once_with("https://example.com/recipe")
         mock_repo.upsert.assert_called_once()
 
-    @patch("src.app.validate_public_url")
+    @patch("src.app.hit_tracker")
+    @patch("src.app.validate_public_url_async")
     @patch("src.app.RecipeHistoryRepository")
-    @patch("src.app.get_db")
     @patch("src.app.ganntify_recipe", new_callable=AsyncMock)
     def test_returns_cached_steps(
-        self, mock_ganntify, mock_get_db, mock_repo_class, mock_validate_url, client
+        self, mock_ganntify, mock_repo_class, mock_validate_url, mock_tracker, client
     ):
         """Should return cached steps without reprocessing."""
-        mock_db = MagicMock()
-        mock_get_db.return_value = iter([mock_db])
-
-        mock_repo = MagicMock()
+        mock_repo = AsyncMock()
         mock_cached = MagicMock()
         mock_cached.planned_steps = [
             {
@@ -213,20 +434,116 @@ class TestGanntifyRecipeDataEndpoint:
         assert data["planned_steps"][0]["step_name"] == "Cached step"
         mock_validate_url.assert_called_once_with("https://example.com/recipe")
         mock_ganntify.assert_not_called()  # Should not process
-        mock_repo.touch.assert_called_once()  # Should update timestamp
+        # Hit is recorded in memory, not written on the request path
+        mock_tracker.record.assert_called_once_with("https://example.com/recipe")
+        mock_repo.record_hits.assert_not_called()
+
+    @patch("src.app.validate_public_url_async")
+    @patch("src.app.RecipeHistoryRepository")
+    @patch("src.app.ganntify_recipe", new_callable=AsyncMock)
+    def test_returns_steps_cached_in_memory(
+        self, mock_ganntify, mock_repo_class, mock_validate_url, client
+    ):
+        """Should serve a recently used plan without reading the database."""
+        mock_repo = AsyncMock()
+        mock_repo_class.return_value = mock_repo
+        recipe_cache.set(
+            "https://example.com/recipe",
+            [
+                {
+                    "step_id": "1",
+                    "step_name": "Memory step",
+                    "duration_minute": 5,
+                    "dependencies": [],
+                    "ingredients": [],
+                }
+            ],
+        )
+
+        response = client.post(
+            "/ganntify_recipe_data",
+            json={"recipe_url": "https://www.example.com/recipe/?utm_source=x"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["planned_steps"][0]["step_name"] == "Memory step"
+        mock_repo.get_by_url.assert_not_called()
+        mock_ganntify.assert_not_called()
+
+    @patch("src.app.validate_public_url_async")
+    @patch("src.app.RecipeHistoryRepository")
+    @patch("src.app.ganntify_recipe", new_callable=AsyncMock)
+    def test_ignores_client_refresh_request(
+        self, mock_ganntify, mock_repo_class, mock_validate_url, client
+    ):
+        """Should not let a client evict a cached plan."""
+        mock_repo = AsyncMock()
+        mock_repo_class.return_value = mock_repo
+        recipe_cache.set("https://example.com/recipe", [])
+
+        response = client.post(
+            "/ganntify_recipe_data",
+            json={"recipe_url": "https://example.com/recipe", "force_refresh": True},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["planned_steps"] == []
+        mock_ganntify.assert_not_called()
+        assert recipe_cache.get("https://example.com/recipe") == []
+
+    @patch("src.app.validate_public_url_async")
+    @patch("src.app.RecipeHistoryRepository")
+    @patch("src.app.ganntify_recipe", new_callable=AsyncMock)
+    def test_releases_request_session_before_pipeline(
+        self, mock_ganntify, mock_repo_class, mock_validate_url, mock_db, client
+    ):
+        """Should not hold the request's connection while the pipeline runs."""
+        mock_repo = AsyncMock()
+        mock_repo.get_by_url.return_value = None
+        mock_repo_class.return_value = mock_repo
+
+        async def ganntify(url, on_stage=None):
+            mock_db.close.assert_awaited_once()
+            return [], "Title"
+
+        mock_ganntify.side_effect = ganntify
+
+        response = client.post(
+            "/ganntify_recipe_data",
+            json={"recipe_url": "https://example.com/recipe"},
+        )
+
+        assert response.status_code == 200
+        mock_ganntify.assert_awaited_once()
+
+    @patch("src.app.validate_public_url_async")
+    @patch("src.app.RecipeHistoryRepository")
+    @patch("src.app.ganntify_recipe", new_callable=AsyncMock)
+    def test_marks_processed_url_accessible(
+        self, mock_ganntify, mock_repo_class, mock_validate_url, client
+    ):
+        """Should let searches skip the accessibility check for the recipe."""
+        mock_repo = AsyncMock()
+        mock_repo.get_by_url.return_value = None
+        mock_repo_class.return_value = mock_repo
+        mock_ganntify.return_value = ([], "Title")
+        url_verdicts.clear()
 
-    @patch("src.app.validate_public_url")
+        client.post(
+            "/ganntify_recipe_data",
+            json={"recipe_url": "https://example.com/processed"},
+        )
+
+        assert url_verdicts.get("https://example.com/processed") is True
+
+    @patch("src.app.validate_public_url_async")
     @patch("src.app.RecipeHistoryRepository")
-    @patch("src.app.get_db")
     @patch("src.app.ganntify_recipe", new_callable=AsyncMock)
     def test_saves_to_database(
-        self, mock_ganntify, mock_get_db, mock_repo_class, mock_validate_url, client
+        self, mock_ganntify, mock_repo_class, mock_validate_url, client
     ):
         """Should save recipe to database after processing."""
-        mock_db = MagicMock()
-        mock_get_db.return_value = iter([mock_db])
-
-        mock_repo = MagicMock()
+        mock_repo = AsyncMock()
         mock_repo.get_by_url.return_value = None
         mock_repo_class.return_value = mock_repo
 
@@ -248,18 +565,14 @@ class TestGanntifyRecipeDataEndpoint:
         assert call_kwargs["title"] == "Custom Title"
         assert call_kwargs["snippet"] == "Custom snippet"
 
-    @patch("src.app.validate_public_url")
+    @patch("src.app.validate_public_url_async")
     @patch("src.app.RecipeHistoryRepository")
-    @patch("src.app.get_db")
     @patch("src.app.ganntify_recipe", new_callable=AsyncMock)
     def test_uses_extracted_title_as_fallback(
-        self, mock_ganntify, mock_get_db, mock_repo_class, mock_validate_url, client
+        self, mock_ganntify, mock_repo_class, mock_validate_url, client
     ):
         """Should use extracted title when none provided."""
-        mock_db = MagicMock()
-        mock_get_db.return_value = iter([mock_db])
-
-        mock_repo = MagicMock()
+        mock_repo = AsyncMock()
         mock_repo.get_by_url.return_value = None
         mock_repo_class.return_value = mock_repo
 
@@ -274,18 +587,14 @@ class TestGanntifyRecipeDataEndpoint:
         call_kwargs = mock_repo.upsert.call_args[1]
         assert call_kwargs["title"] == "Extracted Title"
 
-    @patch("src.app.validate_public_url")
+    @patch("src.app.validate_public_url_async")
     @patch("src.app.RecipeHistoryRepository")
-    @patch("src.app.get_db")
     @patch("src.app.ganntify_recipe", new_callable=AsyncMock)
     def test_uses_default_title_when_no_title(
-        self, mock_ganntify, mock_get_db, mock_repo_class, mock_validate_url, client
+        self, mock_ganntify, mock_repo_class, mock_validate_url, client
     ):
         """Should use 'Recipe' as default when no title available."""
-        mock_db = MagicMock()
-        mock_get_db.return_value = iter([mock_db])
-
-        mock_repo = MagicMock()
+        mock_repo = AsyncMock()
         mock_repo.get_by_url.return_value = None
         mock_repo_class.return_value = mock_repo
 
@@ -328,6 +637,116 @@ class TestGanntifyRecipeDataEndpoint:
         assert response.status_code == 422
 
 
+class TestGanntifyRecipeStreamEndpoint:
+    """Tests for POST /ganntify_recipe_data/stream endpoint."""
+
+    @staticmethod
+    def _events(response):
+        events = []
+        for block in response.text.strip().split("\n\n"):
+            event_line, data_line = block.split("\n")
+            events.append(
+                (event_line.removeprefix("event: "), data_line.removeprefix("data: "))
+            )
+        return events
+
+    @patch("src.app.validate_public_url_async")
+    @patch("src.app.RecipeHistoryRepository")
+    @patch("src.app.ganntify_recipe", new_callable=AsyncMock)
+    def test_streams_stages_then_result(
+        self, mock_ganntify, mock_repo_class, mock_validate_url, client
+    ):
+        """Should emit each pipeline stage before the planned steps."""
+        mock_repo_class.return_value = AsyncMock()
+        mock_repo_class.return_value.get_by_url.return_value = None
+
+        mock_step = MagicMock()
+        mock_step.step_id = 1
+        mock_step.name = "Boil water"
+        mock_step.duration_minutes = 10
+        mock_step.dependencies = []
+        mock_step.ingredients = ["water"]
+
+        async def ganntify(url, on_stage=None):
+            on_stage("fetched", {"size_bytes": 10})
+            on_stage("extracted", {"title": "Pasta", "ingredients": "water"})
+            on_stage("graph", {"step_count": 1})
+            return [mock_step], "Pasta"
+
+        mock_ganntify.side_effect = ganntify
+
+        response = client.post(
+            "/ganntify_recipe_data/stream",
+            json={"recipe_url": "https://example.com/recipe"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = self._events(response)
+        assert [name for name, _ in events] == [
+            "fetched",
+            "extracted",
+            "graph",
+            "result",
+        ]
+        assert '"title": "Pasta"' in events[1][1]
+        assert '"step_name": "Boil water"' in events[3][1]
+        mock_repo_class.return_value.upsert.assert_called_once()
+
+    @patch("src.app.validate_public_url_async")
+    @patch("src.app.RecipeHistoryRepository")
+    @patch("src.app.ganntify_recipe", new_callable=AsyncMock)
+    def test_cache_hit_streams_single_result(
+        self, mock_ganntify, mock_repo_class, mock_validate_url, client
+    ):
+        """Should emit only the final event for cached recipes."""
+        mock_cached = MagicMock()
+        mock_cached.planned_steps = [
+            {"step_id": "1", "step_name": "Cached step", "dependencies": []}
+        ]
+        mock_repo_class.return_value = AsyncMock()
+        mock_repo_class.return_value.get_by_url.return_value = mock_cached
+
+        response = client.post(
+            "/ganntify_recipe_data/stream",
+            json={"recipe_url": "https://example.com/recipe"},
+        )
+
+        events = self._events(response)
+        assert [name for name, _ in events] == ["result"]
+        assert "Cached step" in events[0][1]
+        mock_ganntify.assert_not_called()
+
+    @patch("src.app.validate_public_url_async")
+    @patch("src.app.RecipeHistoryRepository")
+    @patch("src.app.ganntify_recipe", new_callable=AsyncMock)
+    def test_streams_error_event(
+        self, mock_ganntify, mock_repo_class, mock_validate_url, client
+    ):
+        """Should end the stream with an error event when processing fails."""
+        mock_repo_class.return_value = AsyncMock()
+        mock_repo_class.return_value.get_by_url.return_value = None
+        mock_ganntify.side_effect = Exception("Test error")
+
+        response = client.post(
+            "/ganntify_recipe_data/stream",
+            json={"recipe_url": "https://example.com/recipe"},
+        )
+
+        events = self._events(response)
+        assert [name for name, _ in events] == ["error"]
+        assert "Failed to process recipe" in events[0][1]
+
+    def test_rejects_private_network_url(self, client):
+        """Should return 400 before streaming for SSRF-prone addresses."""
+        response = client.post(
+            "/ganntify_recipe_data/stream",
+            json={"recipe_url": "http://127.0.0.1/recipe"},
+        )
+
+        assert response.status_code == 400
+
+
 class TestCORSConfiguration:
     """Tests for CORS middleware configuration."""
 
@@ -368,18 +787,14 @@ class TestInputValidation:
         response = client.get("/search_recipes?query=pasta&locale=en&page=101")
         assert response.status_code == 422
 
-    @patch("src.app.validate_public_url")
+    @patch("src.app.validate_public_url_async")
     @patch("src.app.RecipeHistoryRepository")
-    @patch("src.app.get_db")
     @patch("src.app.ganntify_recipe", new_callable=AsyncMock)
     def test_ganntify_error_returns_500(
-        self, mock_ganntify, mock_get_db, mock_repo_class, mock_validate_url, client
+        self, mock_ganntify, mock_repo_class, mock_validate_url, client
     ):
         """Should return 500 when ganntify fails."""
-        mock_db = MagicMock()
-        mock_get_db.return_value = iter([mock_db])
-
-        mock_repo = MagicMock()
+        mock_repo = AsyncMock()
         mock_repo.get_by_url.return_value = None
         mock_repo_class.return_value = mock_repo
 
@@ -406,18 +821,14 @@ class TestModels:
         )
         assert response.status_code == 422
 
-    @patch("src.app.validate_public_url")
+    @patch("src.app.validate_public_url_async")
     @patch("src.app.RecipeHistoryRepository")
-    @patch("src.app.get_db")
     @patch("src.app.ganntify_recipe", new_callable=AsyncMock)
     def test_recipe_url_accepts_http(
-        self, mock_ganntify, mock_get_db, mock_repo_class, mock_validate_url, client
+        self, mock_ganntify, mock_repo_class, mock_validate_url, client
     ):
         """Should accept HTTP URLs."""
-        mock_db = MagicMock()
-        mock_get_db.return_value = iter([mock_db])
-
-        mock_repo = MagicMock()
+        mock_repo = AsyncMock()
         mock_repo.get_by_url.return_value = None
         mock_repo_class.return_value = mock_repo
 
@@ -430,18 +841,14 @@ class TestModels:
         mock_validate_url.assert_called_once_with("http://example.com/recipe")
         assert response.status_code == 200
 
-    @patch("src.app.validate_public_url")
+    @patch("src.app.validate_public_url_async")
     @patch("src.app.RecipeHistoryRepository")
-    @patch("src.app.get_db")
     @patch("src.app.ganntify_recipe", new_callable=AsyncMock)
     def test_recipe_url_accepts_https(
-        self, mock_ganntify, mock_get_db, mock_repo_class, mock_validate_url, client
+        self, mock_ganntify, mock_repo_class, mock_validate_url, client
     ):
         """Should accept HTTPS URLs."""
-        mock_db = MagicMock()
-        mock_get_db.return_value = iter([mock_db])
-
-        mock_repo = MagicMock()
+        mock_repo = AsyncMock()
         mock_repo.get_by_url.return_value = None
         mock_repo_class.return_value = mock_repo
 
@@ -453,3 +860,77 @@ class TestModels:
         )
         mock_validate_url.assert_called_once_with("https://example.com/recipe")
         assert response.status_code == 200
+
+
+class TestLoadUrlVerdicts:
+    """Tests for seeding accessibility verdicts at startup."""
+
+    @patch("src.app.get_async_session_local")
+    @patch("src.app.UrlVerdictRepository")
+    @patch("src.app.RecipeHistoryRepository")
+    def test_seeds_stored_verdicts_and_recipes(
+        self, mock_recipe_repo_class, mock_verdict_repo_class, _
+    ):
+        """Should load stored verdicts and mark processed recipes accessible."""
+        url_verdicts.clear()
+        mock_recipe_repo_class.return_value.get_urls = AsyncMock(
+            return_value=["https://example.com/processed"]
+        )
+        mock_verdict_repo = AsyncMock()
+        mock_verdict_repo.get_live.return_value = [
+            ("https://example.com/blocked", False, datetime.now(UTC) + timedelta(1))
+        ]
+        mock_verdict_repo_class.return_value = mock_verdict_repo
+
+        with patch.object(url_verdicts, "persist", True):
+            asyncio.run(_load_url_verdicts())
+
+        assert url_verdicts.get("https://example.com/processed") is True
+        assert url_verdicts.get("https://example.com/blocked") is False
+        mock_verdict_repo.delete_expired.assert_awaited_once()
+        url_verdicts.clear()
+
+
+class TestMetricsEndpoint:
+    """Tests for GET /metrics endpoint."""
+
+    def test_reports_llm_calls_saved(self, client):
+        """Should count the calls of a shared run once per caller that joined it."""
+
+        async def process(url, cache_key, recipe_url, on_stage=None):
+            await asyncio.sleep(0.01)
+            # A single-call run, say
+            return PipelineRun(steps=[], llm_calls=1)
+
+        async def scenario():
+            recipe_url = RecipeUrl(recipe_url="https://example.com/recipe")
+            await asyncio.gather(
+                *(
+                    _shared_pipeline_run(
+                        "https://example.com/recipe",
+                        "https://example.com/recipe",
+                        recipe_url,
+                    )
+                    for _ in range(3)
+                )
+            )
+
+        with (
+            patch("src.app._process_recipe", side_effect=process),
+            patch.object(coalescing_stats, "llm_calls_saved", 0),
+        ):
+            asyncio.run(scenario())
+            response = client.get("/metrics")
+
+        assert response.status_code == 200
+        pipeline = response.json()["recipe_pipeline"]
+        assert pipeline["llm_calls_saved"] == 2
+
+    def test_reports_event_loop_lag(self, client):
+        """Should report lag percentiles and parse pool usage."""
+        with patch("src.app.loop_lag._recent", [3.0]):
+            response = client.get("/metrics")
+
+        metrics = response.json()
+        assert metrics["event_loop"]["lag_ms_p99"] == 3.0
+        assert "process" in metrics["parse_pool"]
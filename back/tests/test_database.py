@@ -0,0 +1,54 @@
+"""Tests for database.py - connection configuration."""
+
+import asyncio
+from unittest.mock import patch
+
+from src.db.database import (
+    dispose_async_engine,
+    get_async_database_url,
+    get_async_engine,
+    get_database_url,
+    get_lock_engine,
+)
+
+
+class TestGetDatabaseUrl:
+    """Tests for database URL helpers."""
+
+    @patch.dict("os.environ", {"DATABASE_URL": "postgres://u:p@host:5432/db"})
+    def test_normalizes_postgres_scheme(self):
+        """Should rewrite the postgres:// scheme used by some providers."""
+        assert get_database_url() == "postgresql://u:p@host:5432/db"
+
+    @patch.dict("os.environ", {"DATABASE_URL": "postgres://u:p@host:5432/db"})
+    def test_async_url_uses_asyncpg(self):
+        """Should select the asyncpg driver and keep credentials."""
+        assert get_async_database_url() == "postgresql+asyncpg://u:p@host:5432/db"
+
+    @patch.dict(
+        "os.environ", {"DATABASE_URL": "postgresql://u:p@host/db?sslmode=require"}
+    )
+    def test_async_url_translates_sslmode(self):
+        """Should pass libpq's sslmode to asyncpg as ssl."""
+        assert (
+            get_async_database_url() == "postgresql+asyncpg://u:p@host/db?ssl=require"
+        )
+
+
+class TestLockEngine:
+    """Tests for get_lock_engine function."""
+
+    @patch.dict(
+        "os.environ",
+        {"DATABASE_URL": "postgresql://u:p@host/db", "DB_LOCK_POOL_SIZE": "3"},
+    )
+    def test_has_its_own_bounded_pool(self):
+        """Should hold locks on connections the request pool does not count."""
+        try:
+            lock_engine = get_lock_engine()
+
+            assert lock_engine.pool is not get_async_engine().pool
+            assert lock_engine.pool.size() == 3
+            assert lock_engine.pool._max_overflow == 0
+        finally:
+            asyncio.run(dispose_async_engine())
@@ -1,15 +1,20 @@
 """Tests for graph processing - parsing, visiting, and planning."""
 
+import asyncio
 import datetime
+from unittest.mock import AsyncMock, patch
 
 from src.services.graph import (
     PlannedStep,
+    ganntify_recipe,
     parse_recipe_graph,
     plan_steps,
     to_time,
+    use_single_call,
     visit_recipe_graph,
 )
-from src.services.schemas import RecipeGraph
+from src.services.page_text import ParsedPage
+from src.services.schemas import ExtractedRecipe, RecipeGraph
 
 
 class TestParseRecipeGraph:
@@ -229,3 +234,148 @@ class TestPlannedStepDataclass:
             ingredients=[],
         )
         assert step.end_date == datetime.datetime(2000, 1, 1, 1, 30)
+
+
+class TestGanntifyRecipe:
+    """Tests for ganntify_recipe pipeline."""
+
+    @patch("src.services.graph.generate_dependency_graph", new_callable=AsyncMock)
+    @patch("src.services.graph.extract_recipe_from_page", new_callable=AsyncMock)
+    @patch("src.services.graph.load_recipe_page", new_callable=AsyncMock)
+    def test_reports_stages_in_order(
+        self, mock_fetch, mock_extract, mock_generate, sample_recipe_graph_linear_json
+    ):
+        """Should notify each stage with its partial results."""
+        mock_fetch.return_value = (b"<html></html>", ParsedPage(title="", text=""))
+        mock_extract.return_value = ExtractedRecipe(
+            recipe="Do things", ingredients="a, b, c", title="Linear"
+        )
+        mock_generate.return_value = sample_recipe_graph_linear_json
+        stages = []
+
+        planned_steps, title = asyncio.run(
+            ganntify_recipe(
+                "https://example.com/recipe",
+                on_stage=lambda stage, data: stages.append((stage, data)),
+            )
+        )
+
+        assert title == "Linear"
+        assert len(planned_steps) == 3
+        assert stages == [
+            ("fetched", {"size_bytes": 13}),
+            ("extracted", {"title": "Linear", "ingredients": "a, b, c"}),
+            ("graph", {"step_count": 3}),
+        ]
+
+
+SINGLE_CALL_PLAN = """{
+    "title": "Linear",
+    "ingredients": "a, b",
+    "steps": [
+        {"id": 1, "name": "Step 1", "duration": 5, "ingredients": ["a"]},
+        {"id": 2, "name": "Step 2", "duration": null, "ingredients": ["b"]}
+    ],
+    "dependencies": [{"do": 1, "before": 2}]
+}"""
+
+
+@patch("src.services.graph.load_recipe_page", new_callable=AsyncMock)
+@patch("src.services.graph.extract_recipe_from_page", new_callable=AsyncMock)
+@patch("src.services.graph.generate_dependency_graph", new_callable=AsyncMock)
+@patch("src.services.graph.generate_recipe_plan", new_callable=AsyncMock)
+class TestSingleCallPipeline:
+    """Tests for the single-call pipeline mode."""
+
+    @staticmethod
+    def _page(mock_load, recipe=None):
+        page = ParsedPage(title="Page", text="text", recipe=recipe)
+        mock_load.return_value = (b"<html></html>", page)
+
+    @patch("src.services.graph.get_single_call_fraction", return_value=1.0)
+    def test_plans_in_one_call(
+        self, _, mock_plan, mock_generate, mock_extract, mock_load
+    ):
+        """Should build the plan from a single LLM answer."""
+        self._page(mock_load)
+        mock_plan.return_value = SINGLE_CALL_PLAN
+        stages = []
+
+        planned_steps, title = asyncio.run(
+            ganntify_recipe(
+                "https://example.com/recipe",
+                on_stage=lambda stage, data: stages.append((stage, data)),
+            )
+        )
+
+        assert title == "Linear"
+        assert [s.start_time for s in planned_steps] == [0, 5]
+        assert [stage for stage, _ in stages] == ["fetched", "extracted", "graph"]
+        # An answer that cannot be planned must not be cached
+        assert mock_plan.await_args.kwargs["check"] is plan_steps
+        mock_extract.assert_not_awaited()
+        mock_generate.assert_not_awaited()
+
+    @patch("src.services.graph.get_single_call_fraction", return_value=1.0)
+    def test_falls_back_to_two_calls(
+        self,
+        _,
+        mock_plan,
+        mock_generate,
+        mock_extract,
+        mock_load,
+        sample_recipe_graph_linear_json,
+    ):
+        """Should redo an unusable single-call answer in two calls."""
+        self._page(mock_load)
+        mock_plan.return_value = '{"steps": "not a list"}'
+        mock_extract.return_value = ExtractedRecipe(
+            recipe="Do things", ingredients="a", title="Linear"
+        )
+        mock_generate.return_value = sample_recipe_graph_linear_json
+
+        planned_steps, _ = asyncio.run(ganntify_recipe("https://example.com/recipe"))
+
+        assert len(planned_steps) == 3
+        mock_extract.assert_awaited_once()
+        assert mock_generate.await_args.kwargs["check"] is plan_steps
+
+    @patch("src.services.graph.get_single_call_fraction", return_value=1.0)
+    def test_structured_pages_skip_single_call(
+        self,
+        _,
+        mock_plan,
+        mock_generate,
+        mock_extract,
+        mock_load,
+        sample_recipe_graph_linear_json,
+    ):
+        """Should only ask for the graph when the recipe is already known."""
+        recipe = ExtractedRecipe(recipe="Do things", ingredients="a", title="L")
+        self._page(mock_load, recipe=recipe)
+        mock_extract.return_value = recipe
+        mock_generate.return_value = sample_recipe_graph_linear_json
+
+        asyncio.run(ganntify_recipe("https://example.com/recipe"))
+
+        mock_plan.assert_not_awaited()
+        mock_generate.assert_awaited_once()
+
+
+class TestUseSingleCall:
+    """Tests for use_single_call function."""
+
+    @patch("src.services.graph.get_single_call_fraction", return_value=0.0)
+    def test_disabled_by_default(self, _):
+        """Should never pick the single-call path with a zero share."""
+        assert not use_single_call("https://example.com/recipe")
+
+    @patch("src.services.graph.get_single_call_fraction", return_value=0.5)
+    def test_splits_urls_stably(self, _):
+        """Should give each canonical URL a fixed path, splitting by share."""
+        urls = [f"https://example.com/recipe/{i}" for i in range(1000)]
+        picks = [use_single_call(url) for url in urls]
+
+        assert 400 < sum(picks) < 600
+        assert picks == [use_single_call(url) for url in urls]
+        assert use_single_call(urls[0] + "?utm_source=x") == picks[0]
@@ -0,0 +1,63 @@
+"""Tests for hit_tracker.py - write-behind hit counting."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+from src.services.hit_tracker import HitTracker
+
+
+class TestHitTracker:
+    """Tests for HitTracker class."""
+
+    def test_flushes_accumulated_hits_in_one_batch(self):
+        """Should sum hits per key and flush them together."""
+        flush = AsyncMock()
+        tracker = HitTracker(flush)
+        tracker.record("a")
+        tracker.record("a")
+        tracker.record("b", hits=3)
+
+        asyncio.run(tracker.flush())
+
+        flush.assert_awaited_once_with({"a": 2, "b": 3})
+        assert tracker.pending == 0
+        assert tracker.stats.flushed == 5
+        assert tracker.stats.flushes == 1
+
+    def test_skips_empty_flush(self):
+        """Should not call flush when nothing was recorded."""
+        flush = AsyncMock()
+
+        asyncio.run(HitTracker(flush).flush())
+
+        flush.assert_not_awaited()
+
+    def test_keeps_hits_when_flush_fails(self):
+        """Should retry hits from a failed flush with the next batch."""
+        flush = AsyncMock(side_effect=[RuntimeError("db down"), None])
+        tracker = HitTracker(flush)
+        tracker.record("a")
+
+        asyncio.run(tracker.flush())
+        tracker.record("a")
+        asyncio.run(tracker.flush())
+
+        assert flush.await_args_list[-1].args == ({"a": 2},)
+        assert tracker.stats.failures == 1
+        assert tracker.pending == 0
+
+    def test_run_flushes_on_cancel(self):
+        """Should write out pending hits when the flush loop is stopped."""
+        flush = AsyncMock()
+        tracker = HitTracker(flush)
+
+        async def scenario():
+            task = asyncio.ensure_future(tracker.run(interval=3600))
+            await asyncio.sleep(0)
+            tracker.record("a")
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        asyncio.run(scenario())
+
+        flush.assert_awaited_once_with({"a": 1})
@@ -0,0 +1,111 @@
+"""Tests for html_text.py - HTML to text engines."""
+
+import pytest
+
+from src.services.html_text import ENGINES, get_html_text_engine
+
+
+@pytest.fixture(params=sorted(ENGINES))
+def engine(request):
+    """Every engine, each held to the reference behaviour."""
+    return ENGINES[request.param]
+
+
+class TestEngines:
+    """Behaviour shared by every engine."""
+
+    def test_extracts_title_and_body_text(self, engine):
+        """Should read the title and one line per block of the body."""
+        content = engine.extract(
+            b"<html><head><title> Stew </title></head><body><p>Chop</p>\n\n"
+            b"<p>Simmer <b>gently</b></p></body></html>"
+        )
+
+        assert content.title == "Stew"
+        assert content.text == "Chop\nSimmer gently"
+
+    def test_falls_back_to_h1_title(self, engine):
+        """Should use the first heading when the title is empty."""
+        content = engine.extract(
+            b"<html><head><title></title></head><body><h1>Stew</h1></body></html>"
+        )
+
+        assert content.title == "Stew"
+
+    def test_drops_page_chrome(self, engine):
+        """Should leave out scripts, menus, banners, comments and footers."""
+        content = engine.extract(
+            b"<html><body><nav>Home</nav><div id='cookie-banner'>Accept</div>"
+            b"<main><p>Chop</p></main><aside>Related</aside>"
+            b"<section class='comments-area'><p>Yum</p></section>"
+            b"<!-- hidden --><script>var x = 1;</script><footer>About</footer>"
+            b"</body></html>"
+        )
+
+        assert content.text == "Chop"
+
+    def test_keeps_page_wrappers(self, engine):
+        """Should not drop a noise-named wrapper holding the main heading."""
+        content = engine.extract(
+            b"<html><body><div class='has-comments'><h1>Stew</h1><p>Chop</p>"
+            b"<div class='share'>Pin</div></div></body></html>"
+        )
+
+        assert content.text == "Stew\nChop"
+
+    def test_ends_lines_at_breaks(self, engine):
+        """Should end a line at <br> but not at inline tags."""
+        content = engine.extract(
+            b"<html><body><ul><li><b>200 g</b> flour</li><li>salt<br>pepper</li>"
+            b"</ul></body></html>"
+        )
+
+        assert content.text == "200 g flour\nsalt\npepper"
+
+    def test_unclosed_noise_ends_with_parent(self, engine):
+        """Should resume after an unclosed noise section's parent closes."""
+        content = engine.extract(
+            b"<html><body><div><p class='social'>Share</div><p>Chop</p>"
+            b"</body></html>"
+        )
+
+        assert content.text == "Chop"
+
+    def test_collects_json_ld(self, engine):
+        """Should return every JSON-LD block, wherever it is."""
+        content = engine.extract(
+            b'<html><head><script type="application/ld+json">{"a": 1}</script>'
+            b'</head><body><nav><script type="application/ld+json">{"b": 2}'
+            b"</script></nav></body></html>"
+        )
+
+        assert content.json_ld == ('{"a": 1}', '{"b": 2}')
+
+    def test_decodes_declared_charset(self, engine):
+        """Should decode pages in their declared encoding."""
+        content = engine.extract(
+            '<html><head><meta charset="iso-8859-1"><title>Crème brûlée</title>'
+            "</head><body><p>Préchauffer</p></body></html>".encode("iso-8859-1")
+        )
+
+        assert content.title == "Crème brûlée"
+        assert content.text == "Préchauffer"
+
+    def test_empty_page(self, engine):
+        """Should return nothing for an empty page."""
+        content = engine.extract(b"")
+
+        assert (content.title, content.text, content.json_ld) == ("", "", ())
+
+
+class TestGetHtmlTextEngine:
+    """Tests for get_html_text_engine function."""
+
+    def test_returns_named_engine(self):
+        """Should look engines up by name."""
+        assert get_html_text_engine("streaming").name == "streaming"
+
+    def test_rejects_unknown_engine(self):
+        """Should name the choices for an unknown engine."""
+        with pytest.raises(ValueError, match="lxml"):
+            get_html_text_engine("regex")
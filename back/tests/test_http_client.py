@@ -0,0 +1,85 @@
+"""Tests for the shared outbound HTTP client."""
+
+import asyncio
+from unittest.mock import patch
+
+from src.services import http_client
+from src.services.http_client import (
+    close_http_client,
+    create_http_client,
+    get_http_client,
+    host_slot,
+)
+
+
+class TestSharedClient:
+    """Tests for the shared client lifecycle."""
+
+    def test_reuses_client(self):
+        """Should hand out the same client until it is closed."""
+        client = get_http_client()
+        try:
+            assert get_http_client() is client
+        finally:
+            asyncio.run(close_http_client())
+
+        assert http_client._client is None
+
+    @patch.dict("os.environ", {"HTTP_MAX_CONNECTIONS": "7"})
+    def test_uses_configured_limits(self):
+        """Should read pool limits from the environment."""
+        client = create_http_client()
+        try:
+            pool = client._transport._pool
+            assert pool._max_connections == 7
+            assert client.follow_redirects is False
+            assert "br" in client.headers["accept-encoding"]
+        finally:
+            asyncio.run(client.aclose())
+
+
+class TestHostSlot:
+    """Tests for host_slot per-host concurrency cap."""
+
+    @patch.dict("os.environ", {"HTTP_MAX_CONNECTIONS_PER_HOST": "2"})
+    def test_caps_concurrency_per_host(self):
+        """Should not run more than the per-host cap against one host."""
+        active = 0
+        peak = 0
+
+        async def fetch(url):
+            nonlocal active, peak
+            async with host_slot(url):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        async def run():
+            await asyncio.gather(*(fetch(f"https://a.com/{i}") for i in range(5)))
+
+        asyncio.run(run())
+
+        assert peak == 2
+        assert http_client._host_slots == {}
+
+    @patch.dict("os.environ", {"HTTP_MAX_CONNECTIONS_PER_HOST": "1"})
+    def test_hosts_are_independent(self):
+        """Should not make different hosts wait on each other."""
+        active = 0
+        peak = 0
+
+        async def fetch(url):
+            nonlocal active, peak
+            async with host_slot(url):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        async def run():
+            await asyncio.gather(fetch("https://a.com/"), fetch("https://b.com/"))
+
+        asyncio.run(run())
+
+        assert peak == 2
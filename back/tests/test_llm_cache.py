@@ -0,0 +1,120 @@
+"""Tests for llm_cache.py - content-addressed LLM answers."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.services.llm_cache import LlmResultCache, stage_key
+
+
+def _cache(maxsize=10):
+    return LlmResultCache(maxsize=maxsize, ttl=60.0)
+
+
+class TestStageKey:
+    """Tests for stage_key function."""
+
+    def test_same_inputs_same_key(self):
+        """Should be stable for identical calls."""
+        assert stage_key("graph", "P", "m", "a", "b") == stage_key(
+            "graph", "P", "m", "a", "b"
+        )
+
+    def test_every_part_changes_key(self):
+        """Should differ when the stage, prompt, model or any input differs."""
+        base = stage_key("graph", "P", "m", "a", "b")
+        variants = [
+            stage_key("plan", "P", "m", "a", "b"),
+            stage_key("graph", "P2", "m", "a", "b"),
+            stage_key("graph", "P", "m2", "a", "b"),
+            stage_key("graph", "P", "m", "a", "c"),
+        ]
+
+        assert base not in variants
+
+    def test_inputs_are_not_concatenated(self):
+        """Should not confuse inputs whose concatenations are equal."""
+        assert stage_key("graph", "P", "m", "ab", "c") != stage_key(
+            "graph", "P", "m", "a", "bc"
+        )
+
+
+class TestLlmResultCache:
+    """Tests for LlmResultCache class."""
+
+    def test_computes_once_per_key(self):
+        """Should serve a repeated key from memory."""
+        cache = _cache()
+        compute = AsyncMock(return_value="{}")
+
+        asyncio.run(cache.get_or_compute("graph", "k", compute))
+        result = asyncio.run(cache.get_or_compute("graph", "k", compute))
+
+        assert result == "{}"
+        compute.assert_awaited_once()
+        assert cache.stats["graph"].misses == 1
+        assert cache.stats["graph"].memory_hits == 1
+
+    def test_reads_persistent_store_on_memory_miss(self):
+        """Should use the stored answer and keep it in memory."""
+        cache = _cache()
+        load = AsyncMock(return_value='{"stored": true}')
+        save = AsyncMock()
+        cache.persist_with(load, save)
+        compute = AsyncMock()
+
+        result = asyncio.run(cache.get_or_compute("extract", "k", compute))
+        asyncio.run(cache.get_or_compute("extract", "k", compute))
+
+        assert result == '{"stored": true}'
+        compute.assert_not_awaited()
+        load.assert_awaited_once_with("k")
+        save.assert_not_awaited()
+        assert cache.stats["extract"].store_hits == 1
+
+    def test_saves_new_answers(self):
+        """Should write computed answers to the persistent store."""
+        cache = _cache()
+        save = AsyncMock()
+        cache.persist_with(AsyncMock(return_value=None), save)
+
+        asyncio.run(cache.get_or_compute("plan", "k", AsyncMock(return_value="{}")))
+
+        save.assert_awaited_once_with("k", "plan", "{}")
+
+    def test_store_errors_are_not_fatal(self):
+        """Should compute and answer when the store cannot be read or written."""
+        cache = _cache()
+        cache.persist_with(
+            AsyncMock(side_effect=RuntimeError("db down")),
+            AsyncMock(side_effect=RuntimeError("db down")),
+        )
+
+        result = asyncio.run(
+            cache.get_or_compute("graph", "k", AsyncMock(return_value="{}"))
+        )
+
+        assert result == "{}"
+        assert cache.stats["graph"].store_errors == 2
+
+    def test_failed_compute_is_not_cached(self):
+        """Should retry a key whose computation raised."""
+        cache = _cache()
+        compute = AsyncMock(side_effect=[ValueError("bad answer"), "{}"])
+
+        with pytest.raises(ValueError):
+            asyncio.run(cache.get_or_compute("graph", "k", compute))
+
+        assert asyncio.run(cache.get_or_compute("graph", "k", compute)) == "{}"
+
+    def test_memory_tier_can_be_disabled(self):
+        """Should go to the store every time with maxsize 0."""
+        cache = _cache(maxsize=0)
+        load = AsyncMock(return_value="{}")
+        cache.persist_with(load, AsyncMock())
+
+        asyncio.run(cache.get_or_compute("graph", "k", AsyncMock()))
+        asyncio.run(cache.get_or_compute("graph", "k", AsyncMock()))
+
+        assert load.await_count == 2
@@ -0,0 +1,130 @@
+"""Tests for locks.py - cross-worker advisory locks."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.db.locks import advisory_lock_key, run_with_claim, try_advisory_lock
+
+
+class TestAdvisoryLockKey:
+    """Tests for advisory_lock_key function."""
+
+    def test_is_deterministic(self):
+        """Should map the same name to the same key in every process."""
+        assert advisory_lock_key("a") == advisory_lock_key("a")
+        assert advisory_lock_key("a") != advisory_lock_key("b")
+
+    def test_fits_signed_bigint(self):
+        """Should stay within the bigint range accepted by Postgres."""
+        key = advisory_lock_key("https://example.com/recipe")
+        assert -(2**63) <= key < 2**63
+
+
+class TestTryAdvisoryLock:
+    """Tests for try_advisory_lock context manager."""
+
+    @staticmethod
+    def _connection(mock_get_engine, acquired):
+        conn = AsyncMock()
+        conn.execute.return_value = MagicMock()
+        conn.execute.return_value.scalar.return_value = acquired
+        mock_get_engine.return_value.connect.return_value.__aenter__.return_value = conn
+        return conn
+
+    @staticmethod
+    async def _hold(name):
+        async with try_advisory_lock(name) as acquired:
+            return acquired
+
+    @patch("src.db.locks.get_lock_engine")
+    def test_releases_acquired_lock(self, mock_get_engine):
+        """Should unlock on the same connection that took the lock."""
+        conn = self._connection(mock_get_engine, True)
+
+        assert asyncio.run(self._hold("name")) is True
+
+        statements = [str(c.args[0]) for c in conn.execute.call_args_list]
+        assert statements == [
+            "SELECT pg_try_advisory_lock(:key)",
+            "SELECT pg_advisory_unlock(:key)",
+        ]
+
+    @patch("src.db.locks.get_lock_engine")
+    def test_does_not_unlock_when_not_acquired(self, mock_get_engine):
+        """Should not release a lock held by another worker."""
+        conn = self._connection(mock_get_engine, False)
+
+        assert asyncio.run(self._hold("name")) is False
+
+        assert conn.execute.call_count == 1
+
+
+def _lock_results(*results):
+    """Patch try_advisory_lock to yield the given results on successive calls."""
+    lock = MagicMock()
+    lock.return_value.__aenter__.side_effect = list(results)
+    return patch("src.db.locks.try_advisory_lock", lock)
+
+
+class TestRunWithClaim:
+    """Tests for run_with_claim function."""
+
+    def test_computes_when_claim_acquired(self):
+        """Should compute when no other worker holds the claim."""
+        compute = AsyncMock(return_value="computed")
+        lookup = AsyncMock(return_value=None)
+
+        with _lock_results(True):
+            result = asyncio.run(run_with_claim("name", compute, lookup))
+
+        assert result == "computed"
+        compute.assert_awaited_once()
+
+    def test_reuses_result_stored_before_claim(self):
+        """Should not recompute when the result appeared before the claim."""
+        compute = AsyncMock()
+        lookup = AsyncMock(return_value="stored")
+
+        with _lock_results(True):
+            result = asyncio.run(run_with_claim("name", compute, lookup))
+
+        assert result == "stored"
+        compute.assert_not_awaited()
+
+    def test_waits_for_other_worker(self):
+        """Should poll for the other worker's result instead of recomputing."""
+        compute = AsyncMock()
+        lookup = AsyncMock(side_effect=[None, "stored"])
+
+        with _lock_results(False, False):
+            result = asyncio.run(
+                run_with_claim("name", compute, lookup, poll_interval=0)
+            )
+
+        assert result == "stored"
+        compute.assert_not_awaited()
+
+    def test_takes_over_when_holder_gives_up(self):
+        """Should compute once the previous holder released without a result."""
+        compute = AsyncMock(return_value="computed")
+        lookup = AsyncMock(return_value=None)
+
+        with _lock_results(False, True):
+            result = asyncio.run(
+                run_with_claim("name", compute, lookup, poll_interval=0)
+            )
+
+        assert result == "computed"
+        compute.assert_awaited_once()
+
+    def test_computes_after_wait_timeout(self):
+        """Should fall back to computing when the holder takes too long."""
+        compute = AsyncMock(return_value="computed")
+        lookup = AsyncMock(return_value=None)
+
+        with _lock_results(False):
+            result = asyncio.run(
+                run_with_claim("name", compute, lookup, wait_timeout=0)
+            )
+
+        assert result == "computed"
@@ -0,0 +1,50 @@
+"""Tests for loop_monitor.py - event loop lag sampling."""
+
+import asyncio
+import time
+
+from src.services.loop_monitor import LoopLagMonitor
+
+
+class TestLoopLagMonitor:
+    """Tests for LoopLagMonitor class."""
+
+    def test_records_lag_statistics(self):
+        """Should count samples, slow samples, total and max lag."""
+        monitor = LoopLagMonitor(interval=0.1, slow_ms=50.0)
+
+        for lag_ms in (1.0, 2.0, 80.0):
+            monitor.record(lag_ms)
+
+        assert monitor.stats.samples == 3
+        assert monitor.stats.slow == 1
+        assert monitor.stats.lag_ms_total == 83.0
+        assert monitor.stats.lag_ms_max == 80.0
+
+    def test_percentiles_cover_recent_window(self):
+        """Should compute percentiles over the last window samples only."""
+        monitor = LoopLagMonitor(interval=0.1, window=10)
+
+        assert monitor.percentile(0.5) is None
+        monitor.record(500.0)
+        for lag_ms in range(10):
+            monitor.record(float(lag_ms))
+
+        assert monitor.percentile(0.5) == 5.0
+        assert monitor.percentile(0.99) == 9.0
+        assert monitor.stats.lag_ms_max == 500.0
+
+    def test_run_sees_blocked_loop(self):
+        """Should measure a blocking call as lag."""
+        monitor = LoopLagMonitor(interval=0.01)
+
+        async def scenario():
+            sampler = asyncio.create_task(monitor.run())
+            await asyncio.sleep(0.005)
+            time.sleep(0.1)
+            await asyncio.sleep(0.02)
+            sampler.cancel()
+
+        asyncio.run(scenario())
+
+        assert monitor.stats.lag_ms_max >= 50.0
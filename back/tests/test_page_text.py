@@ -0,0 +1,119 @@
+"""Tests for page_text.py - text extraction from recipe pages."""
+
+import json
+from unittest.mock import patch
+
+from src.services.html_text import PageContent
+from src.services.page_text import parse_recipe_page
+
+
+class TestParseRecipePage:
+    """Tests for parse_recipe_page function."""
+
+    def test_extracts_title_and_body_text(self):
+        """Should read the title and collapse blank lines in the body."""
+        page = parse_recipe_page(
+            b"<html><title> Stew </title><body><p>Chop</p>\n\n<p>Simmer</p></body>"
+        )
+
+        assert page.title == "Stew"
+        assert page.text == "Chop\nSimmer"
+        assert page.recipe is None
+
+    def test_falls_back_to_h1_title(self):
+        """Should use the first heading when there is no title."""
+        page = parse_recipe_page(b"<html><body><h1>Stew</h1></body></html>")
+
+        assert page.title == "Stew"
+
+    def test_reads_structured_recipe(self):
+        """Should attach structured data, titled from the page if unnamed."""
+        data = json.dumps(
+            {
+                "@type": "Recipe",
+                "recipeIngredient": ["1 onion"],
+                "recipeInstructions": "Chop.",
+            }
+        )
+        page = parse_recipe_page(
+            f'<html><title>Stew</title><script type="application/ld+json">{data}'
+            "</script><body></body></html>".encode()
+        )
+
+        assert page.recipe.recipe == "Chop."
+        assert page.recipe.title == "Stew"
+
+    def test_drops_page_chrome(self):
+        """Should leave out scripts, menus, banners, comments and footers."""
+        page = parse_recipe_page(
+            b"<html><body><nav>Home</nav><div id='cookie-banner'>Accept</div>"
+            b"<main><p>Chop</p></main><aside>Related</aside>"
+            b"<section class='comments-area'><p>Yum</p></section>"
+            b"<script>var x = 1;</script><footer>About</footer></body></html>"
+        )
+
+        assert page.text == "Chop"
+
+    def test_keeps_page_wrappers(self):
+        """Should not drop a noise-named wrapper holding the main heading."""
+        page = parse_recipe_page(
+            b"<html><body><div class='has-comments'><h1>Stew</h1><p>Chop</p>"
+            b"</div></body></html>"
+        )
+
+        assert page.text == "Stew\nChop"
+
+    def test_splits_minified_blocks_into_lines(self):
+        """Should end a line at every block and break, but not inline tags."""
+        page = parse_recipe_page(
+            b"<html><body><ul><li><b>200 g</b> flour</li><li>salt<br>pepper</li>"
+            b"</ul><p>Mix.</p></body></html>"
+        )
+
+        assert page.text == "200 g flour\nsalt\npepper\nMix."
+
+    def test_reads_microdata_recipe(self):
+        """Should fall back to schema.org microdata."""
+        page = parse_recipe_page(
+            b'<html><body><div itemscope itemtype="https://schema.org/Recipe">'
+            b'<h1 itemprop="name">Stew</h1><li itemprop="recipeIngredient">1 onion'
+            b'</li><p itemprop="recipeInstructions">Chop.</p></div></body></html>'
+        )
+
+        assert page.recipe.title == "Stew"
+        assert page.recipe.ingredients == "1 onion"
+
+    def test_prefers_json_ld_to_microdata(self):
+        """Should use JSON-LD when a page has both."""
+        data = json.dumps(
+            {
+                "@type": "Recipe",
+                "name": "Carbonara",
+                "recipeIngredient": ["400g spaghetti"],
+                "recipeInstructions": "Boil.",
+            }
+        )
+        page = parse_recipe_page(
+            f'<html><script type="application/ld+json">{data}</script><body>'
+            '<div itemscope itemtype="https://schema.org/Recipe">'
+            '<span itemprop="name">Other</span><li itemprop="recipeIngredient">'
+            'x</li><p itemprop="recipeInstructions">y</p></div></body>'
+            "</html>".encode()
+        )
+
+        assert page.recipe.title == "Carbonara"
+
+    def test_uses_given_engine(self):
+        """Should extract with the given engine instead of the configured one."""
+
+        class StubEngine:
+            name = "stub"
+
+            def extract(self, html_content):
+                return PageContent(title="Stew", text="Chop")
+
+        with patch("src.services.page_text.get_html_text_engine") as get_engine:
+            page = parse_recipe_page(b"<html></html>", engine=StubEngine())
+
+        assert (page.title, page.text) == ("Stew", "Chop")
+        get_engine.assert_not_called()
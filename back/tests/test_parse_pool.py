@@ -0,0 +1,86 @@
+"""Tests for parse_pool.py - page parsing off the event loop."""
+
+import asyncio
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+
+import pytest
+
+from src.services import parse_pool
+from src.services.parse_pool import (
+    close_parse_pool,
+    parse_page,
+    parse_pool_stats,
+    start_parse_pool,
+    warm_parse_pool,
+)
+
+PAGE = b"<html><title>Stew</title><body><p>Chop</p></body></html>"
+
+
+class BrokenExecutor(Executor):
+    """Executor whose workers have all died."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = Future()
+        future.set_exception(BrokenProcessPool("worker died"))
+        return future
+
+
+@pytest.fixture(autouse=True)
+def no_pool():
+    """Start and end each test without a pool."""
+    asyncio.run(close_parse_pool())
+    yield
+    asyncio.run(close_parse_pool())
+
+
+class TestParsePage:
+    """Tests for parse_page function."""
+
+    def test_parses_in_thread_without_pool(self):
+        """Should parse in a thread when no pool was started."""
+        thread_before = parse_pool_stats.thread
+
+        page = asyncio.run(parse_page(PAGE))
+
+        assert (page.title, page.text) == ("Stew", "Chop")
+        assert parse_pool_stats.thread == thread_before + 1
+
+    def test_parses_in_worker_process(self):
+        """Should parse in the pool once started, and stop it on close."""
+        process_before = parse_pool_stats.process
+        start_parse_pool(1)
+
+        async def scenario():
+            await warm_parse_pool()
+            return await parse_page(PAGE)
+
+        page = asyncio.run(scenario())
+
+        assert (page.title, page.text) == ("Stew", "Chop")
+        assert parse_pool_stats.process == process_before + 2
+        asyncio.run(close_parse_pool())
+        assert parse_pool._pool is None
+
+    def test_zero_workers_keeps_thread(self):
+        """Should not start processes with 0 workers."""
+        start_parse_pool(0)
+
+        assert parse_pool._pool is None
+
+    def test_broken_pool_falls_back_and_restarts(self):
+        """Should parse in a thread and replace a pool whose worker died."""
+        restarts_before = parse_pool_stats.restarts
+        broken = BrokenExecutor()
+
+        with (
+            patch.object(parse_pool, "_pool", broken),
+            patch.object(parse_pool, "_workers", 0),
+        ):
+            page = asyncio.run(parse_page(PAGE))
+            assert parse_pool._pool is None
+
+        assert page.text == "Chop"
+        assert parse_pool_stats.restarts == restarts_before + 1
@@ -1,16 +1,29 @@
 """Tests for repository.py - database operations."""
 
-from unittest.mock import MagicMock
+import asyncio
+import math
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from sqlalchemy.dialects import postgresql
 
-from src.db.repository import RecipeHistoryRepository
+from src.db.repository import (
+    POPULARITY_EPOCH,
+    POPULARITY_HALF_LIFE,
+    LlmResultRepository,
+    RecipeHistoryRepository,
+    UrlVerdictRepository,
+    popularity_weight,
+)
 
 
 @pytest.fixture
 def mock_db():
-    """Create a mock database session."""
-    return MagicMock()
+    """Create a mock async database session."""
+    db = AsyncMock()
+    db.add = MagicMock()
+    db.execute.return_value = MagicMock()
+    return db
 
 
 @pytest.fixture
@@ -19,6 +32,10 @@ def repo(mock_db):
     return RecipeHistoryRepository(mock_db)
 
 
+def _returns_row(mock_db, row):
+    mock_db.execute.return_value.scalar_one_or_none.return_value = row
+
+
 class TestGetByUrl:
     """Tests for get_by_url method."""
 
@@ -26,17 +43,17 @@ class TestGetByUrl:
         """Should return recipe when URL exists."""
         mock_recipe = MagicMock()
         mock_recipe.url = "https://example.com/recipe"
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_recipe
+        _returns_row(mock_db, mock_recipe)
 
-        result = repo.get_by_url("https://example.com/recipe")
+        result = asyncio.run(repo.get_by_url("https://example.com/recipe"))
 
         assert result == mock_recipe
 
     def test_returns_none_when_not_found(self, repo, mock_db):
         """Should return None when URL not found."""
-        mock_db.query.return_value.filter.return_value.first.return_value = None
+        _returns_row(mock_db, None)
 
-        result = repo.get_by_url("https://example.com/nonexistent")
+        result = asyncio.run(repo.get_by_url("https://example.com/nonexistent"))
 
         assert result is None
 
@@ -44,97 +61,238 @@ class TestGetByUrl:
 class TestUpsert:
     """Tests for upsert method."""
 
-    def test_inserts_new_recipe(self, repo, mock_db):
-        """Should insert new recipe when URL not in database."""
-        mock_db.query.return_value.filter.return_value.first.return_value = None
+    def test_upserts_in_one_statement(self, repo, mock_db):
+        """Should insert or update with a single ON CONFLICT statement."""
+        mock_recipe = MagicMock()
+        mock_db.execute.return_value.scalar_one.return_value = mock_recipe
 
         steps = [{"step_id": "1", "step_name": "Test step"}]
-        repo.upsert(
-            url="https://example.com/new",
-            title="New Recipe",
-            snippet="A snippet",
-            planned_steps=steps,
+        result = asyncio.run(
+            repo.upsert(
+                url="https://example.com/new",
+                title="New Recipe",
+                snippet="A snippet",
+                planned_steps=steps,
+            )
         )
 
-        mock_db.add.assert_called_once()
-        mock_db.commit.assert_called()
+        assert result == mock_recipe
+        mock_db.execute.assert_awaited_once()
+        mock_db.commit.assert_awaited_once()
+        mock_db.add.assert_not_called()
+        mock_db.refresh.assert_not_awaited()
+
+    def test_updates_content_on_conflict(self, repo, mock_db):
+        """Should overwrite content and bump updated_at for an existing URL."""
+        asyncio.run(
+            repo.upsert(
+                url="https://example.com/existing",
+                title="Updated Recipe",
+                snippet="Updated snippet",
+                planned_steps=[],
+            )
+        )
 
-    def test_updates_existing_recipe(self, repo, mock_db):
-        """Should update existing recipe when URL exists."""
-        mock_recipe = MagicMock()
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_recipe
-
-        steps = [{"step_id": "1", "step_name": "Updated step"}]
-        repo.upsert(
-            url="https://example.com/existing",
-            title="Updated Recipe",
-            snippet="Updated snippet",
-            planned_steps=steps,
+        query = str(
+            mock_db.execute.call_args.args[0].compile(dialect=postgresql.dialect())
         )
+        assert "ON CONFLICT (url) DO UPDATE SET" in query
+        assert "title = excluded.title" in query
+        assert "planned_steps = excluded.planned_steps" in query
+        assert "updated_at = now()" in query
+        assert "RETURNING" in query
 
-        assert mock_recipe.title == "Updated Recipe"
-        assert mock_recipe.snippet == "Updated snippet"
-        assert mock_recipe.planned_steps == steps
-        mock_db.commit.assert_called()
-        # Should not call add for existing recipe
-        mock_db.add.assert_not_called()
 
+class TestRecordHits:
+    """Tests for record_hits method."""
 
-class TestTouch:
-    """Tests for touch method."""
+    def test_updates_all_recipes_in_one_executemany(self, repo, mock_db):
+        """Should send one parameter set per recipe in a single call."""
+        asyncio.run(repo.record_hits({"https://a.com/r": 2, "https://b.com/r": 1}))
 
-    def test_updates_timestamp_when_found(self, repo, mock_db):
-        """Should update updated_at when recipe found."""
-        mock_recipe = MagicMock()
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_recipe
+        mock_db.execute.assert_awaited_once()
+        statement, params = mock_db.execute.call_args.args
+        assert str(statement).startswith("UPDATE recipe_history SET")
+        assert [(p["hit_url"], p["hits"]) for p in params] == [
+            ("https://a.com/r", 2),
+            ("https://b.com/r", 1),
+        ]
+        mock_db.commit.assert_awaited_once()
+
+    def test_accumulates_count_and_score(self, repo, mock_db):
+        """Should add to hit_count and log-sum the popularity score."""
+        asyncio.run(repo.record_hits({"https://a.com/r": 1}))
 
-        result = repo.touch("https://example.com/recipe")
+        query = str(mock_db.execute.call_args.args[0])
+        assert "hit_count=(recipe_history.hit_count + :hits)" in query
+        assert "popularity_score=(greatest(" in query
 
-        assert result is True
-        mock_db.commit.assert_called()
-        assert mock_recipe.updated_at is not None
 
-    def test_returns_false_when_not_found(self, repo, mock_db):
-        """Should return False when recipe not found."""
-        mock_db.query.return_value.filter.return_value.first.return_value = None
+class TestPopularityWeight:
+    """Tests for popularity_weight function."""
 
-        result = repo.touch("https://example.com/nonexistent")
+    def test_doubles_every_half_life(self):
+        """Should weigh a hit one half-life later twice as much."""
+        later = POPULARITY_EPOCH + POPULARITY_HALF_LIFE
 
-        assert result is False
+        difference = popularity_weight(1, later) - popularity_weight(
+            1, POPULARITY_EPOCH
+        )
+
+        assert difference == pytest.approx(math.log(2))
+
+    def test_scales_with_hits(self):
+        """Should weigh n simultaneous hits n times one hit."""
+        difference = popularity_weight(4, POPULARITY_EPOCH) - popularity_weight(
+            1, POPULARITY_EPOCH
+        )
+
+        assert difference == pytest.approx(math.log(4))
 
 
 class TestGetPopular:
     """Tests for get_popular method."""
 
-    def test_returns_recipes_ordered_by_updated_at(self, repo, mock_db):
-        """Should return recipes ordered by updated_at descending."""
+    def test_returns_recipes_ordered_by_popularity(self, repo, mock_db):
+        """Should return recipes ordered by popularity score descending."""
         mock_recipes = [MagicMock(), MagicMock()]
-        mock_db.query.return_value.order_by.return_value.limit.return_value.all.return_value = (
-            mock_recipes
-        )
+        mock_db.execute.return_value.all.return_value = mock_recipes
 
-        result = repo.get_popular(limit=10)
+        result = asyncio.run(repo.get_popular(limit=10))
 
         assert result == mock_recipes
+        query = str(mock_db.execute.call_args.args[0])
+        assert "ORDER BY recipe_history.popularity_score DESC" in query
+
+    def test_reads_only_listed_columns(self, repo, mock_db):
+        """Should not load the planned_steps document."""
+        mock_db.execute.return_value.all.return_value = []
+
+        asyncio.run(repo.get_popular())
+
+        query = str(mock_db.execute.call_args.args[0])
+        assert query.startswith(
+            "SELECT recipe_history.title, recipe_history.url, recipe_history.snippet"
+        )
+        assert "planned_steps" not in query
 
     def test_respects_limit(self, repo, mock_db):
         """Should respect the limit parameter."""
-        mock_db.query.return_value.order_by.return_value.limit.return_value.all.return_value = (
-            []
-        )
+        mock_db.execute.return_value.all.return_value = []
 
-        repo.get_popular(limit=5)
+        asyncio.run(repo.get_popular(limit=5))
 
-        mock_db.query.return_value.order_by.return_value.limit.assert_called_once_with(
-            5
-        )
+        query = mock_db.execute.call_args.args[0]
+        assert query._limit == 5
 
     def test_returns_empty_list_when_no_recipes(self, repo, mock_db):
         """Should return empty list when no recipes."""
-        mock_db.query.return_value.order_by.return_value.limit.return_value.all.return_value = (
-            []
-        )
+        mock_db.execute.return_value.all.return_value = []
 
-        result = repo.get_popular()
+        result = asyncio.run(repo.get_popular())
 
         assert result == []
+
+
+class TestGetUrls:
+    """Tests for get_urls method."""
+
+    def test_returns_urls(self, repo, mock_db):
+        """Should read only the url column."""
+        mock_db.execute.return_value.scalars.return_value.all.return_value = [
+            "https://example.com/recipe"
+        ]
+
+        result = asyncio.run(repo.get_urls())
+
+        assert result == ["https://example.com/recipe"]
+        query = str(mock_db.execute.call_args.args[0])
+        assert query.startswith("SELECT recipe_history.url \nFROM")
+
+
+class TestGetPlannedUrls:
+    """Tests for get_planned_urls and get_many methods."""
+
+    def test_binds_urls_as_one_array(self, repo, mock_db):
+        """Should match every URL with a single = ANY(array) parameter."""
+        mock_db.execute.return_value.scalars.return_value.all.return_value = [
+            "https://example.com/a"
+        ]
+
+        result = asyncio.run(
+            repo.get_planned_urls(["https://example.com/a", "https://example.com/b"])
+        )
+
+        assert result == {"https://example.com/a"}
+        query = mock_db.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+        assert "recipe_history.url = ANY (%(urls)s::VARCHAR[])" in str(query)
+        assert query.params["urls"] == [
+            "https://example.com/a",
+            "https://example.com/b",
+        ]
+
+    def test_get_many_reads_plans_in_one_query(self, repo, mock_db):
+        """Should read url, title and planned_steps of every match at once."""
+        rows = [MagicMock()]
+        mock_db.execute.return_value.all.return_value = rows
+
+        result = asyncio.run(repo.get_many(["https://example.com/a"]))
+
+        assert result == rows
+        mock_db.execute.assert_awaited_once()
+        query = str(mock_db.execute.call_args.args[0])
+        assert query.startswith(
+            "SELECT recipe_history.url, recipe_history.title, "
+            "recipe_history.planned_steps"
+        )
+
+
+class TestUrlVerdictRepository:
+    """Tests for UrlVerdictRepository class."""
+
+    def test_save_many_upserts_in_one_executemany(self, mock_db):
+        """Should insert or replace every verdict in a single call."""
+        expires_at = POPULARITY_EPOCH
+        verdicts = {"https://a.com/r": (True, expires_at)}
+
+        asyncio.run(UrlVerdictRepository(mock_db).save_many(verdicts))
+
+        statement, params = mock_db.execute.call_args.args
+        query = str(statement.compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (url) DO UPDATE SET" in query
+        assert params == [
+            {"url": "https://a.com/r", "accessible": True, "expires_at": expires_at}
+        ]
+        mock_db.commit.assert_awaited_once()
+
+    def test_get_live_skips_expired(self, mock_db):
+        """Should only read verdicts that have not expired."""
+        mock_db.execute.return_value.all.return_value = []
+
+        asyncio.run(UrlVerdictRepository(mock_db).get_live())
+
+        query = str(mock_db.execute.call_args.args[0])
+        assert "WHERE url_verdicts.expires_at > now()" in query
+
+
+class TestLlmResultRepository:
+    """Tests for LlmResultRepository class."""
+
+    def test_get_reads_result_by_key(self, mock_db):
+        """Should return the stored answer for a key."""
+        mock_db.execute.return_value.scalar_one_or_none.return_value = '{"a": 1}'
+
+        result = asyncio.run(LlmResultRepository(mock_db).get("abc"))
+
+        assert result == '{"a": 1}'
+        query = str(mock_db.execute.call_args.args[0])
+        assert "WHERE llm_results.key = " in query
+
+    def test_save_keeps_existing_answer(self, mock_db):
+        """Should insert the answer and ignore a concurrent duplicate."""
+        asyncio.run(LlmResultRepository(mock_db).save("abc", "graph", "{}"))
+
+        statement = mock_db.execute.call_args.args[0]
+        query = str(statement.compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (key) DO NOTHING" in query
+        mock_db.commit.assert_awaited_once()
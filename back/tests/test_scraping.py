@@ -1,93 +1,251 @@
 """Tests for web scraping utilities."""
 
-import time
-from unittest.mock import MagicMock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
+import pytest
+import respx
+
+from src.services.http_client import close_http_client
+from src.services.prefetch import prefetched_pages, take_prefetched_page
 from src.services.scraping import (
     can_fetch_content,
     filter_accessible_urls,
     get_website_text,
     is_blacklisted_domain,
+    prefetch_downloads,
+    url_verdicts,
 )
 
 
+@pytest.fixture(autouse=True)
+def empty_url_verdicts():
+    """Start each test without cached accessibility verdicts or pages."""
+    url_verdicts.clear()
+    prefetched_pages.clear()
+    yield
+    url_verdicts.clear()
+    prefetched_pages.clear()
+
+
+@pytest.fixture(autouse=True)
+def shared_client():
+    """Give each test a fresh shared client bound to its own event loop."""
+    yield
+    asyncio.run(close_http_client())
+
+
+def _check(url="https://example.com/recipe", prefetch=False):
+    async def check():
+        accessible = await can_fetch_content(url, prefetch)
+        await asyncio.gather(*prefetch_downloads)
+        return accessible
+
+    return asyncio.run(check())
+
+
+LONG_CONTENT = "This is a valid recipe page with lots of content about cooking. " * 10
+
+
 class TestCanFetchContent:
     """Tests for can_fetch_content function."""
 
-    @patch("src.services.scraping.requests.get")
-    def test_successful_fetch(self, mock_get):
+    @pytest.fixture(autouse=True)
+    def mock_validate(self):
+        """Mock HTTP responses and skip DNS-based URL validation."""
+        with (
+            respx.mock,
+            patch("src.services.scraping.validate_public_url_async") as mock,
+        ):
+            yield mock
+
+    @staticmethod
+    def _page(body, status_code=200):
+        respx.get("https://example.com/recipe").mock(
+            return_value=httpx.Response(status_code, content=body)
+        )
+
+    def test_successful_fetch(self, mock_validate):
         """Should return True for valid content."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
         # Content must be at least 200 characters
-        long_content = (
-            "This is a valid recipe page with lots of content about cooking. " * 10
-        )
-        mock_response.content = f"<html><body>{long_content}</body></html>".encode()
-        mock_get.return_value = mock_response
+        self._page(f"<html><body>{LONG_CONTENT}</body></html>".encode())
 
-        assert can_fetch_content("https://example.com/recipe") is True
+        assert _check() is True
 
-    @patch("src.services.scraping.requests.get")
-    def test_non_200_status(self, mock_get):
+    def test_non_200_status(self, mock_validate):
         """Should return False for non-200 status."""
-        mock_response = MagicMock()
-        mock_response.status_code = 404
-        mock_get.return_value = mock_response
+        self._page(b"", status_code=404)
 
-        assert can_fetch_content("https://example.com/recipe") is False
+        assert _check() is False
 
-    @patch("src.services.scraping.requests.get")
-    def test_short_content(self, mock_get):
+    def test_short_content(self, mock_validate):
         """Should return False for short content."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = b"<html><body>Short</body></html>"
-        mock_get.return_value = mock_response
+        self._page(b"<html><body>Short</body></html>")
 
-        assert can_fetch_content("https://example.com/recipe") is False
+        assert _check() is False
 
-    @patch("src.services.scraping.requests.get")
-    def test_javascript_required(self, mock_get):
+    def test_javascript_required(self, mock_validate):
         """Should return False if JavaScript is required."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = (
+        self._page(
             b"<html><body>Please enable JavaScript to view this page. "
             + b"x" * 200
             + b"</body></html>"
         )
-        mock_get.return_value = mock_response
 
-        assert can_fetch_content("https://example.com/recipe") is False
+        assert _check() is False
 
-    @patch("src.services.scraping.requests.get")
-    def test_no_body(self, mock_get):
+    def test_no_body(self, mock_validate):
         """Should return False if no body element."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = b"<html></html>"
-        mock_get.return_value = mock_response
+        self._page(b"<html></html>")
 
-        assert can_fetch_content("https://example.com/recipe") is False
+        assert _check() is False
 
-    @patch("src.services.scraping.requests.get")
-    def test_exception_handling(self, mock_get):
-        """Should return False on exception."""
-        mock_get.side_effect = Exception("Connection error")
+    def test_ignores_script_text(self, mock_validate):
+        """Should not count script contents as page text."""
+        self._page(
+            f"<html><body><script>{LONG_CONTENT}</script></body></html>".encode()
+        )
+
+        assert _check() is False
+
+    def test_request_exception(self, mock_validate):
+        """Should return False on request exception."""
+        respx.get("https://example.com/recipe").mock(
+            side_effect=httpx.ConnectError("Network error")
+        )
+
+        assert _check() is False
+
+    def test_rejects_private_network_url(self, mock_validate):
+        """Should return False for unsafe URLs."""
+        mock_validate.side_effect = ValueError("URL resolves to a non-public network")
+
+        assert _check() is False
+
+    def test_follows_validated_redirects(self, mock_validate):
+        """Should check the redirect target after validating it."""
+        respx.get("https://example.com/recipe").mock(
+            return_value=httpx.Response(301, headers={"location": "/moved"})
+        )
+        respx.get("https://example.com/moved").mock(
+            return_value=httpx.Response(
+                200, content=f"<body>{LONG_CONTENT}</body>".encode()
+            )
+        )
+
+        assert _check() is True
+        assert mock_validate.call_args.args[0] == "https://example.com/moved"
+
+    def test_stops_reading_after_enough_text(self, mock_validate):
+        """Should stop streaming once the page clearly has content."""
+        chunks_read = []
+
+        async def body():
+            yield b"<html><body>"
+            for _ in range(1000):
+                chunks_read.append(1)
+                yield ("<p>" + "word " * 200 + "</p>").encode()
+
+        respx.get("https://example.com/recipe").mock(
+            return_value=httpx.Response(200, content=body())
+        )
+
+        assert _check() is True
+        assert len(chunks_read) < 10
+
+    @patch("src.services.scraping.get_access_check_max_bytes", return_value=1024)
+    def test_stops_at_byte_cap(self, _, mock_validate):
+        """Should give up on pages without text within the byte cap."""
+        chunks_read = []
+
+        async def body():
+            yield b"<html><head><script>"
+            for _ in range(1000):
+                chunks_read.append(1)
+                yield b"x" * 512
+            yield f"</script></head><body>{LONG_CONTENT}</body>".encode()
+
+        respx.get("https://example.com/recipe").mock(
+            return_value=httpx.Response(200, content=body())
+        )
+
+        assert _check() is False
+        assert len(chunks_read) < 10
+
+    def test_prefetch_keeps_whole_page(self, mock_validate):
+        """Should read a scrapable page to the end and keep it with its text."""
+        body = b"<html><title>Stew</title><body>" + b"<p>word</p>" * 2000
+        body += b"</body></html>"
+        self._page(body)
+
+        assert _check(prefetch=True) is True
+
+        page = take_prefetched_page("https://example.com/recipe")
+        assert page.html == body
+        assert page.parsed.title == "Stew"
+        assert take_prefetched_page("https://example.com/recipe") is None
+
+    def test_prefetch_does_not_delay_verdict(self, mock_validate):
+        """Should return the verdict before the rest of the page arrives."""
+
+        async def scenario():
+            rest_sent = asyncio.Event()
+
+            async def body():
+                yield f"<html><body>{LONG_CONTENT * 4}".encode()
+                await rest_sent.wait()
+                yield b"<p>Serve.</p></body></html>"
 
-        assert can_fetch_content("https://example.com/recipe") is False
+            respx.get("https://example.com/recipe").mock(
+                return_value=httpx.Response(200, content=body())
+            )
+
+            accessible = await can_fetch_content("https://example.com/recipe", True)
+            stored_early = len(prefetched_pages)
+            rest_sent.set()
+            await asyncio.gather(*prefetch_downloads)
+            return accessible, stored_early
+
+        accessible, stored_early = asyncio.run(scenario())
+
+        assert accessible is True
+        assert stored_early == 0
+        page = take_prefetched_page("https://example.com/recipe")
+        assert page.html.endswith(b"<p>Serve.</p></body></html>")
+
+    @patch("src.services.scraping.get_prefetch_max_page_bytes", return_value=1024)
+    def test_prefetch_skips_large_pages(self, _, mock_validate):
+        """Should not keep pages above the prefetch page cap."""
+        self._page(f"<html><body>{LONG_CONTENT * 10}</body></html>".encode())
+
+        assert _check(prefetch=True) is True
+        assert len(prefetched_pages) == 0
+
+    def test_prefetch_skips_unscrapable_pages(self, mock_validate):
+        """Should not keep pages that fail the check."""
+        self._page(b"<html><body>Short</body></html>")
+
+        assert _check(prefetch=True) is False
+        assert len(prefetched_pages) == 0
+
+    def test_does_not_prefetch_by_default(self, mock_validate):
+        """Should leave the prefetch cache alone for plain checks."""
+        self._page(f"<html><body>{LONG_CONTENT}</body></html>".encode())
+
+        assert _check() is True
+        assert len(prefetched_pages) == 0
 
 
 class TestFilterAccessibleUrls:
     """Tests for filter_accessible_urls function."""
 
-    @patch("src.services.scraping.can_fetch_content")
+    @patch("src.services.scraping.can_fetch_content", new_callable=AsyncMock)
     def test_filters_inaccessible(self, mock_can_fetch):
         """Should filter out inaccessible URLs."""
 
         # Use a function to return consistent results regardless of call order
-        def check_url(url):
+        def check_url(url, prefetch):
             return url != "https://b.com"
 
         mock_can_fetch.side_effect = check_url
@@ -98,7 +256,7 @@ class TestFilterAccessibleUrls:
             {"url": "https://c.com", "title": "C"},
         ]
 
-        filtered = filter_accessible_urls(results)
+        filtered = asyncio.run(filter_accessible_urls(results))
 
         assert len(filtered) == 2
         urls = [r["url"] for r in filtered]
@@ -106,19 +264,19 @@ class TestFilterAccessibleUrls:
         assert "https://c.com" in urls
         assert "https://b.com" not in urls
 
-    @patch("src.services.scraping.can_fetch_content")
+    @patch("src.services.scraping.can_fetch_content", new_callable=AsyncMock)
     def test_empty_list(self, mock_can_fetch):
         """Should handle empty list."""
-        filtered = filter_accessible_urls([])
+        filtered = asyncio.run(filter_accessible_urls([]))
         assert filtered == []
 
-    @patch("src.services.scraping.can_fetch_content")
+    @patch("src.services.scraping.can_fetch_content", new_callable=AsyncMock)
     def test_preserves_original_order(self, mock_can_fetch):
         """Should preserve search ranking despite concurrent fetch checks."""
 
-        def check_url(url):
+        async def check_url(url, prefetch):
             if url == "https://a.com":
-                time.sleep(0.02)
+                await asyncio.sleep(0.02)
             return True
 
         mock_can_fetch.side_effect = check_url
@@ -129,7 +287,7 @@ class TestFilterAccessibleUrls:
             {"url": "https://c.com", "title": "C"},
         ]
 
-        filtered = filter_accessible_urls(results)
+        filtered = asyncio.run(filter_accessible_urls(results))
 
         assert [r["url"] for r in filtered] == [
             "https://a.com",
@@ -137,6 +295,40 @@ class TestFilterAccessibleUrls:
             "https://c.com",
         ]
 
+    @patch("src.services.scraping.can_fetch_content", new_callable=AsyncMock)
+    def test_reuses_cached_verdicts(self, mock_can_fetch):
+        """Should not fetch URLs checked by an earlier search."""
+        mock_can_fetch.side_effect = lambda url, prefetch: url != "https://b.com/r"
+        results = [
+            {"url": "https://a.com/r", "title": "A"},
+            {"url": "https://b.com/r", "title": "B"},
+        ]
+
+        asyncio.run(filter_accessible_urls(results))
+        mock_can_fetch.reset_mock()
+        filtered = asyncio.run(
+            filter_accessible_urls(
+                results + [{"url": "https://www.a.com/r?utm_source=x", "title": "A2"}]
+            )
+        )
+
+        mock_can_fetch.assert_not_awaited()
+        assert [r["title"] for r in filtered] == ["A", "A2"]
+
+    @patch("src.services.scraping.can_fetch_content", new_callable=AsyncMock)
+    def test_checks_only_unknown_urls(self, mock_can_fetch):
+        """Should fetch just the URLs without a cached verdict."""
+        mock_can_fetch.return_value = True
+        url_verdicts.set("https://a.com/r", True)
+
+        asyncio.run(
+            filter_accessible_urls(
+                [{"url": "https://a.com/r", "title": "A"}, {"url": "https://b.com/r"}]
+            )
+        )
+
+        mock_can_fetch.assert_awaited_once_with("https://b.com/r", False)
+
 
 class TestGetWebsiteText:
     """Tests for get_website_text function."""
@@ -1,67 +1,400 @@
 """Tests for recipe search functionality."""
 
-from unittest.mock import MagicMock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
-from src.services.search import search_recipes
+import pytest
+
+from src.services.scraping import url_verdicts
+from src.services.search import (
+    PAGE_SIZE,
+    search_recipes,
+    search_sessions,
+    stream_search_recipes,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_search_sessions():
+    """Start each test without cached search sessions or verdicts."""
+    search_sessions.clear()
+    url_verdicts.clear()
+    yield
+    search_sessions.clear()
+    url_verdicts.clear()
+
+
+@pytest.fixture
+def mock_check():
+    """Report every candidate as accessible unless a test says otherwise."""
+    with patch(
+        "src.services.search.check_url_accessible",
+        new_callable=AsyncMock,
+        return_value=True,
+    ) as mock:
+        yield mock
+
+
+def _ddgs_results(count):
+    return [
+        {
+            "title": f"Recipe {i}",
+            "href": f"https://example.com/recipe/{i}",
+            "body": f"Snippet {i}",
+        }
+        for i in range(count)
+    ]
+
+
+def _checked_urls(mock_check):
+    return [call.args[0] for call in mock_check.await_args_list]
+
+
+def _mock_ddgs(mock_ddgs, results):
+    mock_ddgs_instance = MagicMock()
+    mock_ddgs.return_value.__enter__.return_value = mock_ddgs_instance
+    mock_ddgs_instance.text.return_value = results
+    return mock_ddgs_instance
 
 
 class TestSearchRecipesBlacklist:
     """Tests for blacklist filtering in search_recipes."""
 
-    @patch("src.services.search.filter_accessible_urls")
-    @patch("src.services.search.DDGS")
-    def test_filters_blacklisted_domains(self, mock_ddgs, mock_filter):
+    @patch("src.services.search_providers.DDGS")
+    def test_filters_blacklisted_domains(self, mock_ddgs, mock_check):
         """Should filter out blacklisted domains before accessibility check."""
-        # Setup mock DuckDuckGo results
-        mock_ddgs_instance = MagicMock()
-        mock_ddgs.return_value.__enter__.return_value = mock_ddgs_instance
-        mock_ddgs_instance.text.return_value = [
-            {
-                "title": "NYT Recipe",
-                "href": "https://cooking.nytimes.com/recipe/1",
-                "body": "A recipe",
-            },
-            {
-                "title": "Good Recipe",
-                "href": "https://allrecipes.com/recipe/1",
-                "body": "Another recipe",
-            },
-            {
-                "title": "ATK Recipe",
-                "href": "https://americastestkitchen.com/recipe/1",
-                "body": "ATK recipe",
-            },
-        ]
-        mock_filter.return_value = [
-            {
-                "title": "Good Recipe",
-                "url": "https://allrecipes.com/recipe/1",
-                "snippet": "Another recipe",
-            }
-        ]
+        _mock_ddgs(
+            mock_ddgs,
+            [
+                {
+                    "title": "NYT Recipe",
+                    "href": "https://cooking.nytimes.com/recipe/1",
+                    "body": "A recipe",
+                },
+                {
+                    "title": "Good Recipe",
+                    "href": "https://allrecipes.com/recipe/1",
+                    "body": "Another recipe",
+                },
+                {
+                    "title": "ATK Recipe",
+                    "href": "https://americastestkitchen.com/recipe/1",
+                    "body": "ATK recipe",
+                },
+            ],
+        )
+
+        result = asyncio.run(search_recipes("test", "en", page=0))
+
+        # Verify only the non-blacklisted URL was checked and returned
+        assert _checked_urls(mock_check) == ["https://allrecipes.com/recipe/1"]
+        assert [r["title"] for r in result["results"]] == ["Good Recipe"]
+
+    @patch("src.services.search_providers.DDGS")
+    def test_skips_malformed_urls(self, mock_ddgs, mock_check):
+        """Should drop results whose URL has no host or an invalid port."""
+        _mock_ddgs(
+            mock_ddgs,
+            [
+                {"title": "Bad port", "href": "http://a.com:99999/x", "body": ""},
+                {"title": "Bad host", "href": "http://[::1", "body": ""},
+                {"title": "No host", "href": "not a url", "body": ""},
+                {"title": "Good", "href": "https://b.com/recipe", "body": ""},
+            ],
+        )
 
-        search_recipes("test", "en", page=0)
+        result = asyncio.run(search_recipes("test", "en", page=0))
 
-        # Verify filter_accessible_urls was called without blacklisted URLs
-        call_args = mock_filter.call_args[0][0]
-        urls = [r["url"] for r in call_args]
-        assert "https://cooking.nytimes.com/recipe/1" not in urls
-        assert "https://americastestkitchen.com/recipe/1" not in urls
-        assert "https://allrecipes.com/recipe/1" in urls
+        assert _checked_urls(mock_check) == ["https://b.com/recipe"]
+        assert [r["title"] for r in result["results"]] == ["Good"]
 
-    @patch("src.services.search.filter_accessible_urls")
-    @patch("src.services.search.DDGS")
-    def test_passes_locale_specific_query_and_region(self, mock_ddgs, mock_filter):
+    @patch("src.services.search_providers.DDGS")
+    def test_passes_locale_specific_query_and_region(self, mock_ddgs, mock_check):
         """Should translate the recipe keyword and DDGS region from locale."""
-        mock_ddgs_instance = MagicMock()
-        mock_ddgs.return_value.__enter__.return_value = mock_ddgs_instance
-        mock_ddgs_instance.text.return_value = []
-        mock_filter.return_value = []
+        mock_ddgs_instance = _mock_ddgs(mock_ddgs, [])
 
-        search_recipes("tarte", "fr", page=0)
+        asyncio.run(search_recipes("tarte", "fr", page=0))
 
         mock_ddgs_instance.text.assert_called_once_with(
             "tarte recette",
             region="fr-fr",
             max_results=50,
+            backend="auto",
         )
+
+
+class TestSearchSessions:
+    """Tests for reuse of candidates and verdicts across pages."""
+
+    @patch("src.services.search_providers.DDGS")
+    def test_next_page_only_checks_new_candidates(self, mock_ddgs, mock_check):
+        """Should not query DDGS again or recheck candidates of earlier pages."""
+        ddgs = _mock_ddgs(mock_ddgs, _ddgs_results(50))
+
+        first = asyncio.run(search_recipes("pasta", "en", page=0))
+        checked_first = _checked_urls(mock_check)
+        second = asyncio.run(search_recipes("pasta", "en", page=1))
+        checked_second = _checked_urls(mock_check)[len(checked_first) :]
+
+        ddgs.text.assert_called_once()
+        assert len(checked_first) == 2 * PAGE_SIZE
+        assert len(checked_second) == PAGE_SIZE
+        assert not set(checked_first) & set(checked_second)
+        assert first["results"][0]["title"] == "Recipe 0"
+        assert second["results"][0]["title"] == f"Recipe {PAGE_SIZE}"
+        assert second["has_more"] is True
+
+    @patch("src.services.search_providers.DDGS")
+    def test_reuses_negative_verdicts(self, mock_ddgs, mock_check):
+        """Should remember inaccessible candidates and skip them later."""
+        _mock_ddgs(mock_ddgs, _ddgs_results(30))
+        mock_check.side_effect = lambda url, prefetch: not url.endswith("/0")
+
+        asyncio.run(search_recipes("pasta", "en", page=0))
+        mock_check.reset_mock()
+        result = asyncio.run(search_recipes("pasta", "en", page=0))
+
+        mock_check.assert_not_awaited()
+        assert result["results"][0]["title"] == "Recipe 1"
+
+    @patch("src.services.search_providers.DDGS")
+    def test_uses_cached_verdicts(self, mock_ddgs, mock_check):
+        """Should not check candidates with a verdict from another search."""
+        _mock_ddgs(mock_ddgs, _ddgs_results(2))
+        url_verdicts.set("https://example.com/recipe/0", False)
+
+        result = asyncio.run(search_recipes("pasta", "en"))
+
+        assert _checked_urls(mock_check) == ["https://example.com/recipe/1"]
+        assert [r["title"] for r in result["results"]] == ["Recipe 1"]
+
+    @patch("src.services.search_providers.DDGS")
+    def test_normalizes_query(self, mock_ddgs, mock_check):
+        """Should share a session across case and whitespace variants."""
+        ddgs = _mock_ddgs(mock_ddgs, _ddgs_results(5))
+
+        asyncio.run(search_recipes("Pasta  Carbonara", "en"))
+        asyncio.run(search_recipes(" pasta carbonara", "en"))
+
+        ddgs.text.assert_called_once()
+        assert ddgs.text.call_args.args[0] == "pasta carbonara recipe"
+
+    @patch("src.services.search_providers.DDGS")
+    def test_keeps_locales_apart(self, mock_ddgs, mock_check):
+        """Should not share a session between locales."""
+        ddgs = _mock_ddgs(mock_ddgs, _ddgs_results(5))
+
+        asyncio.run(search_recipes("pasta", "en"))
+        asyncio.run(search_recipes("pasta", "fr"))
+
+        assert ddgs.text.call_count == 2
+
+    @patch("src.services.search_providers.DDGS")
+    def test_coalesces_concurrent_searches(self, mock_ddgs, mock_check):
+        """Should run one DDGS query and one check per URL for identical searches."""
+        ddgs = _mock_ddgs(mock_ddgs, _ddgs_results(20))
+
+        async def search_twice():
+            return await asyncio.gather(
+                search_recipes("pasta", "en"), search_recipes("pasta", "en")
+            )
+
+        results = asyncio.run(search_twice())
+
+        ddgs.text.assert_called_once()
+        assert mock_check.await_count == 20
+        assert results[0] == results[1]
+
+
+class TestEarlyCompletion:
+    """Tests for returning a page before every check has finished."""
+
+    @staticmethod
+    def _slow_candidates(mock_check, slow_urls, release):
+        async def check(url, prefetch):
+            if url in slow_urls:
+                await release.wait()
+            return True
+
+        mock_check.side_effect = check
+
+    @patch("src.services.search_providers.DDGS")
+    def test_returns_page_before_slow_checks_finish(self, mock_ddgs, mock_check):
+        """Should not wait for candidates ranked below the page."""
+        _mock_ddgs(mock_ddgs, _ddgs_results(20))
+        slow_url = f"https://example.com/recipe/{PAGE_SIZE + 5}"
+
+        async def scenario():
+            release = asyncio.Event()
+            self._slow_candidates(mock_check, {slow_url}, release)
+            result = await asyncio.wait_for(search_recipes("pasta", "en"), 1)
+            session = next(iter(search_sessions._entries.values()))[1]
+            pending = slow_url in session.checks
+            release.set()
+            await asyncio.sleep(0.01)
+            return result, pending, session
+
+        result, pending, session = asyncio.run(scenario())
+
+        assert len(result["results"]) == PAGE_SIZE
+        assert result["has_more"] is True
+        assert pending
+        # The background check still lands in the session
+        assert session.verdicts[slow_url] is True
+        assert slow_url not in session.checks
+
+    @patch("src.services.search_providers.DDGS")
+    def test_waits_for_slow_candidates_within_the_page(self, mock_ddgs, mock_check):
+        """Should keep rank order by waiting on earlier slow candidates."""
+        _mock_ddgs(mock_ddgs, _ddgs_results(20))
+        slow_url = "https://example.com/recipe/0"
+
+        async def scenario():
+            release = asyncio.Event()
+            self._slow_candidates(mock_check, {slow_url}, release)
+            search = asyncio.ensure_future(search_recipes("pasta", "en"))
+            await asyncio.sleep(0.01)
+            done_early = search.done()
+            release.set()
+            return done_early, await search
+
+        done_early, result = asyncio.run(scenario())
+
+        assert done_early is False
+        assert result["results"][0]["title"] == "Recipe 0"
+
+    @patch("src.services.search_providers.DDGS")
+    def test_has_more_false_when_rest_failed(self, mock_ddgs, mock_check):
+        """Should report no more results when every later candidate failed."""
+        _mock_ddgs(mock_ddgs, _ddgs_results(20))
+        mock_check.side_effect = (
+            lambda url, prefetch: int(url.rsplit("/", 1)[1]) < PAGE_SIZE
+        )
+
+        result = asyncio.run(search_recipes("pasta", "en"))
+
+        assert len(result["results"]) == PAGE_SIZE
+        assert result["has_more"] is False
+
+
+class TestStreamSearchRecipes:
+    """Tests for stream_search_recipes."""
+
+    @patch("src.services.search_providers.DDGS")
+    def test_yields_each_result_once_verified(self, mock_ddgs, mock_check):
+        """Should yield earlier results before later checks finish."""
+        _mock_ddgs(mock_ddgs, _ddgs_results(20))
+        slow_url = "https://example.com/recipe/3"
+
+        async def scenario():
+            release = asyncio.Event()
+
+            async def check(url, prefetch):
+                if url == slow_url:
+                    await release.wait()
+                return True
+
+            mock_check.side_effect = check
+            records = await stream_search_recipes("pasta", "en")
+            first = [await anext(records) for _ in range(3)]
+            release.set()
+            rest = [record async for record in records]
+            return first, rest
+
+        first, rest = asyncio.run(scenario())
+
+        assert [r["title"] for r in first] == ["Recipe 0", "Recipe 1", "Recipe 2"]
+        assert rest[0]["title"] == "Recipe 3"
+        assert len(rest) == PAGE_SIZE - 3 + 1
+        assert rest[-1] == {"has_more": True}
+
+    @patch("src.services.search_providers.DDGS")
+    def test_skips_earlier_pages(self, mock_ddgs, mock_check):
+        """Should only yield the results of the requested page."""
+        _mock_ddgs(mock_ddgs, _ddgs_results(15))
+
+        async def scenario():
+            return [r async for r in await stream_search_recipes("pasta", "en", 1)]
+
+        records = asyncio.run(scenario())
+
+        assert [r["title"] for r in records[:-1]] == [
+            f"Recipe {i}" for i in range(PAGE_SIZE, 15)
+        ]
+        assert records[-1] == {"has_more": False}
+
+
+class TestPrefetch:
+    """Tests for prefetching the pages of the top results."""
+
+    @staticmethod
+    def _prefetched_urls(mock_check):
+        return [call.args[0] for call in mock_check.await_args_list if call.args[1]]
+
+    @patch("src.services.search.get_prefetch_top_n", return_value=3)
+    @patch("src.services.search_providers.DDGS")
+    def test_prefetches_top_of_page(self, mock_ddgs, _, mock_check):
+        """Should check the first candidates of the page with prefetch."""
+        _mock_ddgs(mock_ddgs, _ddgs_results(30))
+
+        asyncio.run(search_recipes("pasta", "en", page=1))
+
+        assert sorted(self._prefetched_urls(mock_check)) == [
+            f"https://example.com/recipe/{i}" for i in range(PAGE_SIZE, PAGE_SIZE + 3)
+        ]
+
+    @patch("src.services.search.get_prefetch_top_n", return_value=1)
+    @patch("src.services.search_providers.DDGS")
+    def test_prefetches_despite_cached_verdict(self, mock_ddgs, _, mock_check):
+        """Should still fetch a top result whose verdict is cached."""
+        _mock_ddgs(mock_ddgs, _ddgs_results(2))
+        url_verdicts.set("https://example.com/recipe/0", True)
+
+        asyncio.run(search_recipes("pasta", "en"))
+
+        assert self._prefetched_urls(mock_check) == ["https://example.com/recipe/0"]
+
+    @patch("src.services.search.is_prefetched", return_value=True)
+    @patch("src.services.search.get_prefetch_top_n", return_value=1)
+    @patch("src.services.search_providers.DDGS")
+    def test_skips_prefetched_pages(self, mock_ddgs, _, __, mock_check):
+        """Should not fetch a cached result again once its page is kept."""
+        _mock_ddgs(mock_ddgs, _ddgs_results(1))
+        url_verdicts.set("https://example.com/recipe/0", True)
+
+        asyncio.run(search_recipes("pasta", "en"))
+
+        mock_check.assert_not_awaited()
+
+
+class TestAlreadyPlanned:
+    """Tests for flagging results that already have a stored plan."""
+
+    @patch("src.services.search_providers.DDGS")
+    def test_flags_planned_results_with_one_lookup(self, mock_ddgs, mock_check):
+        """Should look up the page's candidates once, by canonical URL."""
+        _mock_ddgs(mock_ddgs, _ddgs_results(3))
+        find_planned = AsyncMock(return_value={"https://example.com/recipe/1"})
+
+        result = asyncio.run(search_recipes("pasta", "en", find_planned=find_planned))
+
+        assert [r["already_planned"] for r in result["results"]] == [
+            False,
+            True,
+            False,
+        ]
+        find_planned.assert_awaited_once()
+        assert sorted(find_planned.await_args.args[0]) == [
+            f"https://example.com/recipe/{i}" for i in range(3)
+        ]
+
+    @patch("src.services.search_providers.DDGS")
+    def test_does_not_change_cached_candidates(self, mock_ddgs, mock_check):
+        """Should flag copies of the results, not the session's candidates."""
+        _mock_ddgs(mock_ddgs, _ddgs_results(1))
+        find_planned = AsyncMock(return_value=set())
+
+        asyncio.run(search_recipes("pasta", "en", find_planned=find_planned))
+
+        session = next(iter(search_sessions._entries.values()))[1]
+        assert "already_planned" not in session.candidates[0]
@@ -0,0 +1,165 @@
+"""Tests for search_providers.py - federated, hedged web search."""
+
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.services.search_providers import (
+    DDGSProvider,
+    FakeSearchProvider,
+    FederatedSearch,
+    merge_results,
+)
+
+
+def _results(*urls):
+    return [{"title": url, "href": url, "body": ""} for url in urls]
+
+
+def _search(providers, timeout=1.0, hedge_delay=0.05, merge_grace=0.0):
+    federated = FederatedSearch(
+        providers, timeout=timeout, hedge_delay=hedge_delay, merge_grace=merge_grace
+    )
+    return federated, asyncio.run(federated.search("pasta", "us-en", 50))
+
+
+class TestMergeResults:
+    """Tests for merge_results function."""
+
+    def test_interleaves_by_rank(self):
+        """Should alternate between lists, rank by rank."""
+        merged = merge_results([_results("a1", "a2", "a3"), _results("b1")])
+
+        assert [r["href"] for r in merged] == ["a1", "b1", "a2", "a3"]
+
+    def test_drops_duplicate_urls(self):
+        """Should keep the first occurrence of equivalent URLs."""
+        merged = merge_results(
+            [
+                _results("https://example.com/a", "https://example.com/b"),
+                _results("https://EXAMPLE.com/a/", "https://example.com/c"),
+            ]
+        )
+
+        assert [r["href"] for r in merged] == [
+            "https://example.com/a",
+            "https://example.com/b",
+            "https://example.com/c",
+        ]
+
+
+class TestFederatedSearch:
+    """Tests for FederatedSearch class."""
+
+    def test_fast_primary_is_not_hedged(self):
+        """Should not query fallbacks when the primary answers in time."""
+        primary = FakeSearchProvider("primary", _results("a"))
+        fallback = FakeSearchProvider("fallback", _results("b"))
+
+        federated, results = _search([primary, fallback])
+
+        assert [r["href"] for r in results] == ["a"]
+        assert fallback.queries == []
+        assert federated.stats["primary"].wins == 1
+        assert federated.stats["fallback"].calls == 0
+
+    def test_hedges_slow_primary(self):
+        """Should return the fallback's answer when the primary is slow."""
+        primary = FakeSearchProvider("primary", _results("a"), delay=0.5)
+        fallback = FakeSearchProvider("fallback", _results("b"))
+
+        federated, results = _search([primary, fallback])
+
+        assert [r["href"] for r in results] == ["b"]
+        assert federated.stats["fallback"].hedges == 1
+        assert federated.stats["primary"].cancelled == 1
+
+    def test_hedges_immediately_on_failure(self):
+        """Should start the next provider as soon as one fails."""
+        primary = FakeSearchProvider("primary", [], error=RuntimeError("rate limited"))
+        fallback = FakeSearchProvider("fallback", _results("b"))
+
+        federated, results = _search([primary, fallback], hedge_delay=10.0)
+
+        assert [r["href"] for r in results] == ["b"]
+        assert federated.stats["primary"].failures == 1
+
+    def test_counts_timeouts(self):
+        """Should give up on a provider after its timeout."""
+        primary = FakeSearchProvider("primary", _results("a"), delay=0.5)
+        fallback = FakeSearchProvider("fallback", _results("b"))
+
+        federated, results = _search([primary, fallback], timeout=0.1, hedge_delay=10.0)
+
+        assert [r["href"] for r in results] == ["b"]
+        assert federated.stats["primary"].timeouts == 1
+
+    def test_raises_when_every_provider_fails(self):
+        """Should raise the last error when no provider answers."""
+        providers = [
+            FakeSearchProvider("a", [], error=RuntimeError("a down")),
+            FakeSearchProvider("b", [], error=RuntimeError("b down")),
+        ]
+
+        with pytest.raises(RuntimeError, match="b down"):
+            _search(providers)
+
+    def test_merges_answers_within_grace(self):
+        """Should merge providers answering shortly after the first one."""
+        primary = FakeSearchProvider("primary", _results("a1", "a2"), delay=0.08)
+        fallback = FakeSearchProvider("fallback", _results("b1", "a1"))
+
+        _, results = _search([primary, fallback], hedge_delay=0.05, merge_grace=0.5)
+
+        assert [r["href"] for r in results] == ["a1", "b1", "a2"]
+
+    def test_records_latency(self):
+        """Should record the latency of answered queries."""
+        provider = FakeSearchProvider("primary", _results("a"), delay=0.02)
+
+        federated, _ = _search([provider])
+
+        stats = federated.stats["primary"]
+        assert stats.calls == 1
+        assert stats.latency_ms_max >= 20
+        assert stats.latency_ms_total == stats.latency_ms_max
+
+    def test_requires_a_provider(self):
+        """Should reject an empty provider list."""
+        with pytest.raises(ValueError):
+            FederatedSearch([], timeout=1.0, hedge_delay=0.1)
+
+
+class TestDDGSProvider:
+    """Tests for DDGSProvider class."""
+
+    def test_counts_abandoned_threads(self):
+        """Should count a timed out query until its thread finishes."""
+        provider = DDGSProvider(max_threads=1)
+        started, release = threading.Event(), threading.Event()
+
+        def search(query, region, max_results):
+            started.set()
+            release.wait(5)
+            return _results("a")
+
+        async def scenario():
+            with patch.object(provider, "_search", side_effect=search):
+                running = provider.search("pasta", "us-en", 10)
+                with pytest.raises(TimeoutError):
+                    await asyncio.wait_for(running, 0.05)
+                # Queued behind the busy thread, so dropped rather than abandoned
+                queued = provider.search("pasta", "us-en", 10)
+                with pytest.raises(TimeoutError):
+                    await asyncio.wait_for(queued, 0.05)
+                assert started.is_set()
+                assert provider.abandoned_threads == 1
+
+                release.set()
+                provider._executor.shutdown(wait=True)
+
+        asyncio.run(scenario())
+
+        assert provider.abandoned_threads == 0
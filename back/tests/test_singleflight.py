@@ -0,0 +1,129 @@
+"""Tests for in-process request coalescing."""
+
+import asyncio
+
+import pytest
+
+from src.services.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight.do."""
+
+    def test_coalesces_concurrent_calls(self):
+        """Should run the work once and share the result with every caller."""
+        flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        async def run():
+            return await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+
+        results = asyncio.run(run())
+
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert flight.stats.leaders == 1
+        assert flight.stats.followers == 4
+
+    def test_different_keys_run_separately(self):
+        """Should not coalesce calls for different keys."""
+        flight = SingleFlight()
+        calls = []
+
+        async def work(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return key
+
+        async def run():
+            return await asyncio.gather(
+                flight.do("a", lambda: work("a")), flight.do("b", lambda: work("b"))
+            )
+
+        assert asyncio.run(run()) == ["a", "b"]
+        assert sorted(calls) == ["a", "b"]
+
+    def test_sequential_calls_run_again(self):
+        """Should forget a key once its call has completed."""
+        flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        async def run():
+            first = await flight.do("key", work)
+            second = await flight.do("key", work)
+            return first, second
+
+        assert asyncio.run(run()) == (1, 2)
+        assert not flight.is_in_flight("key")
+
+    def test_failure_is_raised_in_each_waiter(self):
+        """Should surface the same exception to leader and followers."""
+        flight = SingleFlight()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        async def run():
+            return await asyncio.gather(
+                flight.do("key", failing),
+                flight.do("key", failing),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(run())
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert flight.stats.failures == 1
+        assert not flight.is_in_flight("key")
+
+    def test_retries_after_failure(self):
+        """Should not remember failures: the next call starts a new attempt."""
+        flight = SingleFlight()
+        attempts = 0
+
+        async def flaky():
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise RuntimeError("boom")
+            return "ok"
+
+        async def run():
+            with pytest.raises(RuntimeError):
+                await flight.do("key", flaky)
+            return await flight.do("key", flaky)
+
+        assert asyncio.run(run()) == "ok"
+        assert attempts == 2
+
+    def test_leader_cancellation_does_not_cancel_work(self):
+        """Followers should still get the result when the first caller is cancelled."""
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        async def run():
+            leader = asyncio.create_task(flight.do("key", work))
+            await asyncio.sleep(0)
+            follower = asyncio.create_task(flight.do("key", work))
+            await asyncio.sleep(0)
+            leader.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await leader
+            return await follower
+
+        assert asyncio.run(run()) == "done"
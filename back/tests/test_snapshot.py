@@ -0,0 +1,84 @@
+"""Tests for snapshot.py - pre-serialized response snapshots."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.services.snapshot import SnapshotCache
+
+
+def _cache(clock, build, max_age=60.0):
+    return SnapshotCache(build, max_age=max_age, clock=clock)
+
+
+class TestSnapshotCache:
+    """Tests for SnapshotCache class."""
+
+    def test_builds_once_while_fresh(self, clock):
+        """Should reuse the snapshot until it is older than max_age."""
+        build = AsyncMock(return_value=b"body")
+        cache = _cache(clock, build)
+
+        first = asyncio.run(cache.get())
+        clock.now = 59.0
+        second = asyncio.run(cache.get())
+
+        assert first is second
+        assert first.body == b"body"
+        build.assert_awaited_once()
+
+    def test_rebuilds_when_stale(self, clock):
+        """Should rebuild once max_age has elapsed."""
+        build = AsyncMock(side_effect=[b"old", b"new"])
+        cache = _cache(clock, build)
+
+        asyncio.run(cache.get())
+        clock.now = 60.0
+
+        assert asyncio.run(cache.get()).body == b"new"
+
+    def test_etag_follows_content(self, clock):
+        """Should keep the ETag for identical bodies and change it otherwise."""
+        build = AsyncMock(side_effect=[b"a", b"a", b"b"])
+        cache = _cache(clock, build)
+
+        etags = [asyncio.run(cache.refresh()).etag for _ in range(3)]
+
+        assert etags[0] == etags[1] != etags[2]
+        assert etags[0].startswith('"') and etags[0].endswith('"')
+
+    def test_keeps_previous_snapshot_on_failure(self, clock):
+        """Should keep serving the last snapshot when a rebuild fails."""
+        build = AsyncMock(side_effect=[b"body", RuntimeError("db down")])
+        cache = _cache(clock, build)
+
+        asyncio.run(cache.refresh())
+
+        assert asyncio.run(cache.refresh()).body == b"body"
+        assert cache.stats.failures == 1
+
+    def test_raises_when_nothing_to_serve(self, clock):
+        """Should propagate the error when no snapshot was ever built."""
+        cache = _cache(clock, AsyncMock(side_effect=RuntimeError("db down")))
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(cache.get())
+
+    def test_concurrent_gets_share_one_build(self, clock):
+        """Should build once for callers arriving together."""
+
+        async def build():
+            await asyncio.sleep(0.01)
+            return b"body"
+
+        build_mock = AsyncMock(side_effect=build)
+        cache = _cache(clock, build_mock)
+
+        async def scenario():
+            return await asyncio.gather(*(cache.get() for _ in range(5)))
+
+        snapshots = asyncio.run(scenario())
+
+        assert len({id(s) for s in snapshots}) == 1
+        build_mock.assert_awaited_once()
@@ -0,0 +1,112 @@
+"""Tests for structured_data.py - schema.org Recipe extraction."""
+
+import json
+
+from bs4 import BeautifulSoup
+
+from src.services.structured_data import recipe_from_json_ld, recipe_from_microdata
+
+RECIPE = {
+    "@context": "https://schema.org",
+    "@type": "Recipe",
+    "name": "Carbonara",
+    "recipeIngredient": ["400g spaghetti", "4 egg yolks"],
+    "recipeInstructions": [
+        {"@type": "HowToStep", "text": "Boil the pasta."},
+        {"@type": "HowToStep", "text": "Mix with the yolks."},
+    ],
+}
+
+
+def _extract(*blocks):
+    return recipe_from_json_ld(
+        json.dumps(b) if not isinstance(b, str) else b for b in blocks
+    )
+
+
+class TestJsonLd:
+    """Tests for JSON-LD Recipe objects."""
+
+    def test_extracts_recipe(self):
+        """Should read name, ingredients and steps."""
+        recipe = _extract(RECIPE)
+
+        assert recipe.title == "Carbonara"
+        assert recipe.ingredients == "400g spaghetti\n4 egg yolks"
+        assert recipe.recipe == "Boil the pasta.\n\nMix with the yolks."
+
+    def test_finds_recipe_in_graph(self):
+        """Should look inside @graph and lists."""
+        graph = {"@graph": [{"@type": "WebPage"}, [RECIPE]]}
+
+        assert _extract(graph).title == "Carbonara"
+
+    def test_accepts_type_lists_and_prefixes(self):
+        """Should match Recipe among several or prefixed types."""
+        assert _extract({**RECIPE, "@type": ["NewsArticle", "Recipe"]}) is not None
+        assert _extract({**RECIPE, "@type": "schema:Recipe"}) is not None
+
+    def test_flattens_sections_and_plain_text(self):
+        """Should keep section names and accept plain instruction strings."""
+        instructions = [
+            {
+                "@type": "HowToSection",
+                "name": "Sauce",
+                "itemListElement": [{"@type": "HowToStep", "text": "Whisk."}],
+            },
+            "Serve.",
+        ]
+
+        recipe = _extract({**RECIPE, "recipeInstructions": instructions})
+
+        assert recipe.recipe == "Sauce\n\nWhisk.\n\nServe."
+
+    def test_cleans_entities_and_markup(self):
+        """Should unescape entities and drop HTML left in strings."""
+        recipe = _extract(
+            {
+                **RECIPE,
+                "recipeIngredient": ["200g cr&egrave;me"],
+                "recipeInstructions": "<p>Stir &amp; serve.</p>",
+            }
+        )
+
+        assert recipe.ingredients == "200g crème"
+        assert recipe.recipe == "Stir & serve."
+
+    def test_skips_invalid_blocks(self):
+        """Should ignore unparseable JSON-LD and use the next block."""
+        assert _extract("{not json", RECIPE).title == "Carbonara"
+
+    def test_requires_ingredients_and_instructions(self):
+        """Should return None when either is missing."""
+        assert _extract({**RECIPE, "recipeIngredient": []}) is None
+        assert _extract({**RECIPE, "recipeInstructions": None}) is None
+
+    def test_returns_none_without_recipe(self):
+        """Should return None for pages without a Recipe object."""
+        assert _extract({"@type": "Article", "name": "News"}) is None
+
+
+class TestMicrodata:
+    """Tests for microdata Recipe items."""
+
+    def test_extracts_recipe(self):
+        """Should read itemprop values within the Recipe item."""
+        soup = BeautifulSoup(
+            """
+            <div itemscope itemtype="http://schema.org/Recipe">
+              <h1 itemprop="name">Stew</h1>
+              <meta itemprop="recipeIngredient" content="1 onion">
+              <li itemprop="recipeIngredient">2 carrots</li>
+              <div itemprop="recipeInstructions"><p>Chop.</p><p>Simmer.</p></div>
+            </div>
+            """,
+            "html.parser",
+        )
+
+        recipe = recipe_from_microdata(soup)
+
+        assert recipe.title == "Stew"
+        assert recipe.ingredients == "1 onion\n2 carrots"
+        assert recipe.recipe == "Chop.\nSimmer."
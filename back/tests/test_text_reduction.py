@@ -0,0 +1,104 @@
+"""Tests for text_reduction.py - cutting page text to a token budget."""
+
+from src.services.text_reduction import (
+    estimate_tokens,
+    reduce_page_text,
+    score_line,
+)
+
+RECIPE = [
+    "Ingrédients",
+    "200 g de pancetta",
+    "sel",
+    "4 jaunes d'œufs",
+    "Préparation",
+    "Battre les jaunes d'œufs.",
+    "Faites cuire les pâtes 10 minutes.",
+]
+
+
+def _noise(count):
+    return [f"Lorem ipsum dolor sit amet number {i}" for i in range(count)]
+
+
+class TestEstimateTokens:
+    """Tests for estimate_tokens function."""
+
+    def test_counts_words_numbers_and_symbols(self):
+        """Should count short words once, long words per 5 letters and symbols."""
+        assert estimate_tokens("Add 200 g.") == 4
+        assert estimate_tokens("preheat") == 2
+        assert estimate_tokens("12345") == 2
+
+    def test_empty_text(self):
+        """Should count nothing for blank text."""
+        assert estimate_tokens(" \n ") == 0
+
+
+class TestScoreLine:
+    """Tests for score_line function."""
+
+    def test_scores_recipe_lines(self):
+        """Should score headings, quantities, steps and durations in en and fr."""
+        assert score_line("Ingredients") == 3
+        assert score_line("2 cups flour") == 2
+        assert score_line("4 eggs") == 2
+        assert score_line("1. Preheat the oven to 180°C") == 3
+        assert score_line("Mélanger la farine") == 2
+        assert score_line("Versez le lait") == 2
+
+    def test_unrelated_lines_score_zero(self):
+        """Should not score menu items or prose."""
+        assert score_line("Quick dinners") == 0
+        assert score_line("The best recipe of my childhood") == 0
+
+    def test_boilerplate_is_negative(self):
+        """Should mark cookie banners and newsletter prompts."""
+        assert score_line("We use cookies to improve your experience") < 0
+        assert score_line("Abonnez-vous à notre newsletter") < 0
+
+
+class TestReducePageText:
+    """Tests for reduce_page_text function."""
+
+    def test_keeps_text_within_budget(self):
+        """Should only strip lines and drop blank ones when under budget."""
+        text = "  Menu \n\n" + "\n".join(RECIPE)
+
+        assert reduce_page_text(text, 1000) == "\n".join(["Menu", *RECIPE])
+
+    def test_zero_budget_keeps_everything(self):
+        """Should not cut anything with a budget of 0."""
+        text = "\n".join(_noise(500) + RECIPE)
+
+        assert reduce_page_text(text, 0) == text
+
+    def test_cuts_to_the_recipe(self):
+        """Should keep the recipe, with unscored lines inside it, within budget."""
+        text = "\n".join(_noise(200) + RECIPE + _noise(200))
+
+        reduced = reduce_page_text(text, 100)
+
+        assert "\n".join(RECIPE) in reduced
+        assert estimate_tokens(reduced) <= 100
+        # A couple of context lines on each side, not the whole budget
+        assert len(reduced.splitlines()) == len(RECIPE) + 4
+
+    def test_drops_boilerplate_lines(self):
+        """Should leave out boilerplate inside the kept window."""
+        lines = [*RECIPE[:4], "Subscribe to our newsletter", *RECIPE[4:]]
+        text = "\n".join(_noise(200) + lines)
+
+        reduced = reduce_page_text(text, 100)
+
+        assert "newsletter" not in reduced
+        assert "\n".join(RECIPE) in reduced
+
+    def test_truncates_text_without_recipe(self):
+        """Should keep the start of the text when nothing looks like a recipe."""
+        text = "\n".join(_noise(200))
+
+        reduced = reduce_page_text(text, 50)
+
+        assert text.startswith(reduced)
+        assert 40 <= estimate_tokens(reduced) <= 50
@@ -0,0 +1,129 @@
+"""Tests for ttl_cache.py - bounded in-memory cache."""
+
+from src.services.ttl_cache import TTLCache
+
+
+def _cache(clock, maxsize=3, ttl=10.0):
+    return TTLCache(maxsize=maxsize, ttl=ttl, clock=clock)
+
+
+class TestTTLCache:
+    """Tests for TTLCache class."""
+
+    def test_returns_stored_value(self, clock):
+        """Should return a value until it expires."""
+        cache = _cache(clock)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.stats.hits == 1
+
+    def test_counts_misses(self, clock):
+        """Should return None and count a miss for unknown keys."""
+        cache = _cache(clock)
+
+        assert cache.get("a") is None
+        assert cache.stats.misses == 1
+
+    def test_expires_after_ttl(self, clock):
+        """Should drop entries once their TTL has elapsed."""
+        cache = _cache(clock, ttl=10.0)
+        cache.set("a", 1)
+
+        clock.now = 10.0
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+        assert cache.stats.expirations == 1
+
+    def test_per_entry_ttl(self, clock):
+        """Should let an entry override the default TTL."""
+        cache = _cache(clock, ttl=10.0)
+        cache.set("a", 1, ttl=60.0)
+
+        clock.now = 30.0
+
+        assert cache.get("a") == 1
+
+    def test_evicts_least_recently_used(self, clock):
+        """Should evict the entry read or written longest ago when full."""
+        cache = _cache(clock, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats.evictions == 1
+
+    def test_overwrite_refreshes_expiry(self, clock):
+        """Should restart the TTL when a key is stored again."""
+        cache = _cache(clock, ttl=10.0)
+        cache.set("a", 1)
+        clock.now = 8.0
+        cache.set("a", 2)
+
+        clock.now = 15.0
+
+        assert cache.get("a") == 2
+
+    def test_invalidate(self, clock):
+        """Should drop a single key and ignore unknown ones."""
+        cache = _cache(clock)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        cache.invalidate("a")
+        cache.invalidate("missing")
+
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+
+    def test_clear(self, clock):
+        """Should drop every entry."""
+        cache = _cache(clock)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        cache.clear()
+
+        assert len(cache) == 0
+
+
+class TestWeightedTTLCache:
+    """Tests for TTLCache bounded by the weight of its values."""
+
+    def _cache(self, maxsize=10):
+        return TTLCache(maxsize=maxsize, ttl=10.0, weigh=len)
+
+    def test_evicts_by_total_weight(self):
+        """Should evict least recently used values until the weight fits."""
+        cache = self._cache()
+        cache.set("a", b"xxxx")
+        cache.set("b", b"xxxx")
+        cache.set("c", b"xxxx")
+
+        assert cache.get("a") is None
+        assert cache.weight == 8
+        assert cache.stats.evictions == 1
+
+    def test_skips_values_heavier_than_maxsize(self):
+        """Should not store a value that could never fit."""
+        cache = self._cache()
+        cache.set("a", b"x" * 11)
+
+        assert len(cache) == 0
+        assert cache.weight == 0
+
+    def test_tracks_weight_on_replace_and_invalidate(self):
+        """Should keep the total weight in step with the stored values."""
+        cache = self._cache()
+        cache.set("a", b"xx")
+        cache.set("a", b"xxxxx")
+        assert cache.weight == 5
+
+        cache.invalidate("a")
+        assert cache.weight == 0
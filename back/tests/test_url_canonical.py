@@ -0,0 +1,119 @@
+"""Tests for URL canonicalization of cache keys."""
+
+import pytest
+
+from src.services.url_canonical import canonicalize_url
+
+
+class TestCanonicalizeUrl:
+    """Tests for canonicalize_url function."""
+
+    def test_keeps_canonical_url_unchanged(self):
+        """Should be a no-op on an already canonical URL."""
+        url = "https://example.com/recipe"
+        assert canonicalize_url(url) == url
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "http://www.example.com/recipe/?b=2&a=1&utm_source=x#comments",
+            "https://www.www.example.com/recipe",
+            "https://m.www.example.com/recipe",
+            "https://www.m.example.com/recipe",
+            "https://www.m.com/recipe",
+            "https://example.com/amp/amp/recipe",
+            "https://example.com/amp/recipe/amp/amp",
+            "https://EXAMPLE.com./Recipe?q=a+b&flag",
+            "http://[::1]:8080/recipe",
+        ],
+    )
+    def test_is_idempotent(self, url):
+        """Should map a canonical URL to itself."""
+        assert canonicalize_url(canonicalize_url(url)) == canonicalize_url(url)
+
+    def test_strips_one_host_prefix(self):
+        """Should not strip a prefix that a second pass would strip again."""
+        assert canonicalize_url("https://www.www.example.com/r") == (
+            "https://www.www.example.com/r"
+        )
+        assert canonicalize_url("https://www.m.com/r") == "https://m.com/r"
+
+    @pytest.mark.parametrize(
+        "url",
+        ["not a url", "example.com/recipe", "https:///recipe", "http://[::1"],
+    )
+    def test_rejects_non_urls(self, url):
+        """Should raise for strings without a host."""
+        with pytest.raises(ValueError):
+            canonicalize_url(url)
+
+    def test_merges_scheme_and_www_variants(self):
+        """Should treat http/https and www/apex as the same page."""
+        assert (
+            canonicalize_url("http://www.example.com/recipe")
+            == canonicalize_url("https://example.com/recipe")
+            == "https://example.com/recipe"
+        )
+
+    def test_drops_fragment_and_trailing_slash(self):
+        """Should ignore fragments and trailing slashes."""
+        assert (
+            canonicalize_url("https://example.com/recipe/#comments")
+            == "https://example.com/recipe"
+        )
+
+    def test_strips_tracking_params(self):
+        """Should drop utm_* and click id parameters."""
+        assert (
+            canonicalize_url(
+                "https://example.com/recipe?utm_source=fb&utm_medium=x&fbclid=1"
+            )
+            == "https://example.com/recipe"
+        )
+
+    def test_keeps_and_sorts_meaningful_params(self):
+        """Should keep identifying parameters in a stable order."""
+        assert (
+            canonicalize_url("https://example.com/recipe.php?id=3&lang=fr&gclid=x")
+            == "https://example.com/recipe.php?id=3&lang=fr"
+        )
+        assert canonicalize_url("https://example.com/r?b=2&a=1") == (
+            "https://example.com/r?a=1&b=2"
+        )
+
+    def test_merges_amp_and_mobile_variants(self):
+        """Should map AMP and mobile versions to the main page."""
+        expected = "https://example.com/recipe"
+        assert canonicalize_url("https://m.example.com/recipe") == expected
+        assert canonicalize_url("https://amp.example.com/recipe") == expected
+        assert canonicalize_url("https://example.com/amp/recipe") == expected
+        assert canonicalize_url("https://example.com/recipe/amp/") == expected
+        assert canonicalize_url("https://example.com/recipe?amp=1") == expected
+
+    def test_keeps_registrable_domain(self):
+        """Should not strip a prefix that is the whole domain name."""
+        assert canonicalize_url("https://m.com/recipe") == "https://m.com/recipe"
+
+    def test_drops_default_port_keeps_custom(self):
+        """Should drop default ports only."""
+        assert canonicalize_url("https://example.com:443/r") == "https://example.com/r"
+        assert canonicalize_url("https://example.com:8443/r") == (
+            "https://example.com:8443/r"
+        )
+
+    def test_domain_rule_drops_all_params(self):
+        """Should drop every parameter on domains keyed by path only."""
+        assert (
+            canonicalize_url(
+                "https://www.marmiton.org/recettes/recette_carbonara_340808.aspx"
+                "?page=2&src=home"
+            )
+            == "https://marmiton.org/recettes/recette_carbonara_340808.aspx"
+        )
+
+    def test_domain_rule_keeps_listed_params(self):
+        """Should keep only the identifying parameters of a domain."""
+        assert (
+            canonicalize_url("https://www.youtube.com/watch?v=abc&t=30&list=x")
+            == "https://youtube.com/watch?v=abc"
+        )
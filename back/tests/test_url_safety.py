@@ -1,11 +1,13 @@
 """Tests for SSRF URL safety checks."""
 
+import asyncio
 import socket
+import threading
 from unittest.mock import patch
 
 import pytest
 
-from src.services.url_safety import validate_public_url
+from src.services.url_safety import validate_public_url, validate_public_url_async
 
 
 class TestValidatePublicUrl:
@@ -35,3 +37,30 @@ class TestValidatePublicUrl:
             )
         ]
         validate_public_url("https://example.com")
+
+
+class TestValidatePublicUrlAsync:
+    """Tests for validate_public_url_async."""
+
+    def test_rejects_localhost(self):
+        with pytest.raises(ValueError):
+            asyncio.run(validate_public_url_async("http://localhost:8000"))
+
+    @patch("src.services.url_safety.socket.getaddrinfo")
+    def test_resolves_off_the_event_loop(self, mock_getaddrinfo):
+        """Should resolve in a worker thread and check the addresses."""
+        loop_thread = threading.get_ident()
+        resolver_threads = []
+
+        def getaddrinfo(*args, **kwargs):
+            resolver_threads.append(threading.get_ident())
+            return [
+                (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", 443)),
+            ]
+
+        mock_getaddrinfo.side_effect = getaddrinfo
+
+        with pytest.raises(ValueError, match="non-public"):
+            asyncio.run(validate_public_url_async("https://example.com"))
+
+        assert resolver_threads and resolver_threads[0] != loop_thread
@@ -0,0 +1,70 @@
+"""Tests for verdict_cache.py - URL accessibility verdicts."""
+
+from datetime import UTC, datetime, timedelta
+
+from src.services.verdict_cache import VerdictCache
+
+
+def _cache(clock, persist=False):
+    return VerdictCache(
+        positive_ttl=100.0, negative_ttl=10.0, maxsize=10, persist=persist, clock=clock
+    )
+
+
+class TestVerdictCache:
+    """Tests for VerdictCache class."""
+
+    def test_negative_verdicts_expire_first(self, clock):
+        """Should keep positive verdicts longer than negative ones."""
+        cache = _cache(clock)
+        cache.set("https://a.com/r", True)
+        cache.set("https://b.com/r", False)
+
+        clock.now = 50.0
+
+        assert cache.get("https://a.com/r") is True
+        assert cache.get("https://b.com/r") is None
+
+    def test_keys_on_canonical_url(self, clock):
+        """Should share verdicts between variants of a page URL."""
+        cache = _cache(clock)
+        cache.set("https://www.a.com/r/?utm_source=x", False)
+
+        assert cache.get("https://a.com/r") is False
+
+    def test_queues_verdicts_only_when_persisting(self, clock):
+        """Should not accumulate unsaved verdicts without a store."""
+        cache = _cache(clock, persist=False)
+        cache.set("https://a.com/r", True)
+
+        assert cache.drain_unsaved() == {}
+
+    def test_drains_unsaved_verdicts_once(self, clock):
+        """Should hand each new verdict to the store once, with its expiry."""
+        cache = _cache(clock, persist=True)
+        cache.set("https://a.com/r", False)
+
+        unsaved = cache.drain_unsaved()
+
+        accessible, expires_at = unsaved["https://a.com/r"]
+        assert accessible is False
+        assert expires_at - datetime.now(UTC) <= timedelta(seconds=10)
+        assert cache.drain_unsaved() == {}
+
+    def test_load_keeps_stored_expiry(self, clock):
+        """Should load live verdicts without queuing them, skipping expired."""
+        cache = _cache(clock, persist=True)
+        now = datetime.now(UTC)
+
+        cache.load(
+            [
+                ("https://a.com/r", True, now + timedelta(seconds=30)),
+                ("https://b.com/r", True, now - timedelta(seconds=1)),
+            ]
+        )
+
+        assert cache.get("https://a.com/r") is True
+        assert cache.get("https://b.com/r") is None
+        assert cache.drain_unsaved() == {}
+        clock.now = 31.0
+        assert cache.get("https://a.com/r") is None
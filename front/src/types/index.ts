@@ -10,6 +10,7 @@ export interface SearchResult {
   title: string;
   url: string;
   snippet: string;
+  already_planned?: boolean;
 }
 
 export interface SearchResponse {